@@ -0,0 +1,110 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the time taken to import a large proto-plus module.
+
+Each import runs in a fresh interpreter, so that nothing is cached from a
+previous run. Pass ``--profile`` to also print where the time of one
+import goes (see ``proto._profiler``), and ``--descriptor-cache`` to time
+imports using a warm descriptor cache (see ``proto._descriptor_cache``).
+
+    python benchmarks/import_time.py --messages 500 --nested 2
+
+Messages with many nested types stress attaching nested descriptors to
+their parent:
+
+    python benchmarks/import_time.py --messages 2 --nested 1500
+"""
+
+import argparse
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import synthetic
+
+_IMPORT = """\
+import time
+import proto
+start = time.perf_counter()
+import synthetic_module
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(directory, *, profile=False, descriptor_cache=None):
+    """Import the synthetic module in a new interpreter; return the seconds taken."""
+    env = dict(os.environ, PYTHONPATH=str(directory))
+    env.pop("PROTO_PLUS_PROFILE", None)
+    env.pop("PROTO_PLUS_DESCRIPTOR_CACHE", None)
+    if profile:
+        env["PROTO_PLUS_PROFILE"] = "1"
+    if descriptor_cache:
+        env["PROTO_PLUS_DESCRIPTOR_CACHE"] = str(descriptor_cache)
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=None if profile else subprocess.DEVNULL,
+        universal_newlines=True,
+    )
+    return float(result.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--nested", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-manifest", dest="manifest", action="store_false")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--descriptor-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        pathlib.Path(directory, "synthetic_module.py").write_text(
+            synthetic.module_source(
+                messages=args.messages, nested=args.nested, manifest=args.manifest
+            )
+        )
+        descriptor_cache = None
+        if args.descriptor_cache:
+            descriptor_cache = pathlib.Path(directory, "descriptor_cache")
+            # Warm the cache.
+            import_time(directory, descriptor_cache=descriptor_cache)
+        times = [
+            import_time(directory, descriptor_cache=descriptor_cache)
+            for _ in range(args.repeat)
+        ]
+        print(
+            "import of {messages} messages with {nested} nested types each{cache}: "
+            "median {median:.1f} ms, min {min:.1f} ms over {repeat} runs".format(
+                messages=args.messages,
+                nested=args.nested,
+                cache=" (descriptor cache)" if descriptor_cache else "",
+                median=statistics.median(times) * 1000,
+                min=min(times) * 1000,
+                repeat=args.repeat,
+            )
+        )
+        if args.profile:
+            import_time(directory, profile=True, descriptor_cache=descriptor_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the time per call of converting a small message to JSON and dicts.
+
+Each of ``to_json`` and ``to_dict`` is compared with calling json_format
+(or, for ``to_json`` under protobuf 5 and later, proto-plus' own JSON
+writer) directly on the protobuf message, so that the difference is the
+overhead of the proto-plus method itself.
+
+    python benchmarks/serialization.py --repeat 50
+"""
+
+import argparse
+import functools
+import timeit
+
+from google.protobuf import json_format
+
+import proto
+from proto import _json_encoder
+from proto.message import PROTOBUF_VERSION
+
+
+class Squid(proto.Message):
+    name = proto.Field(proto.STRING, number=1)
+    mass_kg = proto.Field(proto.INT32, number=2)
+    tags = proto.RepeatedField(proto.STRING, number=3)
+
+
+def per_call(*functions, number, repeat):
+    """Return the best time of one call to each function, in microseconds.
+
+    The functions are timed in turn, ``repeat`` times over, so that they
+    are equally affected by changes in the load of the machine.
+    """
+    times = [[] for _ in functions]
+    for _ in range(repeat):
+        for function, function_times in zip(functions, times):
+            function_times.append(timeit.timeit(function, number=number))
+    return [min(function_times) / number * 1e6 for function_times in times]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    squid = Squid(name="Steve", mass_kg=3, tags=["giant"])
+    pb = Squid.pb(squid)
+    if PROTOBUF_VERSION[0] in ("3", "4"):
+        print_fields = {"including_default_value_fields": True}
+        write_json = functools.partial(json_format.MessageToJson, pb, **print_fields)
+    else:
+        print_fields = {"always_print_fields_with_no_presence": True}
+        encoder = _json_encoder.encoder(
+            use_integers_for_enums=True,
+            preserving_proto_field_name=False,
+            sort_keys=False,
+            indent=2,
+            print_fields=True,
+        )
+        write_json = functools.partial(encoder.encode, pb)
+
+    cases = [
+        (
+            "to_json",
+            lambda: Squid.to_json(squid),
+            write_json,
+        ),
+        (
+            "to_dict",
+            lambda: Squid.to_dict(squid),
+            lambda: json_format.MessageToDict(
+                pb, preserving_proto_field_name=True, **print_fields
+            ),
+        ),
+    ]
+    for name, method, direct in cases:
+        method_time, direct_time = per_call(
+            method, direct, number=args.number, repeat=args.repeat
+        )
+        print(
+            "{name}: {method:.2f} us per call, {direct:.2f} us without proto-plus, "
+            "overhead {overhead:.2f} us".format(
+                name=name,
+                method=method_time,
+                direct=direct_time,
+                overhead=method_time - direct_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generate synthetic proto-plus modules, shaped like generated client code."""
+
+import textwrap
+
+
+def module_source(*, messages: int, nested: int = 1, manifest: bool = True) -> str:
+    """Return the source of a module declaring many messages.
+
+    Each top-level message has a nested message and a nested enum per
+    ``nested``, a few scalar fields, a map field, and a field referencing
+    the next message by name (so that the file can only be generated once
+    the whole module has been declared).
+
+    Args:
+        messages (int): The number of top-level messages.
+        nested (int): The number of nested messages, and of nested enums,
+            in each top-level message.
+        manifest (bool): Whether the module declares its manifest.
+    """
+    names = ["Message{}".format(i) for i in range(messages)]
+    lines = [
+        "import proto",
+        "",
+        "__protobuf__ = proto.module(",
+        '    package="benchmarks.synthetic",',
+        "    manifest={{{}}},".format(
+            ", ".join('"{}"'.format(n) for n in names) if manifest else ""
+        ),
+        ")",
+        "",
+    ]
+    for index, name in enumerate(names):
+        lines.append("class {}(proto.Message):".format(name))
+        for n in range(nested):
+            lines.append(
+                textwrap.indent(
+                    textwrap.dedent(
+                        """\
+                        class Kind{n}(proto.Enum):
+                            KIND{n}_UNSPECIFIED = 0
+                            KIND{n}_ONE = 1
+
+                        class Nested{n}(proto.Message):
+                            value = proto.Field(proto.STRING, number=1)
+                            kind = proto.Field(proto.ENUM, number=2, enum="{name}.Kind{n}")
+                        """
+                    ).format(n=n, name=name),
+                    "    ",
+                )
+            )
+        lines.append("    name = proto.Field(proto.STRING, number=1)")
+        lines.append("    size = proto.Field(proto.INT64, number=2)")
+        lines.append(
+            "    labels = proto.MapField(proto.STRING, proto.STRING, number=3)"
+        )
+        lines.append(
+            '    next = proto.Field(proto.MESSAGE, number=4, message="{}")'.format(
+                names[(index + 1) % messages]
+            )
+        )
+        for n in range(nested):
+            lines.append(
+                "    nested_{n} = proto.RepeatedField(Nested{n}, number={number})".format(
+                    n=n, number=5 + n
+                )
+            )
+        lines.append("")
+    lines.append("__all__ = tuple(sorted(__protobuf__.manifest))")
+    return "\n".join(lines) + "\n"
@@ -48,7 +48,7 @@ def unit(session, implementation):
 
     session.env["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = implementation
     session.install("coverage", "pytest", "pytest-cov", "pytz")
-    session.install("-e", ".[testing]", "-c", constraints_path)
+    session.install("-e", ".[testing,numpy]", "-c", constraints_path)
     # TODO(https://github.com/googleapis/proto-plus-python/issues/389):
     # Remove the 'cpp' implementation once support for Protobuf 3.x is dropped.
     # The 'cpp' implementation requires Protobuf<4.
@@ -131,6 +131,14 @@ def prerelease_deps(session, implementation):
     )
 
 
+@nox.session(python="3.10")
+def benchmark(session):
+    """Run the import time benchmark, e.g. `nox -s benchmark -- --profile`."""
+
+    session.install("-e", ".")
+    session.run("python", "benchmarks/import_time.py", *session.posargs)
+
+
 @nox.session(python="3.10")
 def docs(session):
     """Build the docs."""
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .columnar import to_columns
 from .enums import Enum
 from .fields import Field
 from .fields import MapField
@@ -51,6 +52,7 @@ __all__ = (
     "Marshal",
     "Message",
     "module",
+    "to_columns",
     # Expose the types directly.
     "DOUBLE",
     "FLOAT",
@@ -0,0 +1,151 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for length-delimited streams of serialized messages.
+
+Each message in such a stream is preceded by its size, encoded as a
+base 128 varint. This is the format written by ``writeDelimitedTo`` in
+the Java protobuf runtime, among others.
+"""
+
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from google.protobuf.message import DecodeError
+
+
+def encode_varint(value: int) -> bytes:
+    """Return the base 128 varint encoding of a non-negative integer."""
+    chunks = bytearray()
+    while value > 0x7F:
+        chunks.append((value & 0x7F) | 0x80)
+        value >>= 7
+    chunks.append(value)
+    return bytes(chunks)
+
+
+def decode_varint(buffer, pos: int) -> Tuple[int, int]:
+    """Decode the base 128 varint starting at ``pos`` in ``buffer``.
+
+    Args:
+        buffer (Union[bytes, memoryview]): The buffer to read from.
+        pos (int): The offset of the first byte of the varint.
+
+    Returns:
+        Tuple[int, int]: The decoded value, and the offset of the first
+            byte after the varint.
+
+    Raises:
+        google.protobuf.message.DecodeError: If the buffer ends before the
+            varint does, or the varint is longer than 64 bits.
+    """
+    value = shift = 0
+    while True:
+        try:
+            byte = buffer[pos]
+        except IndexError:
+            raise DecodeError("Truncated varint.")
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return (value, pos)
+        shift += 7
+        if shift >= 64:
+            raise DecodeError("Too many bytes when decoding varint.")
+
+
+def split(buffer) -> Iterator[memoryview]:
+    """Yield each serialized message in a length-delimited buffer.
+
+    Args:
+        buffer (Union[bytes, bytearray, memoryview, mmap.mmap]): The buffer
+            holding the stream.
+
+    Yields:
+        memoryview: Each serialized message, as a view into ``buffer``
+            rather than a copy.
+
+    Raises:
+        google.protobuf.message.DecodeError: If the buffer ends in the
+            middle of a message.
+    """
+    view = memoryview(buffer).cast("B")
+    pos, end = 0, len(view)
+    while pos < end:
+        size, pos = decode_varint(view, pos)
+        if pos + size > end:
+            raise DecodeError("Truncated message.")
+        yield view[pos : pos + size]
+        pos += size
+
+
+def _read_varint(stream: BinaryIO) -> Optional[int]:
+    """Read a base 128 varint from a binary file object.
+
+    Returns:
+        Optional[int]: The decoded value, or None if the stream was already
+            at its end.
+    """
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise DecodeError("Truncated varint.")
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return value
+        shift += 7
+        if shift >= 64:
+            raise DecodeError("Too many bytes when decoding varint.")
+
+
+def read(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield each serialized message in a length-delimited binary file.
+
+    Only one message is held in memory at a time.
+
+    Args:
+        stream (BinaryIO): The file object to read from.
+
+    Yields:
+        bytes: Each serialized message.
+
+    Raises:
+        google.protobuf.message.DecodeError: If the file ends in the
+            middle of a message.
+    """
+    while True:
+        size = _read_varint(stream)
+        if size is None:
+            return
+        payload = stream.read(size)
+        if len(payload) < size:
+            raise DecodeError("Truncated message.")
+        yield payload
+
+
+def iterate(source) -> Iterator:
+    """Yield each serialized message in a length-delimited stream.
+
+    Args:
+        source: Either a bytes-like object holding the whole stream, which
+            is read in place (see :func:`split`), or a binary file object
+            to read the stream from (see :func:`read`).
+    """
+    try:
+        view = memoryview(source)
+    except TypeError:
+        return read(source)
+    return split(view)
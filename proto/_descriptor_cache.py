@@ -0,0 +1,124 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An opt-in on-disk cache of generated file descriptors.
+
+Set the ``PROTO_PLUS_DESCRIPTOR_CACHE`` environment variable to a directory
+to store each file descriptor generated for a module there, serialized.
+Entries are keyed by the module's path and source, the name of the file,
+and the messages and enums in it, field by field and value by value. Later imports of the same
+module add the stored descriptor to the pool, rather than building the
+descriptor message by message.
+
+Entries are never removed; delete the directory to clear the cache.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+from typing import Iterable, Optional
+
+import google.protobuf
+
+from proto.version import __version__
+
+log = logging.getLogger("_descriptor_cache")
+
+ENV_VAR = "PROTO_PLUS_DESCRIPTOR_CACHE"
+
+directory = os.environ.get(ENV_VAR) or None
+
+# Mapping[str, Optional[str]]: the digest of the path and source of each
+# module, by module name, or None if the module has no source file.
+_source_digests = {}
+
+
+def _source_digest(module_name: str) -> Optional[str]:
+    """Return a digest of the path and source of a module.
+
+    Args:
+        module_name (str): The name of the module, which must already be in
+            ``sys.modules`` (as it is while the module is being imported).
+
+    Returns:
+        Optional[str]: The digest, or None if the module has no source file.
+    """
+    if module_name not in _source_digests:
+        digest = None
+        path = getattr(sys.modules.get(module_name), "__file__", None)
+        if path:
+            try:
+                with open(path, "rb") as source:
+                    digest = hashlib.sha256(
+                        os.path.abspath(path).encode() + b"\0" + source.read()
+                    ).hexdigest()
+            except OSError:
+                pass
+        _source_digests[module_name] = digest
+    return _source_digests[module_name]
+
+
+def key(module_name: str, parts: Iterable[str]) -> Optional[str]:
+    """Return the cache key for a file descriptor generated for a module.
+
+    Args:
+        module_name (str): The name of the module declaring the file's
+            messages and enums.
+        parts (Iterable[str]): Anything else the file descriptor depends on,
+            such as the file's name and the types it references.
+
+    Returns:
+        Optional[str]: The key, or None if the module cannot be cached
+            because it has no source file.
+    """
+    digest = _source_digest(module_name)
+    if digest is None:
+        return None
+    hasher = hashlib.sha256()
+    for part in (__version__, google.protobuf.__version__, digest, *parts):
+        hasher.update(part.encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def load(key: str) -> Optional[bytes]:
+    """Return the serialized file descriptor stored under a key, if any."""
+    try:
+        with open(os.path.join(directory, key + ".pb"), "rb") as entry:
+            return entry.read()
+    except OSError:
+        return None
+
+
+def store(key: str, serialized: bytes) -> None:
+    """Store a serialized file descriptor under a key.
+
+    The entry is written to a temporary file and then moved into place, so
+    that concurrent imports never read a partial entry. Failures are
+    logged and otherwise ignored.
+    """
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as entry:
+                entry.write(serialized)
+            os.replace(temp_path, os.path.join(directory, key + ".pb"))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as exc:
+        log.warning("Could not write to the descriptor cache: %s", exc)
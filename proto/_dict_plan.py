@@ -0,0 +1,428 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Conversion of messages to and from dictionaries of Python values.
+
+Unlike :meth:`~.Message.to_dict`, which follows the protobuf JSON mapping
+(so that 64-bit integers are strings, timestamps are RFC 3339 strings and
+so on), a :class:`DictPlan` converts each field to the Python value the
+message's own accessors would return: integers, datetimes, timedeltas and
+enum members. It does so from conversions compiled once per message type,
+rather than by inspecting the descriptor of every message it converts.
+"""
+
+import collections.abc
+import enum
+import functools
+import operator
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from google.protobuf import message
+from google.protobuf import struct_pb2
+
+from proto.marshal.rules import dates
+
+_TIMESTAMP = dates.TimestampRule()
+_DURATION = dates.DurationRule()
+
+# How a field is checked before it is read.
+_ALWAYS = 0
+_IF_PRESENT = 1
+_IF_NOT_EMPTY = 2
+
+
+class DictPlan:
+    """The conversions between one message type and dictionaries.
+
+    The conversions are compiled on first use, so that plans for messages
+    referring to each other (or to themselves) may be created in any order.
+
+    Args:
+        message_type (type): The proto-plus message class, or a protobuf
+            message class without a proto-plus wrapper.
+    """
+
+    def __init__(self, message_type: type) -> None:
+        self.message_type = message_type
+        self._readers = {}
+        self._writers = {}
+
+    def to_dict(self, pb: message.Message, *, print_fields: bool = True) -> dict:
+        """Return the fields of a protobuf message as a dictionary.
+
+        Args:
+            pb (~.message.Message): The protobuf message.
+            print_fields (bool): Whether fields without presence are included
+                even if they hold their default value. Fields with presence
+                are only included when they are set.
+
+        Returns:
+            dict: The Python value of each field, keyed by field name.
+        """
+        readers = self._readers.get(print_fields)
+        if readers is None:
+            readers = self._readers[print_fields] = self._compile_readers(print_fields)
+        result = {}
+        for name, check, read in readers:
+            if check == _IF_PRESENT:
+                if pb.HasField(name):
+                    result[name] = read(pb)
+                continue
+            value = read(pb)
+            if check == _ALWAYS or value:
+                result[name] = value
+        return result
+
+    def to_kwargs(
+        self, mapping: Mapping[str, Any], *, ignore_unknown_fields: bool = False
+    ) -> Dict[str, Any]:
+        """Return the arguments building the protobuf message for a dictionary.
+
+        Nested messages are given as dictionaries too, so the whole message
+        is built by a single call to the protobuf message class.
+
+        Args:
+            mapping (Mapping[str, Any]): Python values keyed by field name, as
+                returned by :meth:`to_dict`. Fields set to None are skipped.
+            ignore_unknown_fields (bool): If True, skip keys which are not
+                fields of the message, rather than raising an error.
+
+        Returns:
+            Dict[str, Any]: Keyword arguments for the protobuf message class.
+
+        Raises:
+            ValueError: If a key is not a field of the message, unless
+                ``ignore_unknown_fields`` is set.
+        """
+        writers = self._writers.get(ignore_unknown_fields)
+        if writers is None:
+            writers = self._writers[ignore_unknown_fields] = self._compile_writers(
+                ignore_unknown_fields
+            )
+        kwargs = {}
+        for key, value in mapping.items():
+            if value is None:
+                continue
+            try:
+                name, write = writers[key]
+            except KeyError:
+                if ignore_unknown_fields:
+                    continue
+                raise ValueError(
+                    "Unknown field for {}: {}".format(self.message_type.__name__, key)
+                )
+            kwargs[name] = value if write is None else write(value)
+        return kwargs
+
+    def _compile_readers(self, print_fields: bool) -> List[Tuple[str, int, Callable]]:
+        readers = []
+        for name, has_presence, shape, value_type in _field_specs(self.message_type):
+            convert = _to_python(value_type, print_fields=print_fields)
+            read = _reader(name, shape, convert)
+            if has_presence:
+                check = _IF_PRESENT
+            elif print_fields:
+                check = _ALWAYS
+            else:
+                check = _IF_NOT_EMPTY
+            readers.append((name, check, read))
+        return readers
+
+    def _compile_writers(
+        self, ignore_unknown_fields: bool
+    ) -> Dict[str, Tuple[str, Optional[Callable]]]:
+        writers = {}
+        for name, _, shape, value_type in _field_specs(self.message_type):
+            convert = _to_proto(value_type, ignore_unknown_fields=ignore_unknown_fields)
+            if convert is not None and shape == "map":
+                convert = _map_converter(convert)
+            elif convert is not None and shape == "repeated":
+                convert = _list_converter(convert)
+            writers[name] = (name, convert)
+            # Underscores may be appended to field names that collide with
+            # Python or proto-plus keywords; accept the name without it,
+            # as the message's constructor does.
+            if name.endswith("_"):
+                writers.setdefault(name[:-1], (name, convert))
+        return writers
+
+
+def plan_for(message_type: type) -> DictPlan:
+    """Return the plan converting a message type to and from dictionaries.
+
+    Args:
+        message_type (type): The proto-plus message class, or a protobuf
+            message class without a proto-plus wrapper.
+
+    Returns:
+        ~.DictPlan: The plan, shared by every caller.
+    """
+    meta = getattr(message_type, "_meta", None)
+    if meta is None:
+        return _pb_plan(message_type)
+    if meta.dict_plan is None:
+        meta.dict_plan = DictPlan(message_type)
+    return meta.dict_plan
+
+
+@functools.lru_cache(maxsize=None)
+def _pb_plan(pb_type: type) -> DictPlan:
+    return DictPlan(pb_type)
+
+
+def _reader(name: str, shape: str, convert: Optional[Callable]) -> Callable:
+    """Return a function reading a field of a protobuf message as Python."""
+    read = operator.attrgetter(name)
+    if shape == "map":
+        if convert is None:
+            return lambda pb: dict(read(pb))
+        return lambda pb: {key: convert(value) for key, value in read(pb).items()}
+    if shape == "repeated":
+        if convert is None:
+            return lambda pb: list(read(pb))
+        return lambda pb: [convert(value) for value in read(pb)]
+    if convert is None:
+        return read
+    return lambda pb: convert(read(pb))
+
+
+def _list_converter(convert: Callable) -> Callable:
+    return lambda values: [convert(value) for value in values]
+
+
+def _map_converter(convert: Callable) -> Callable:
+    return lambda entries: {key: convert(value) for key, value in entries.items()}
+
+
+def _field_specs(message_type: type) -> List[Tuple[str, bool, str, Any]]:
+    """Return the fields of a message type, and how their values are stored.
+
+    Returns:
+        List[Tuple[str, bool, str, Any]]: For each field, its name, whether
+            it tracks presence, its shape (``"single"``, ``"repeated"`` or
+            ``"map"``), and the type of its values (a proto-plus enum or
+            message class, a protobuf message class, or None for other
+            types).
+    """
+    meta = getattr(message_type, "_meta", None)
+    if meta is None:
+        return [_descriptor_spec(field) for field in message_type.DESCRIPTOR.fields]
+
+    # Build the protobuf message first; this resolves any fields referring
+    # to messages and enums by name.
+    meta.pb
+    specs = []
+    for name, field in meta.fields.items():
+        entry = getattr(field.message, "_meta", None)
+        if field.repeated and entry is not None and entry.options.map_entry:
+            specs.append((name, False, "map", _value_type(entry.fields["value"])))
+        elif field.repeated:
+            specs.append((name, False, "repeated", _value_type(field)))
+        else:
+            has_presence = bool(field.message or field.oneof)
+            specs.append((name, has_presence, "single", _value_type(field)))
+    return specs
+
+
+def _value_type(field) -> Any:
+    if isinstance(field.enum, enum.EnumMeta):
+        return field.enum
+    if field.message:
+        return field.message
+    return None
+
+
+def _descriptor_spec(field) -> Tuple[str, bool, str, Any]:
+    value_type = None
+    if field.message_type is not None:
+        value_type = field.message_type._concrete_class
+
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is None:
+        is_repeated = field.label == field.LABEL_REPEATED
+    if (
+        is_repeated
+        and field.message_type is not None
+        and field.message_type.GetOptions().map_entry
+    ):
+        value = field.message_type.fields_by_name["value"]
+        value_type = None
+        if value.message_type is not None:
+            value_type = value.message_type._concrete_class
+        return (field.name, False, "map", value_type)
+    if is_repeated:
+        return (field.name, False, "repeated", value_type)
+
+    has_presence = getattr(field, "has_presence", None)
+    if has_presence is None:
+        has_presence = (
+            field.message_type is not None
+            or field.containing_oneof is not None
+            or field.file.syntax == "proto2"
+        )
+    return (field.name, has_presence, "single", value_type)
+
+
+def _to_python(value_type, *, print_fields: bool) -> Optional[Callable]:
+    """Return the conversion of values of a type to Python, if any."""
+    if isinstance(value_type, enum.EnumMeta):
+        # Values unknown to the enum are left as integers.
+        members = {member.value: member for member in value_type}
+        return lambda value: members.get(value, value)
+    if value_type is None:
+        return None
+
+    full_name = _full_name(value_type)
+    if full_name == "google.protobuf.Timestamp":
+        return _TIMESTAMP.to_python
+    if full_name == "google.protobuf.Duration":
+        return _DURATION.to_python
+    if full_name in _WRAPPERS:
+        return operator.attrgetter("value")
+    if full_name == "google.protobuf.Struct":
+        return _struct_to_python
+    if full_name == "google.protobuf.ListValue":
+        return _list_value_to_python
+    if full_name == "google.protobuf.Value":
+        return _value_to_python
+    return functools.partial(plan_for(value_type).to_dict, print_fields=print_fields)
+
+
+def _to_proto(value_type, *, ignore_unknown_fields: bool) -> Optional[Callable]:
+    """Return the conversion of Python values of a type to protobuf, if any.
+
+    Enums and scalars are accepted by the protobuf message class as they
+    are. Messages may be given either as dictionaries, which are converted
+    to keyword arguments for their class, or as messages.
+    """
+    if value_type is None or isinstance(value_type, enum.EnumMeta):
+        return None
+
+    full_name = _full_name(value_type)
+    if full_name == "google.protobuf.Timestamp":
+        return _TIMESTAMP.to_proto
+    if full_name == "google.protobuf.Duration":
+        return _DURATION.to_proto
+    if full_name in _WRAPPERS:
+        return _wrapper_to_proto
+    if full_name == "google.protobuf.Struct":
+        return _struct_to_proto
+    if full_name == "google.protobuf.ListValue":
+        return _list_value_to_proto
+    if full_name == "google.protobuf.Value":
+        return _value_to_proto
+
+    to_kwargs = functools.partial(
+        plan_for(value_type).to_kwargs, ignore_unknown_fields=ignore_unknown_fields
+    )
+    if hasattr(value_type, "_meta"):
+
+        def convert(value):
+            if isinstance(value, collections.abc.Mapping):
+                return to_kwargs(value)
+            if isinstance(value, value_type):
+                return value_type.pb(value)
+            return value
+
+        return convert
+
+    def convert(value):
+        if isinstance(value, collections.abc.Mapping):
+            return to_kwargs(value)
+        return value
+
+    return convert
+
+
+def _full_name(value_type) -> str:
+    meta = getattr(value_type, "_meta", None)
+    if meta is not None:
+        return meta.full_name
+    return value_type.DESCRIPTOR.full_name
+
+
+_WRAPPERS = frozenset(
+    "google.protobuf.{}".format(name)
+    for name in (
+        "BoolValue",
+        "BytesValue",
+        "DoubleValue",
+        "FloatValue",
+        "Int32Value",
+        "Int64Value",
+        "StringValue",
+        "UInt32Value",
+        "UInt64Value",
+    )
+)
+
+
+def _wrapper_to_proto(value):
+    if isinstance(value, message.Message):
+        return value
+    return {"value": value}
+
+
+def _value_to_python(value: struct_pb2.Value) -> Any:
+    kind = value.WhichOneof("kind")
+    if kind == "struct_value":
+        return _struct_to_python(value.struct_value)
+    if kind == "list_value":
+        return _list_value_to_python(value.list_value)
+    if kind is None or kind == "null_value":
+        return None
+    return getattr(value, kind)
+
+
+def _struct_to_python(value: struct_pb2.Struct) -> Dict[str, Any]:
+    return {key: _value_to_python(item) for key, item in value.fields.items()}
+
+
+def _list_value_to_python(value: struct_pb2.ListValue) -> List[Any]:
+    return [_value_to_python(item) for item in value.values]
+
+
+def _value_to_proto(value) -> struct_pb2.Value:
+    # `google.protobuf.Value` and friends are built here rather than given
+    # as dictionaries, which newer protobuf runtimes would take for the
+    # Python values they hold.
+    if isinstance(value, struct_pb2.Value):
+        return value
+    if value is None:
+        return struct_pb2.Value(null_value=0)
+    if isinstance(value, bool):
+        return struct_pb2.Value(bool_value=value)
+    if isinstance(value, (int, float)):
+        return struct_pb2.Value(number_value=value)
+    if isinstance(value, str):
+        return struct_pb2.Value(string_value=value)
+    if isinstance(value, collections.abc.Mapping):
+        return struct_pb2.Value(struct_value=_struct_to_proto(value))
+    if isinstance(value, collections.abc.Sequence):
+        return struct_pb2.Value(list_value=_list_value_to_proto(value))
+    raise ValueError("Unable to coerce value: %r" % value)
+
+
+def _struct_to_proto(value) -> struct_pb2.Struct:
+    if isinstance(value, struct_pb2.Struct):
+        return value
+    return struct_pb2.Struct(
+        fields={key: _value_to_proto(item) for key, item in value.items()}
+    )
+
+
+def _list_value_to_proto(value) -> struct_pb2.ListValue:
+    if isinstance(value, struct_pb2.ListValue):
+        return value
+    return struct_pb2.ListValue(values=[_value_to_proto(item) for item in value])
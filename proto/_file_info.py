@@ -15,17 +15,37 @@
 import collections
 import inspect
 import logging
+import os
 
 from google.protobuf import descriptor_pb2
 from google.protobuf import descriptor_pool
 from google.protobuf import message
 from google.protobuf import reflection
 
+from proto import _descriptor_cache
+from proto import _profiler
 from proto.marshal.rules.message import MessageRule
 
 log = logging.getLogger("_FileInfo")
 
 
+def _field_signature(field):
+    """Return everything about a field that its descriptor is built from."""
+    return repr(
+        (
+            field.name,
+            field.number,
+            int(field.proto_type),
+            field.repeated,
+            getattr(field, "map_key_type", None),
+            field.optional,
+            field.oneof,
+            field.json_name,
+            field._qualify_type_name() or "",
+        )
+    )
+
+
 class _FileInfo(
     collections.namedtuple(
         "_FileInfo",
@@ -34,6 +54,26 @@ class _FileInfo(
 ):
     registry = {}  # Mapping[str, '_FileInfo']
 
+    # Whether to defer adding files to the descriptor pool, and creating
+    # the protobuf types for their messages, until first use. Until then,
+    # the types cannot be found in the descriptor pool by name.
+    lazy = os.environ.get("PROTO_PLUS_LAZY_DESCRIPTORS", "") not in ("", "0")
+
+    # Files waiting to be built, keyed by the name of their file descriptor.
+    pending = {}  # Mapping[str, '_FileInfo']
+
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls, *args, **kwargs)
+
+        # The full names of messages and enums referenced by fields as
+        # strings, which have not been declared yet.
+        self.unresolved = set()  # Set[str]
+
+        # The names in the module's manifest which are not yet attributes
+        # of the module; populated on the first call to `ready`.
+        self.missing_manifest = None  # Optional[Deque[str]]
+        return self
+
     @classmethod
     def maybe_add_descriptor(cls, filename, package):
         descriptor = cls.registry.get(filename)
@@ -47,6 +87,9 @@ class _FileInfo(
                 enums=collections.OrderedDict(),
                 messages=collections.OrderedDict(),
                 name=filename,
+                # Builders of the descriptors of nested messages and enums
+                # waiting for their parent message, keyed by the parent's
+                # local path.
                 nested={},
                 nested_enum={},
             )
@@ -64,8 +107,37 @@ class _FileInfo(
 
         return frozenset()
 
-    def _get_remaining_manifest(self, new_class):
-        return self._get_manifest(new_class) - {new_class.__name__}
+    def add_message(self, full_name, proto_plus_message):
+        """Add a message to the file.
+
+        Args:
+            full_name (str): The full name of the message.
+            proto_plus_message (~.MessageMeta): The message class.
+        """
+        self.messages[full_name] = proto_plus_message
+        self.unresolved.discard(full_name)
+
+        # Track any messages or enums this message references as strings
+        # which have not been declared yet.
+        for field in proto_plus_message._meta.fields.values():
+            if isinstance(field.message, str):
+                reference = field.message
+            elif isinstance(field.enum, str):
+                reference = field.enum
+            else:
+                continue
+            if reference not in self.messages and reference not in self.enums:
+                self.unresolved.add(reference)
+
+    def add_enum(self, full_name, proto_plus_enum):
+        """Add an enum to the file.
+
+        Args:
+            full_name (str): The full name of the enum.
+            proto_plus_enum (~.ProtoEnumMeta): The enum class.
+        """
+        self.enums[full_name] = proto_plus_enum
+        self.unresolved.discard(full_name)
 
     def _calculate_salt(self, new_class, fallback):
         manifest = self._get_manifest(new_class)
@@ -79,6 +151,7 @@ class _FileInfo(
 
         return "" if new_class.__name__ in manifest else (fallback or "").lower()
 
+    @_profiler.profiled("generate_file_pb", lambda self, *args, **kwargs: self.name)
     def generate_file_pb(self, new_class, fallback_salt=""):
         """Generate the descriptors for all protos in the file.
 
@@ -89,9 +162,11 @@ class _FileInfo(
 
         This is run automatically when the last proto in the file is
         generated, as determined by the module's __all__ tuple.
-        """
-        pool = descriptor_pool.Default()
 
+        If :attr:`lazy` is set, the descriptors are not generated yet;
+        the file is held until one of its messages or enums is first
+        used (see :meth:`build_if_pending`).
+        """
         # Salt the filename in the descriptor.
         # This allows re-use of the filename by other proto messages if
         # needed (e.g. if __all__ is not used).
@@ -100,8 +175,66 @@ class _FileInfo(
             name="_".join([self.descriptor.name[:-6], salt]).rstrip("_"),
         )
 
-        # Add the file descriptor.
-        pool.Add(self.descriptor)
+        # We no longer need to track this file's info; remove it from
+        # the module's registry.
+        self.registry.pop(self.name)
+
+        if self.lazy:
+            self.pending[self.descriptor.name] = self
+        else:
+            self._build()
+
+    @classmethod
+    def pending_file_name(cls, component):
+        """Return the file name of a message or enum waiting to be built.
+
+        Args:
+            component (type): A message or enum class, either proto-plus or
+                protobuf.
+
+        Returns:
+            Optional[str]: The name of the file descriptor that will declare
+                ``component``, if ``component`` is a proto-plus class whose
+                file is waiting to be built, otherwise None.
+        """
+        file_info = getattr(getattr(component, "_meta", None), "file_info", None)
+        if file_info is not None and file_info.is_pending:
+            return file_info.descriptor.name
+        return None
+
+    @property
+    def is_pending(self):
+        """Return True if the file is waiting to be built, False otherwise."""
+        return self.pending.get(self.descriptor.name) is self
+
+    def build_if_pending(self):
+        """Build the file if it is waiting to be built (see :attr:`lazy`)."""
+        if self.is_pending:
+            self._build()
+
+    @_profiler.profiled("_FileInfo._build", lambda self: self.name)
+    def _build(self):
+        """Add the file descriptor to the pool, and create the protobuf types."""
+        pool = descriptor_pool.Default()
+        self.pending.pop(self.descriptor.name, None)
+
+        # Any files this file imports must be in the pool first.
+        for dependency in self.descriptor.dependency:
+            if dependency in self.pending:
+                self.pending[dependency]._build()
+
+        # Add the file descriptor, from the descriptor cache if possible.
+        cache_key = self._cache_key()
+        serialized = _descriptor_cache.load(cache_key) if cache_key else None
+        with _profiler.timer("descriptor_pool.Add", self.name):
+            if serialized is None or not self._add_serialized(pool, serialized):
+                self._build_descriptor()
+                pool.Add(self.descriptor)
+                if cache_key:
+                    _descriptor_cache.store(
+                        cache_key,
+                        pool.FindFileByName(self.descriptor.name).serialized_pb,
+                    )
 
         # Adding the file descriptor to the pool created a descriptor for
         # each message; go back through our wrapper messages and associate
@@ -140,10 +273,74 @@ class _FileInfo(
             descriptor = pool.FindEnumTypeByName(full_name)
             proto_plus_enum._meta.pb = descriptor
 
-        # We no longer need to track this file's info; remove it from
-        # the module's registry and from this object.
-        self.registry.pop(self.name)
+    def _build_descriptor(self):
+        """Add the descriptors of the file's messages and enums to the file.
+
+        Nested descriptors are built by the message containing them, so only
+        the top-level messages and enums are added here.
+        """
+        self.descriptor.message_type.extend(
+            proto_plus_message._meta.build_descriptor()
+            for full_name, proto_plus_message in self.messages.items()
+            if full_name.rpartition(".")[0] not in self.messages
+        )
+        self.descriptor.enum_type.extend(
+            proto_plus_enum._meta.build_descriptor()
+            for full_name, proto_plus_enum in self.enums.items()
+            if full_name.rpartition(".")[0] not in self.messages
+        )
 
+    def _cache_key(self):
+        """Return the key of the file in the descriptor cache.
+
+        Returns:
+            Optional[str]: The key, or None if the descriptor cache is not
+                enabled or the file cannot be cached.
+        """
+        if not _descriptor_cache.directory:
+            return None
+        components = list(self.messages.values()) + list(self.enums.values())
+        if not components:
+            return None
+
+        # The source of the module does not determine the file on its own:
+        # the same source may declare differently shaped messages under one
+        # file name (for instance, in functions or under conditions). So the
+        # key also covers the shape of every message and enum in the file.
+        parts = [self.descriptor.name, self.descriptor.package]
+        parts.extend(self.descriptor.dependency)
+        for full_name, proto_plus_message in self.messages.items():
+            parts.append(full_name)
+            parts.append(proto_plus_message._meta.options.SerializeToString().hex())
+            for field in proto_plus_message._meta.fields.values():
+                parts.append(_field_signature(field))
+        for full_name, proto_plus_enum in self.enums.items():
+            parts.append(full_name)
+            parts.extend(
+                "{}={}".format(name, int(variant))
+                for name, variant in proto_plus_enum.__members__.items()
+            )
+        return _descriptor_cache.key(components[0].__module__, parts)
+
+    def _add_serialized(self, pool, serialized):
+        """Add a serialized file descriptor from the descriptor cache to the pool.
+
+        Returns:
+            bool: True if the descriptor was added, False if the pool
+                rejected it (in which case the cache entry is stale).
+        """
+        try:
+            pool.AddSerializedFile(serialized)
+        except (TypeError, message.DecodeError):
+            log.warning(
+                "Ignoring stale descriptor cache entry for {name}".format(
+                    name=self.descriptor.name
+                )
+            )
+            return False
+        return True
+
+    @_profiler.profiled("_FileInfo.ready", lambda self, new_class: self.name)
     def ready(self, new_class):
         """Return True if a file descriptor may added, False otherwise.
 
@@ -162,35 +359,38 @@ class _FileInfo(
         """
         # If there are any nested descriptors that have not been assigned to
         # the descriptors that should contain them, then we are not ready.
-        if len(self.nested) or len(self.nested_enum):
+        if self.nested or self.nested_enum:
             return False
 
         # If there are any unresolved fields (fields with a composite message
         # declared as a string), ensure that the corresponding message is
         # declared.
-        for field in self.unresolved_fields:
-            if (field.message and field.message not in self.messages) or (
-                field.enum and field.enum not in self.enums
-            ):
-                return False
+        if self.unresolved:
+            return False
 
         # If the module in which this class is defined provides a
         # __protobuf__ property, it may have a manifest.
         #
         # Do not generate the file descriptor until every member of the
-        # manifest has been populated.
+        # manifest has been populated. Members are crossed off once they
+        # are attributes of the module, so that each is only checked until
+        # it is populated; the class currently undergoing creation is not
+        # an attribute of its module yet, but counts as populated.
         module = inspect.getmodule(new_class)
-        manifest = self._get_remaining_manifest(new_class)
+        if self.missing_manifest is None:
+            self.missing_manifest = collections.deque(self._get_manifest(new_class))
+        missing = self.missing_manifest
+        current = None
+        while missing:
+            if hasattr(module, missing[0]):
+                missing.popleft()
+            elif current is None and missing[0] == new_class.__name__:
+                current = missing.popleft()
+            else:
+                break
 
         # We are ready if all members have been populated.
-        return all(hasattr(module, i) for i in manifest)
-
-    @property
-    def unresolved_fields(self):
-        """Return fields with referencing message types as strings."""
-        for proto_plus_message in self.messages.values():
-            for field in proto_plus_message._meta.fields.values():
-                if (field.message and isinstance(field.message, str)) or (
-                    field.enum and isinstance(field.enum, str)
-                ):
-                    yield field
+        ready = not missing
+        if current is not None:
+            missing.appendleft(current)
+        return ready
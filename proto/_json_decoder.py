@@ -0,0 +1,473 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental parsing of JSON from files into messages.
+
+``json_format.Parse`` loads the whole text into a tree of dictionaries and
+lists before filling in the message. :func:`merge` instead reads a file a
+chunk at a time, and fills in messages (including the elements of repeated
+fields and the values of maps, when they are messages) as it goes, so that
+only the message, one chunk of text and the value being read are in memory
+at once.
+
+Values other than messages are each loaded in full and handed, a message
+at a time, to ``json_format.ParseDict``, which converts them exactly as
+``json_format.Parse`` would.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.protobuf import json_format
+from google.protobuf import message
+
+# The size of the chunks read from files.
+CHUNK_SIZE = 64 * 1024
+
+# The limit on the nesting of messages `json_format` enforces by default.
+MAX_RECURSION_DEPTH = 100
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9eE.+-]*")
+
+# How the value of a field is read. Fields holding (or repeating, or
+# mapping to) regular messages are read incrementally when their value is
+# an object (or for repeated fields, an array); other values are loaded.
+_SINGULAR, _REPEATED, _MAP = range(3)
+
+# Messages with a special JSON representation, which are always loaded.
+_WELL_KNOWN_TYPES = frozenset(
+    (
+        "google.protobuf.Any",
+        "google.protobuf.Duration",
+        "google.protobuf.FieldMask",
+        "google.protobuf.ListValue",
+        "google.protobuf.Struct",
+        "google.protobuf.Timestamp",
+        "google.protobuf.Value",
+    )
+)
+
+
+class _Error(json_format.ParseError):
+    """An error which already says where it is, or is not in any field."""
+
+
+def _check_duplicates(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    result = {}
+    for name, value in pairs:
+        if name in result:
+            raise _Error("Failed to load JSON: duplicate key {0}.".format(name))
+        result[name] = value
+    return result
+
+
+_DECODER = json.JSONDecoder(object_pairs_hook=_check_duplicates)
+
+
+class _Reader:
+    """Reads JSON text from a file, a chunk at a time.
+
+    Args:
+        stream: A text or binary file object; binary files are decoded as
+            UTF-8.
+    """
+
+    def __init__(self, stream) -> None:
+        self._read = stream.read
+        self._decode = None
+        self.buffer = ""
+        self.pos = 0
+        # The position of the start of the buffer in the text.
+        self.offset = 0
+
+    def _more(self, size: int = None) -> bool:
+        """Read more text into the buffer; return False at the end of file."""
+        chunk = ""
+        while not chunk:
+            if self._read is None:
+                return False
+            chunk = self._read(size or CHUNK_SIZE)
+            if not chunk:
+                self._read = None
+            if isinstance(chunk, (bytes, bytearray)):
+                if self._decode is None:
+                    self._decode = codecs.getincrementaldecoder("utf-8")().decode
+                # A chunk may end in the middle of a character.
+                chunk = self._decode(chunk, final=self._read is None)
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.offset += self.pos
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace; return the next character, or "" at the end."""
+        try:
+            char = self.buffer[self.pos]
+        except IndexError:
+            pass
+        else:
+            if char not in " \t\n\r":
+                return char
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, char: str, expected: str) -> None:
+        """Consume the next character, which must be ``char``."""
+        if self.peek() != char:
+            self.fail("Expecting " + expected)
+        self.pos += 1
+
+    def fail(self, reason: str, pos: int = None):
+        if pos is None:
+            pos = self.pos
+        raise _Error(
+            "Failed to load JSON: {0}: char {1}.".format(reason, self.offset + pos)
+        )
+
+    def string(self) -> str:
+        """Read a string; the next character must be a double quote."""
+        while True:
+            try:
+                value, end = json.decoder.scanstring(self.buffer, self.pos + 1)
+            except json.JSONDecodeError as e:
+                if self._more():
+                    continue
+                self.fail(e.msg, e.pos)
+            self.pos = end
+            return value
+
+    def value(self) -> Any:
+        """Load the next value, whatever its type."""
+        self.peek()
+        size = CHUNK_SIZE
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self._read is None or not _maybe_truncated(e, len(self.buffer)):
+                    self.fail(e.msg, e.pos)
+            else:
+                # A number (or literal) running to the end of the buffer may
+                # continue in the next chunk.
+                tail = _NUMBER_TAIL.match(self.buffer, end).end()
+                if tail < len(self.buffer) or self._read is None:
+                    self.pos = end
+                    return value
+            # Read ever larger chunks, so that a large value is decoded a
+            # bounded number of times.
+            self._more(size)
+            size *= 2
+
+
+def _maybe_truncated(error: json.JSONDecodeError, length: int) -> bool:
+    # Text cut off in the middle of a value fails at (or, for an escape
+    # sequence, shortly before) its end, except for strings, which fail
+    # where they start.
+    return error.pos >= length - 6 or error.msg.startswith("Unterminated string")
+
+
+class JsonDecoder:
+    """Parses JSON from files into messages, with one set of options.
+
+    Args:
+        ignore_unknown_fields (bool): If True, skip fields which are not
+            in the message, rather than raising an error.
+    """
+
+    def __init__(self, *, ignore_unknown_fields: bool = False) -> None:
+        self.ignore_unknown_fields = ignore_unknown_fields
+        self._fields = {}
+
+    def merge(self, stream, pb: message.Message) -> None:
+        """Parse the JSON in a file into a protobuf message.
+
+        Args:
+            stream: A text or binary file object holding a JSON object;
+                binary files are decoded as UTF-8.
+            pb (~.message.Message): The protobuf message to merge into.
+
+        Raises:
+            ~.json_format.ParseError: If the JSON is invalid, or does not
+                represent a message of the given type.
+        """
+        reader = _Reader(stream)
+        try:
+            self._merge_message(reader, pb, pb.DESCRIPTOR.name, 1)
+        except json_format.ParseError:
+            raise
+        except Exception as e:
+            raise json_format.ParseError(
+                "Failed to parse JSON: {0}: {1}.".format(type(e).__name__, str(e))
+            ) from e
+        if reader.peek():
+            reader.fail("Extra data")
+
+    def _fields_of(self, descriptor) -> Optional[Dict[str, Tuple[Any, Any]]]:
+        """Return the fields of a message, keyed by each of their names.
+
+        Returns None for messages with no fields that are read
+        incrementally, which are loaded whole.
+        """
+        try:
+            return self._fields[descriptor]
+        except KeyError:
+            pass
+        fields = {}
+        for field in descriptor.fields:
+            fields.setdefault(field.name, (field, _read_as(field)))
+        for field in descriptor.fields:
+            # JSON names take precedence over field names.
+            fields[field.json_name] = (field, _read_as(field))
+        if all(read_as is None for _, read_as in fields.values()):
+            fields = None
+        self._fields[descriptor] = fields
+        return fields
+
+    def _merge_message(self, reader: _Reader, pb, path: str, depth: int) -> None:
+        if depth > MAX_RECURSION_DEPTH:
+            raise json_format.ParseError(
+                "Message too deep. Max recursion depth is {0}".format(
+                    MAX_RECURSION_DEPTH
+                )
+            )
+        fields = self._fields_of(pb.DESCRIPTOR)
+        if fields is None:
+            # The message is no larger than its JSON, so may as well be
+            # loaded at once.
+            if reader.peek() != "{":
+                reader.fail("Expecting '{'")
+            json_format.ParseDict(
+                reader.value(), pb, ignore_unknown_fields=self.ignore_unknown_fields
+            )
+            return
+        reader.expect("{", "'{'")
+        keys = set()
+        names = []
+        loaded = {}
+        if reader.peek() == "}":
+            reader.pos += 1
+            return
+        while True:
+            if reader.peek() != '"':
+                reader.fail("Expecting property name enclosed in double quotes")
+            key = reader.string()
+            if key in keys:
+                raise _Error("Failed to load JSON: duplicate key {0}.".format(key))
+            keys.add(key)
+            reader.expect(":", "':' delimiter")
+
+            field, read_as = fields.get(key, (None, None))
+            char = reader.peek()
+            if read_as is not None and char == ("[" if read_as == _REPEATED else "{"):
+                self._check_names(pb, field, key, names, path)
+                field_path = "{0}.{1}".format(path, key)
+                try:
+                    if read_as == _SINGULAR:
+                        submessage = getattr(pb, field.name)
+                        submessage.SetInParent()
+                        self._merge_message(reader, submessage, field_path, depth + 1)
+                    elif read_as == _REPEATED:
+                        self._merge_repeated(reader, pb, field, key, field_path, depth)
+                    else:
+                        self._merge_map(reader, pb, field, key, field_path, depth)
+                except _Error:
+                    raise
+                except (json_format.ParseError, ValueError, TypeError) as e:
+                    # Name the field, as json_format does.
+                    if field.containing_oneof is not None:
+                        raise json_format.ParseError(str(e)) from e
+                    raise json_format.ParseError(
+                        "Failed to parse {0} field: {1}.".format(key, e)
+                    ) from e
+            else:
+                # Everything else (including unknown fields and extensions)
+                # is left to json_format, once the object is read.
+                value = loaded[key] = reader.value()
+                if field is not None and value is not None:
+                    self._check_names(pb, field, key, names, path)
+
+            char = reader.peek()
+            reader.pos += 1
+            if char == "}":
+                break
+            if char != ",":
+                reader.pos -= 1
+                reader.fail("Expecting ',' delimiter")
+
+        if loaded:
+            json_format.ParseDict(
+                loaded, pb, ignore_unknown_fields=self.ignore_unknown_fields
+            )
+
+    def _check_names(self, pb, field, key: str, names: List[str], path: str):
+        # The same checks as json_format makes, which (with the check for
+        # duplicate keys) only reject setting several fields of a oneof.
+        if key in names:
+            raise json_format.ParseError(
+                'Message type "{0}" should not have multiple '
+                '"{1}" fields at "{2}".'.format(pb.DESCRIPTOR.full_name, key, path)
+            )
+        names.append(key)
+        if field.containing_oneof is not None:
+            oneof_name = field.containing_oneof.name
+            if oneof_name in names:
+                raise json_format.ParseError(
+                    'Message type "{0}" should not have multiple '
+                    '"{1}" oneof fields at "{2}".'.format(
+                        pb.DESCRIPTOR.full_name, oneof_name, path
+                    )
+                )
+            names.append(oneof_name)
+
+    def _merge_repeated(self, reader, pb, field, key, path, depth) -> None:
+        reader.pos += 1
+        pb.ClearField(field.name)
+        container = getattr(pb, field.name)
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        index = 0
+        while True:
+            if reader.peek() == "{":
+                element_path = "{0}[{1}]".format(path, index)
+                self._merge_message(reader, container.add(), element_path, depth + 1)
+            else:
+                # Not a message; json_format raises the appropriate error.
+                scratch = _scratch({key: [reader.value()]}, type(pb))
+                container.extend(getattr(scratch, field.name))
+            index += 1
+            char = reader.peek()
+            reader.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                reader.pos -= 1
+                reader.fail("Expecting ',' delimiter")
+
+    def _merge_map(self, reader, pb, field, key, path, depth) -> None:
+        reader.pos += 1
+        pb.ClearField(field.name)
+        container = getattr(pb, field.name)
+        key_field = field.message_type.fields_by_name["key"]
+        if reader.peek() == "}":
+            reader.pos += 1
+            return
+        while True:
+            if reader.peek() != '"':
+                reader.fail("Expecting property name enclosed in double quotes")
+            entry_key = reader.string()
+            reader.expect(":", "':' delimiter")
+            if reader.peek() == "{":
+                entry_path = "{0}.value[{1}]".format(path, entry_key)
+                value = container[_map_key(key_field, entry_key, path)]
+                self._merge_message(reader, value, entry_path, depth + 1)
+            else:
+                # Not a message; json_format raises the appropriate error.
+                scratch = _scratch({key: {entry_key: reader.value()}}, type(pb))
+                for scratch_key, value in getattr(scratch, field.name).items():
+                    container[scratch_key].MergeFrom(value)
+            char = reader.peek()
+            reader.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                reader.pos -= 1
+                reader.fail("Expecting ',' delimiter")
+
+
+def _scratch(js, message_class):
+    """Parse a value of one field into a new message."""
+    scratch = message_class()
+    try:
+        json_format.ParseDict(js, scratch)
+    except json_format.ParseError as e:
+        raise _Error(str(e)) from e
+    return scratch
+
+
+def _read_as(field):
+    """Return how a field is read incrementally, or None if it is loaded."""
+    message_type = field.message_type
+    if message_type is None:
+        return None
+    if message_type.GetOptions().map_entry:
+        value = message_type.fields_by_name["value"].message_type
+        if value is None or not _is_regular(value):
+            return None
+        return _MAP
+    if not _is_regular(message_type):
+        return None
+    if _is_repeated(field):
+        return _REPEATED
+    return _SINGULAR
+
+
+def _is_regular(descriptor) -> bool:
+    """Return whether a message has the usual JSON representation."""
+    return (
+        descriptor.full_name not in _WELL_KNOWN_TYPES
+        and descriptor.file.name != "google/protobuf/wrappers.proto"
+    )
+
+
+def _is_repeated(field) -> bool:
+    # `FieldDescriptor.label` is deprecated in favor of `is_repeated`, which
+    # older runtimes lack.
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is None:
+        return field.label == field.LABEL_REPEATED
+    return is_repeated
+
+
+def _map_key(field, key: str, path: str):
+    """Convert the key of a map entry, as json_format does."""
+    if field.cpp_type == field.CPPTYPE_STRING:
+        return key
+    if field.cpp_type == field.CPPTYPE_BOOL:
+        if key == "true":
+            return True
+        if key == "false":
+            return False
+        raise json_format.ParseError(
+            'Expected "true" or "false", not {0} at {1}.key'.format(key, path)
+        )
+    if " " in key:
+        raise json_format.ParseError(
+            'Couldn\'t parse integer: "{0}" at {1}.key.'.format(key, path)
+        )
+    return int(key)
+
+
+def merge(stream, pb: message.Message, *, ignore_unknown_fields: bool = False):
+    """Parse the JSON in a file into a protobuf message.
+
+    Args:
+        stream: A text or binary file object holding a JSON object; binary
+            files are decoded as UTF-8.
+        pb (~.message.Message): The protobuf message to merge into.
+        ignore_unknown_fields (bool): If True, skip fields which are not in
+            the message, rather than raising an error.
+
+    Raises:
+        ~.json_format.ParseError: If the JSON is invalid, or does not
+            represent a message of the given type.
+    """
+    JsonDecoder(ignore_unknown_fields=ignore_unknown_fields).merge(stream, pb)
@@ -0,0 +1,491 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Encoding of messages as JSON, without building a dictionary first.
+
+``json_format.MessageToJson`` converts a message to a tree of dictionaries
+and lists, and then hands the tree to ``json.dumps``. A :class:`JsonEncoder`
+writes the same text (as written by protobuf 5 and later) straight to its
+output instead, field by field, from writers compiled once per message type
+and set of options.
+"""
+
+import base64
+import functools
+import json
+import math
+from typing import Any, Callable, List, Tuple
+
+from google.protobuf import json_format
+from google.protobuf import message
+from google.protobuf.internal import type_checkers
+
+# The function `json.dumps` escapes strings with (by default, with
+# `ensure_ascii`); it is implemented in C where possible.
+_encode_string = json.encoder.encode_basestring_ascii
+
+# How values of a type are written. A "simple" writer takes the value and
+# returns its text; a "compound" one, used for messages, lists and maps,
+# takes the value, a function to write text with, and the depth of the
+# value in the output, which the indentation depends on.
+_Writer = Tuple[Callable, bool]
+
+
+class JsonEncoder:
+    """Writes messages as JSON, with one set of options.
+
+    Args:
+        use_integers_for_enums (bool): Whether enum values are written as
+            integers, rather than by name.
+        preserving_proto_field_name (bool): Whether fields are named as in
+            the proto definition, rather than in lowerCamelCase.
+        sort_keys (bool): Whether the keys of each object are sorted.
+        indent (Optional[Union[int, str]]): The indentation of each level
+            of the output, as for ``json.dumps``; None for the most compact
+            representation, without newlines.
+        print_fields (bool): Whether fields without presence are written
+            even if they hold their default value.
+    """
+
+    def __init__(
+        self,
+        *,
+        use_integers_for_enums: bool = False,
+        preserving_proto_field_name: bool = False,
+        sort_keys: bool = False,
+        indent=None,
+        print_fields: bool = False,
+    ) -> None:
+        self.use_integers_for_enums = use_integers_for_enums
+        self.preserving_proto_field_name = preserving_proto_field_name
+        self.sort_keys = sort_keys
+        self.print_fields = print_fields
+        if indent is not None and not isinstance(indent, str):
+            indent = " " * indent
+        self._indent = indent
+        self._writers = {}
+
+    def encode(self, pb: message.Message) -> str:
+        """Return a protobuf message as JSON.
+
+        Args:
+            pb (~.message.Message): The protobuf message.
+
+        Returns:
+            str: The JSON representation of the message, as written by
+                ``json_format.MessageToJson`` with the encoder's options.
+
+        Raises:
+            ~.json_format.SerializeToJsonError: If the message holds a value
+                which has no JSON representation.
+        """
+        chunks = []
+        self.dump(pb, chunks.append)
+        return "".join(chunks)
+
+    def dump(self, pb: message.Message, write: Callable[[str], Any]) -> None:
+        """Write a protobuf message as JSON.
+
+        Args:
+            pb (~.message.Message): The protobuf message.
+            write (Callable[[str], Any]): Writes text to the output, such as
+                the ``write`` method of a text file or ``io.StringIO``.
+
+        Raises:
+            ~.json_format.SerializeToJsonError: If the message holds a value
+                which has no JSON representation.
+        """
+        writer, compound = self._message_writer(pb.DESCRIPTOR)
+        if compound:
+            writer(pb, write, 0)
+        else:
+            write(writer(pb))
+
+    def _message_writer(self, descriptor) -> _Writer:
+        writer = self._writers.get(descriptor)
+        if writer is None:
+            writer = self._writers[descriptor] = self._compile_message(descriptor)
+        return writer
+
+    def _compile_message(self, descriptor) -> _Writer:
+        full_name = descriptor.full_name
+        if descriptor.file.name == "google/protobuf/wrappers.proto":
+            format_value, _ = self._field_writer(descriptor.fields_by_name["value"])
+            return (lambda pb: format_value(pb.value)), False
+        if full_name in (
+            "google.protobuf.Timestamp",
+            "google.protobuf.Duration",
+            "google.protobuf.FieldMask",
+        ):
+            return (lambda pb: _encode_string(pb.ToJsonString())), False
+        if full_name == "google.protobuf.Value":
+            return self._write_value, True
+        if full_name == "google.protobuf.ListValue":
+            return self._write_list_value, True
+        if full_name == "google.protobuf.Struct":
+            return self._write_struct, True
+        if full_name == "google.protobuf.Any":
+            return self._write_any, True
+        return _MessagePlan(self, descriptor).write, True
+
+    def _field_writer(self, field) -> _Writer:
+        """Return the writer of a field's value (or values, if repeated)."""
+        message_type = field.message_type
+        if message_type is not None and message_type.GetOptions().map_entry:
+            value_writer = self._field_writer(message_type.fields_by_name["value"])
+            return self._map_writer(value_writer), True
+        if field.message_type is not None:
+            writer = self._message_writer(message_type)
+        else:
+            writer = self._scalar_writer(field), False
+        if _is_repeated(field):
+            return self._list_writer(writer), True
+        return writer
+
+    def _scalar_writer(self, field) -> Callable[[Any], str]:
+        cpp_type = field.cpp_type
+        if cpp_type == field.CPPTYPE_ENUM:
+            return self._enum_writer(field.enum_type)
+        if cpp_type == field.CPPTYPE_STRING:
+            if field.type == field.TYPE_BYTES:
+                return _format_bytes
+            return _encode_string
+        if cpp_type == field.CPPTYPE_BOOL:
+            return _format_bool
+        if cpp_type in (field.CPPTYPE_INT64, field.CPPTYPE_UINT64):
+            return _format_int64
+        if cpp_type == field.CPPTYPE_DOUBLE:
+            return _format_double
+        if cpp_type == field.CPPTYPE_FLOAT:
+            return _format_float
+        return int.__repr__
+
+    def _enum_writer(self, enum_type) -> Callable[[int], str]:
+        if self.use_integers_for_enums:
+            return int.__repr__
+        if enum_type.full_name == "google.protobuf.NullValue":
+            return lambda value: "null"
+        names = {
+            number: _encode_string(value.name)
+            for number, value in enum_type.values_by_number.items()
+        }
+        if not getattr(enum_type, "is_closed", False):
+            return lambda value: names.get(value) or int.__repr__(value)
+
+        def format_enum(value):
+            try:
+                return names[value]
+            except KeyError:
+                raise json_format.SerializeToJsonError(
+                    "Enum field contains an integer value "
+                    "which can not mapped to an enum value."
+                ) from None
+
+        return format_enum
+
+    def _list_writer(self, writer: _Writer) -> Callable:
+        format_item, compound = writer
+        indent = self._indent
+
+        if not compound:
+
+            def write_list(values, write, level):
+                if not values:
+                    write("[]")
+                elif indent is None:
+                    write("[" + ", ".join(map(format_item, values)) + "]")
+                else:
+                    inner = "\n" + indent * (level + 1)
+                    write(
+                        "["
+                        + inner
+                        + ("," + inner).join(map(format_item, values))
+                        + "\n"
+                        + indent * level
+                        + "]"
+                    )
+
+            return write_list
+
+        def write_list(values, write, level):
+            if not values:
+                write("[]")
+                return
+            if indent is None:
+                separator, item_separator, end = "[", ", ", "]"
+            else:
+                inner = "\n" + indent * (level + 1)
+                separator, item_separator = "[" + inner, "," + inner
+                end = "\n" + indent * level + "]"
+            for value in values:
+                write(separator)
+                format_item(value, write, level + 1)
+                separator = item_separator
+            write(end)
+
+        return write_list
+
+    def _map_writer(self, writer: _Writer) -> Callable:
+        def write_map(entries, write, level):
+            items = []
+            for key in entries:
+                if isinstance(key, bool):
+                    name = "true" if key else "false"
+                else:
+                    name = str(key)
+                items.append((name, entries[key]))
+            self._write_object(items, writer, write, level)
+
+        return write_map
+
+    def _write_object(
+        self,
+        items: List[Tuple[str, Any]],
+        writer: _Writer,
+        write: Callable[[str], Any],
+        level: int,
+    ) -> None:
+        """Write an object whose values are all written by one writer."""
+        if not items:
+            write("{}")
+            return
+        if self.sort_keys:
+            items.sort(key=_first)
+        format_value, compound = writer
+        separator, item_separator, end = self._object_separators(level)
+        for name, value in items:
+            write(separator + _encode_string(name) + ": ")
+            if compound:
+                format_value(value, write, level + 1)
+            else:
+                write(format_value(value))
+            separator = item_separator
+        write(end)
+
+    def _object_separators(self, level: int) -> Tuple[str, str, str]:
+        indent = self._indent
+        if indent is None:
+            return "{", ", ", "}"
+        inner = "\n" + indent * (level + 1)
+        return "{" + inner, "," + inner, "\n" + indent * level + "}"
+
+    def _write_value(self, pb, write, level) -> None:
+        kind = pb.WhichOneof("kind")
+        if kind is None or kind == "null_value":
+            write("null")
+        elif kind == "number_value":
+            value = pb.number_value
+            if math.isinf(value):
+                raise ValueError(
+                    "Fail to serialize Infinity for Value.number_value, "
+                    "which would parse as string_value"
+                )
+            if math.isnan(value):
+                raise ValueError(
+                    "Fail to serialize NaN for Value.number_value, "
+                    "which would parse as string_value"
+                )
+            write(float.__repr__(value))
+        elif kind == "string_value":
+            write(_encode_string(pb.string_value))
+        elif kind == "bool_value":
+            write(_format_bool(pb.bool_value))
+        elif kind == "struct_value":
+            self._write_struct(pb.struct_value, write, level)
+        else:
+            self._write_list_value(pb.list_value, write, level)
+
+    def _write_list_value(self, pb, write, level) -> None:
+        self._list_writer((self._write_value, True))(pb.values, write, level)
+
+    def _write_struct(self, pb, write, level) -> None:
+        fields = pb.fields
+        items = [(key, fields[key]) for key in fields]
+        self._write_object(items, (self._write_value, True), write, level)
+
+    def _write_any(self, pb, write, level) -> None:
+        # Any messages are rare, and need their type looked up by name; they
+        # are converted by json_format, and only written here.
+        converted = json_format.MessageToDict(
+            pb,
+            always_print_fields_with_no_presence=self.print_fields,
+            preserving_proto_field_name=self.preserving_proto_field_name,
+            use_integers_for_enums=self.use_integers_for_enums,
+        )
+        self._write_converted(converted, write, level)
+
+    def _write_converted(self, value, write, level) -> None:
+        """Write the JSON object of a message, as json_format converted it."""
+        if isinstance(value, dict):
+            items = list(value.items())
+            self._write_object(items, (self._write_converted, True), write, level)
+        elif isinstance(value, list):
+            self._list_writer((self._write_converted, True))(value, write, level)
+        else:
+            write(json.dumps(value))
+
+
+class _MessagePlan:
+    """The writer of one (regular) message type, for one encoder.
+
+    The writer is compiled on first use, so that messages referring to
+    each other (or to themselves) may be compiled in any order.
+
+    Args:
+        encoder (~.JsonEncoder): The encoder.
+        descriptor (~.descriptor.Descriptor): The message type.
+    """
+
+    def __init__(self, encoder: JsonEncoder, descriptor) -> None:
+        self._encoder = encoder
+        self._descriptor = descriptor
+        self._fields = None
+        self._defaults = None
+
+    def _compile(self) -> None:
+        fields, defaults = {}, []
+        for field in self._descriptor.fields:
+            fields[field.name] = self._entry(field)
+            if self._encoder.print_fields and not field.has_presence:
+                message_type = field.message_type
+                if message_type is not None and message_type.GetOptions().map_entry:
+                    default = {}
+                elif _is_repeated(field):
+                    default = ()
+                else:
+                    default = field.default_value
+                defaults.append((field.name, fields[field.name], default))
+        self._fields, self._defaults = fields, defaults
+
+    def _entry(self, field) -> Tuple[str, str, str, Callable, bool]:
+        """Return how a field is written.
+
+        Returns:
+            Tuple[str, str, str, Callable, bool]: The name of the field (as
+                given in errors), its key in the output (which keys are
+                sorted by), the text preceding its value, and the writer of
+                the value.
+        """
+        encoder = self._encoder
+        if field.is_extension:
+            key = "[%s]" % field.full_name
+        elif encoder.preserving_proto_field_name:
+            key = field.name
+        else:
+            key = field.json_name
+        writer, compound = encoder._field_writer(field)
+        return (field.name, key, _encode_string(key) + ": ", writer, compound)
+
+    def write(self, pb, write, level) -> None:
+        if self._fields is None:
+            self._compile()
+        fields = self._fields
+        entries = []
+        for field, value in pb.ListFields():
+            entry = fields.get(field.name)
+            if entry is None or field.is_extension:
+                entry = self._entry(field)
+            entries.append((entry, value))
+        if self._defaults:
+            written = {entry[0] for entry, _ in entries}
+            for name, entry, default in self._defaults:
+                if name not in written:
+                    entries.append((entry, default))
+        if not entries:
+            write("{}")
+            return
+        if self._encoder.sort_keys:
+            entries.sort(key=_sort_key)
+
+        separator, item_separator, end = self._encoder._object_separators(level)
+        try:
+            for entry, value in entries:
+                name, _, prefix, writer, compound = entry
+                if compound:
+                    write(separator + prefix)
+                    writer(value, write, level + 1)
+                else:
+                    write(separator + prefix + writer(value))
+                separator = item_separator
+        except ValueError as e:
+            raise json_format.SerializeToJsonError(
+                "Failed to serialize {0} field: {1}.".format(name, e)
+            ) from e
+        write(end)
+
+
+@functools.lru_cache(maxsize=64)
+def encoder(
+    *,
+    use_integers_for_enums: bool,
+    preserving_proto_field_name: bool,
+    sort_keys: bool,
+    indent,
+    print_fields: bool,
+) -> JsonEncoder:
+    """Return the encoder for a set of options, shared by every caller."""
+    return JsonEncoder(
+        use_integers_for_enums=use_integers_for_enums,
+        preserving_proto_field_name=preserving_proto_field_name,
+        sort_keys=sort_keys,
+        indent=indent,
+        print_fields=print_fields,
+    )
+
+
+def _is_repeated(field) -> bool:
+    # `FieldDescriptor.label` is deprecated in favor of `is_repeated`, which
+    # older runtimes lack.
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is None:
+        return field.label == field.LABEL_REPEATED
+    return is_repeated
+
+
+def _first(item):
+    return item[0]
+
+
+def _sort_key(entry):
+    return entry[0][1]
+
+
+def _format_bool(value: bool) -> str:
+    return "true" if value else "false"
+
+
+def _format_int64(value: int) -> str:
+    # 64-bit integers are written as strings.
+    return '"%d"' % value
+
+
+def _format_bytes(value: bytes) -> str:
+    return '"' + base64.b64encode(value).decode("utf-8") + '"'
+
+
+def _format_double(value: float) -> str:
+    if math.isinf(value):
+        return '"-Infinity"' if value < 0 else '"Infinity"'
+    if math.isnan(value):
+        return '"NaN"'
+    return float.__repr__(value)
+
+
+def _format_float(value: float) -> str:
+    if math.isinf(value):
+        return '"-Infinity"' if value < 0 else '"Infinity"'
+    if math.isnan(value):
+        return '"NaN"'
+    # Write the shortest decimal which is the same 32-bit float.
+    return float.__repr__(type_checkers.ToShortestFloat(value))
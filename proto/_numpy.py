@@ -0,0 +1,75 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Support for exchanging field values with NumPy, which is optional.
+
+NumPy is only imported when one of the features needing it is first
+used, so that proto-plus does not depend on it.
+"""
+
+import enum
+from typing import Optional
+
+from proto.primitives import ProtoType
+
+# Mapping[ProtoType, str]: the NumPy dtype holding each numeric type (and
+# bools) exactly.
+DTYPES = {
+    ProtoType.DOUBLE: "float64",
+    ProtoType.FLOAT: "float32",
+    ProtoType.INT64: "int64",
+    ProtoType.SINT64: "int64",
+    ProtoType.SFIXED64: "int64",
+    ProtoType.UINT64: "uint64",
+    ProtoType.FIXED64: "uint64",
+    ProtoType.INT32: "int32",
+    ProtoType.SINT32: "int32",
+    ProtoType.SFIXED32: "int32",
+    ProtoType.UINT32: "uint32",
+    ProtoType.FIXED32: "uint32",
+    ProtoType.BOOL: "bool",
+    ProtoType.ENUM: "int32",
+}
+
+
+def load():
+    """Return the ``numpy`` module.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "NumPy is required for this feature; install it with "
+            "`pip install proto-plus[numpy]`."
+        ) from exc
+    return numpy
+
+
+def dtype_for(proto_type) -> Optional[str]:
+    """Return the NumPy dtype for values of a field type, if there is one.
+
+    Args:
+        proto_type: The type of the field: a :class:`~.ProtoType`, or the
+            Python enum class of an enum field.
+
+    Returns:
+        Optional[str]: The name of the dtype, or None if values of the type
+            have no NumPy equivalent (such as strings and messages).
+    """
+    if isinstance(proto_type, type) and issubclass(proto_type, enum.IntEnum):
+        return DTYPES[ProtoType.ENUM]
+    return DTYPES.get(proto_type)
@@ -0,0 +1,158 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An opt-in profiler for the time spent building proto-plus classes.
+
+Set the ``PROTO_PLUS_PROFILE`` environment variable to a non-empty value
+(other than ``0``) to record where the time goes while messages and enums
+are declared, which happens mostly while importing generated modules. A
+report is written to stderr when the interpreter exits.
+
+Times are inclusive: the time recorded for a module includes the time
+spent generating its file descriptors, which in turn includes the time
+spent adding them to the descriptor pool. Calls made while another call of
+the same category is in progress are counted as part of the outer call.
+"""
+
+import atexit
+import collections
+import contextlib
+import functools
+import os
+import sys
+import time
+
+ENV_VAR = "PROTO_PLUS_PROFILE"
+
+enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+
+# Mapping[str, Mapping[str, List[int, float]]]: the number of calls and the
+# total time in seconds, per key, per category.
+_records = collections.defaultdict(lambda: collections.defaultdict(lambda: [0, 0.0]))
+
+# Mapping[str, int]: the number of calls in progress, per category. Calls
+# made while another call in the same category is in progress (such as
+# map entry messages, which are declared while declaring their parent) are
+# not recorded separately, so that totals do not count any time twice.
+_active = collections.Counter()
+
+
+def record(category: str, key: str, seconds: float) -> None:
+    """Record one timed call.
+
+    Args:
+        category (str): What was timed, e.g. ``"descriptor_pool.Add"``.
+        key (str): What it was timed for, e.g. a module or file name.
+        seconds (float): How long the call took.
+    """
+    entry = _records[category][key]
+    entry[0] += 1
+    entry[1] += seconds
+
+
+def profiled(category: str, key):
+    """Time every call to the decorated function, if profiling is enabled.
+
+    If profiling is not enabled when the function is decorated, the
+    function is returned unchanged, so this costs nothing at call time.
+
+    Args:
+        category (str): The category to record the calls under.
+        key (Callable[..., str]): Called with the decorated function's
+            arguments, and returns the key to record the call under.
+    """
+
+    def decorator(fx):
+        if not enabled:
+            return fx
+
+        @functools.wraps(fx)
+        def inner(*args, **kwargs):
+            with _timer(category, key(*args, **kwargs)):
+                return fx(*args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+@contextlib.contextmanager
+def _timer(category, key):
+    if _active[category]:
+        yield
+        return
+    _active[category] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(category, key, time.perf_counter() - start)
+        _active[category] -= 1
+
+
+def timer(category: str, key: str):
+    """Return a context manager timing its body, if profiling is enabled.
+
+    Args:
+        category (str): The category to record the time under.
+        key (str): The key to record the time under.
+    """
+    if not enabled:
+        return contextlib.nullcontext()
+    return _timer(category, key)
+
+
+def report(limit: int = 20) -> str:
+    """Return a summary of the recorded times.
+
+    Args:
+        limit (int): The number of keys to list per category, slowest first.
+
+    Returns:
+        str: The summary, as a human readable table.
+    """
+    lines = []
+    for category, entries in sorted(_records.items()):
+        total = sum(seconds for _, seconds in entries.values())
+        lines.append(
+            "{category}: {calls} calls, {total:.1f} ms".format(
+                category=category,
+                calls=sum(calls for calls, _ in entries.values()),
+                total=total * 1000,
+            )
+        )
+        slowest = sorted(entries.items(), key=lambda i: i[1][1], reverse=True)
+        for key, (calls, seconds) in slowest[:limit]:
+            lines.append(
+                "  {ms:10.2f} ms {calls:8d} calls  {key}".format(
+                    ms=seconds * 1000, calls=calls, key=key
+                )
+            )
+    return "\n".join(lines)
+
+
+def reset() -> None:
+    """Discard everything recorded so far."""
+    _records.clear()
+
+
+def _report_at_exit():
+    if _records:
+        sys.stderr.write(
+            "proto-plus class construction profile:\n{}\n".format(report())
+        )
+
+
+if enabled:
+    atexit.register(_report_at_exit)
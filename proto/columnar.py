@@ -0,0 +1,344 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export sequences of messages column by column.
+
+:func:`to_columns` reads one field at a time across many messages of one
+class, straight from their underlying protobuf instances, without
+building a dictionary for each message. The columns can be handed to
+``pandas.DataFrame`` or ``pyarrow.table`` as they are.
+"""
+
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+from google.protobuf import duration_pb2
+from google.protobuf import timestamp_pb2
+from google.protobuf import wrappers_pb2
+
+from proto import _numpy
+from proto.message import Message
+from proto.primitives import ProtoType
+
+BACKENDS = ("python", "numpy", "arrow")
+
+_NANOS_PER_SECOND = 10**9
+
+
+class _Kind:
+    """How the values of a field (or of each element, if repeated) are stored.
+
+    Args:
+        name (str): One of ``"scalar"``, ``"string"``, ``"bytes"``,
+            ``"enum"``, ``"timestamp"``, ``"duration"`` or ``"message"``.
+        convert (Optional[Callable[[Any], Any]]): Converts a protobuf value
+            to the value stored in the column, if they differ.
+        dtype (Optional[str]): The NumPy dtype of the values, for scalars
+            and enums stored as integers.
+        nullable (bool): Whether the field is a message, whose value is
+            None when it is absent.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        convert: Optional[Callable] = None,
+        dtype=None,
+        nullable: bool = False,
+    ):
+        self.name = name
+        self.convert = convert
+        self.dtype = dtype
+        self.nullable = nullable
+
+
+def _nanoseconds(value) -> int:
+    return value.seconds * _NANOS_PER_SECOND + value.nanos
+
+
+def _kind(field, *, enums: str, backend: str) -> _Kind:
+    """Return how the values of a (non-map) field are stored."""
+    if field.enum:
+        if enums == "category":
+            names = {variant.value: variant.name for variant in field.enum}
+            # Values unknown to the enum are named by their number.
+            return _Kind("enum", lambda value: names.get(value) or str(value))
+        return _Kind("enum", dtype=_numpy.DTYPES[ProtoType.ENUM])
+    if field.message:
+        pb_type = field.pb_type
+        full_name = pb_type.DESCRIPTOR.full_name
+        if full_name == timestamp_pb2.Timestamp.DESCRIPTOR.full_name:
+            return _Kind("timestamp", _nanoseconds, nullable=True)
+        if full_name == duration_pb2.Duration.DESCRIPTOR.full_name:
+            return _Kind("duration", _nanoseconds, nullable=True)
+        if backend == "arrow":
+            if pb_type.DESCRIPTOR.file.name == wrappers_pb2.DESCRIPTOR.name:
+                # Wrappers hold their value, as the marshal unwraps them
+                # for the other backends.
+                wrapped = _scalar_kind(pb_type.DESCRIPTOR.fields_by_name["value"].type)
+                return _Kind(
+                    wrapped.name,
+                    operator.attrgetter("value"),
+                    dtype=wrapped.dtype,
+                    nullable=True,
+                )
+            return _Kind(
+                "message",
+                operator.methodcaller("SerializeToString"),
+                nullable=True,
+            )
+        marshal = field.parent._meta.marshal
+        return _Kind(
+            "message",
+            lambda value: marshal.to_python(pb_type, value),
+            nullable=True,
+        )
+    return _scalar_kind(field.proto_type)
+
+
+def _scalar_kind(proto_type: int) -> _Kind:
+    """Return how the values of a (non-enum) scalar field are stored."""
+    if proto_type == ProtoType.STRING:
+        return _Kind("string")
+    if proto_type == ProtoType.BYTES:
+        return _Kind("bytes")
+    return _Kind("scalar", dtype=_numpy.DTYPES[proto_type])
+
+
+def _map_entry(field) -> Optional[Type[Message]]:
+    """Return the entry message of a map field, or None for other fields."""
+    meta = getattr(field.message, "_meta", None)
+    if field.repeated and meta is not None and meta.options.map_entry:
+        return field.message
+    return None
+
+
+def _read(field, kind: _Kind, pbs: List[Any]) -> List[Any]:
+    """Return the values of a singular field, as a list."""
+    values = list(map(operator.attrgetter(field.name), pbs))
+    if kind.nullable:
+        # Absent messages are represented as None.
+        convert = kind.convert
+        return [
+            convert(value) if pb.HasField(field.name) else None
+            for pb, value in zip(pbs, values)
+        ]
+    if kind.convert is not None:
+        return list(map(kind.convert, values))
+    return values
+
+
+def _read_repeated(field, kind: _Kind, pbs: List[Any]) -> List[List[Any]]:
+    """Return the values of a repeated field, as a list per message."""
+    containers = map(operator.attrgetter(field.name), pbs)
+    convert = kind.convert
+    if convert is None:
+        return [container[:] for container in containers]
+    return [list(map(convert, container)) for container in containers]
+
+
+def _read_map(key_kind, value_kind, field, pbs) -> List[Dict[Any, Any]]:
+    """Return the entries of a map field, as a dictionary per message."""
+    containers = map(operator.attrgetter(field.name), pbs)
+    convert_key = key_kind.convert or (lambda key: key)
+    convert_value = value_kind.convert or (lambda value: value)
+    return [
+        {convert_key(k): convert_value(v) for k, v in container.items()}
+        for container in containers
+    ]
+
+
+def _object_array(numpy, values):
+    # Assign one by one: `numpy.array` would turn equal-length lists (and
+    # anything else that looks like a sequence) into more dimensions.
+    array = numpy.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        array[index] = value
+    return array
+
+
+def _to_numpy(numpy, values, kind: _Kind, *, repeated: bool, is_map: bool):
+    if is_map:
+        return _object_array(numpy, values)
+    if repeated:
+        if kind.dtype is not None:
+            values = [numpy.array(row, dtype=kind.dtype) for row in values]
+        return _object_array(numpy, values)
+    if kind.dtype is not None:
+        return numpy.array(values, dtype=kind.dtype)
+    if kind.name in ("timestamp", "duration"):
+        # Absent values become NaT, which is the smallest 64-bit integer.
+        nat = numpy.iinfo(numpy.int64).min
+        nanos = numpy.array(
+            [nat if value is None else value for value in values],
+            dtype=numpy.int64,
+        )
+        unit = "datetime64[ns]" if kind.name == "timestamp" else "timedelta64[ns]"
+        return nanos.view(unit)
+    return _object_array(numpy, values)
+
+
+def _arrow_type(pyarrow, kind: _Kind):
+    if kind.dtype is not None:
+        return pyarrow.type_for_alias(kind.dtype)
+    return {
+        "string": pyarrow.string(),
+        "bytes": pyarrow.binary(),
+        # Enums stored as names; see `_to_arrow` for dictionary encoding.
+        "enum": pyarrow.string(),
+        "timestamp": pyarrow.timestamp("ns", tz="UTC"),
+        "duration": pyarrow.duration("ns"),
+        "message": pyarrow.binary(),
+    }[kind.name]
+
+
+def _to_arrow(pyarrow, values, kind: _Kind, *, repeated: bool, key_kind=None):
+    value_type = _arrow_type(pyarrow, kind)
+    if key_kind is not None:
+        map_type = pyarrow.map_(_arrow_type(pyarrow, key_kind), value_type)
+        return pyarrow.array([list(row.items()) for row in values], type=map_type)
+    if repeated:
+        return pyarrow.array(values, type=pyarrow.list_(value_type))
+    array = pyarrow.array(values, type=value_type)
+    if kind.name == "enum" and kind.dtype is None:
+        # Enums stored as names are categorical.
+        array = array.dictionary_encode()
+    return array
+
+
+def _load_arrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "pyarrow is required for the arrow backend; install it with "
+            "`pip install pyarrow`."
+        ) from exc
+    return pyarrow
+
+
+def to_columns(
+    messages: Iterable[Message],
+    message_type: Optional[Type[Message]] = None,
+    *,
+    backend: str = "numpy",
+    enums: str = "int",
+) -> Dict[str, Any]:
+    """Return the values of each field of a sequence of messages, by field.
+
+    Fields are read straight from the underlying protobuf instances, one
+    field at a time, so no dictionary is built for each message.
+
+    Each field becomes one column, keyed by the field's name, holding one
+    value per message:
+
+    * Numeric and boolean fields hold their values, in an array of the
+      matching dtype (for instance ``float32`` for ``FLOAT`` fields).
+    * Enums hold their numbers, or with ``enums="category"``, their names
+      (which the ``arrow`` backend dictionary-encodes).
+    * ``google.protobuf.Timestamp`` and ``google.protobuf.Duration`` fields
+      hold 64-bit integer nanoseconds (as ``datetime64[ns]`` and
+      ``timedelta64[ns]`` with NumPy), and are null when absent.
+    * Wrapper fields (such as ``google.protobuf.Int32Value``) hold their
+      wrapped value, and are null when absent.
+    * Other message fields hold the message, as it is read from the field
+      (or, with the ``arrow`` backend, serialized), and are null when
+      absent.
+    * Repeated fields hold a list of values per message, converted as
+      above (as an array per message with NumPy, for numeric elements),
+      and map fields hold a dictionary per message.
+
+    Args:
+        messages (Iterable[~.Message]): The messages; all instances of the
+            same class.
+        message_type (Type[~.Message]): The class of the messages. Defaults
+            to the class of the first message; required if there may be no
+            messages.
+        backend (str): What the columns are: ``"python"`` for lists,
+            ``"numpy"`` for NumPy arrays, or ``"arrow"`` for
+            ``pyarrow.Array`` objects. NumPy and pyarrow are optional
+            dependencies, needed only by their backend.
+        enums (str): How to represent enums: ``"int"`` for their numbers,
+            or ``"category"`` for their names.
+
+    Returns:
+        Dict[str, Any]: The columns, keyed by field name, in the order the
+            fields were declared.
+
+    Raises:
+        TypeError: If a message is not an instance of ``message_type``.
+        ValueError: If there are no messages and no ``message_type``, or
+            if ``backend`` or ``enums`` is not recognized.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            "Unknown backend {!r}; expected one of {}.".format(backend, BACKENDS)
+        )
+    if enums not in ("int", "category"):
+        raise ValueError(
+            "Unknown enum representation {!r}; expected 'int' or "
+            "'category'.".format(enums)
+        )
+    # Load the backend first, so that a missing dependency is reported
+    # before any work is done.
+    library = None
+    if backend == "numpy":
+        library = _numpy.load()
+    elif backend == "arrow":
+        library = _load_arrow()
+
+    pbs = []
+    for message in messages:
+        if message_type is None:
+            message_type = type(message)
+        pbs.append(message_type.pb(message))
+    if message_type is None:
+        raise ValueError("`message_type` is required when there are no messages.")
+
+    columns = {}
+    for name, field in message_type.meta.fields.items():
+        entry = _map_entry(field)
+        key_kind = None
+        if entry is not None:
+            key_kind = _kind(entry.meta.fields["key"], enums=enums, backend=backend)
+            kind = _kind(entry.meta.fields["value"], enums=enums, backend=backend)
+            values = _read_map(key_kind, kind, field, pbs)
+        else:
+            kind = _kind(field, enums=enums, backend=backend)
+            if field.repeated:
+                values = _read_repeated(field, kind, pbs)
+            else:
+                values = _read(field, kind, pbs)
+
+        if backend == "numpy":
+            values = _to_numpy(
+                library,
+                values,
+                kind,
+                repeated=field.repeated,
+                is_map=entry is not None,
+            )
+        elif backend == "arrow":
+            values = _to_arrow(
+                library,
+                values,
+                kind,
+                repeated=field.repeated,
+                key_kind=key_kind,
+            )
+        columns[name] = values
+    return columns
+
+
+__all__ = ("to_columns",)
@@ -18,12 +18,16 @@ from google.protobuf import descriptor_pb2
 
 from proto import _file_info
 from proto import _package_info
+from proto import _profiler
 from proto.marshal.rules.enums import EnumRule
 
 
 class ProtoEnumMeta(enum.EnumMeta):
     """A metaclass for building and registering protobuf enums."""
 
+    @_profiler.profiled(
+        "class construction", lambda mcls, name, bases, attrs: attrs.get("__module__")
+    )
     def __new__(mcls, name, bases, attrs):
         # Do not do any special behavior for `proto.Enum` itself.
         if bases[0] == enum.IntEnum:
@@ -66,30 +70,44 @@ class ProtoEnumMeta(enum.EnumMeta):
             else:  # Python 3.11.0b3
                 del attrs._member_names[pb_options]
 
-        # Make the descriptor.
-        enum_desc = descriptor_pb2.EnumDescriptorProto(
-            name=name,
-            # Note: the superclass ctor removes the variants, so get them now.
-            # Note: proto3 requires that the first variant value be zero.
-            value=sorted(
-                (
-                    descriptor_pb2.EnumValueDescriptorProto(name=name, number=number)
-                    # Minor hack to get all the enum variants out.
-                    # Use the `_member_names` property to get only the enum members
-                    # See https://github.com/googleapis/proto-plus-python/issues/490
-                    for name, number in attrs.items()
-                    if name in attrs._member_names and isinstance(number, int)
+        # Note: the superclass ctor removes the variants, so get them now.
+        # Minor hack to get all the enum variants out.
+        # Use the `_member_names` property to get only the enum members
+        # See https://github.com/googleapis/proto-plus-python/issues/490
+        variants = [
+            (name, number)
+            for name, number in attrs.items()
+            if name in attrs._member_names and isinstance(number, int)
+        ]
+
+        def build_descriptor():
+            # Make the descriptor.
+            #
+            # This is deferred until the file descriptor is generated, and
+            # skipped altogether if it is found in the descriptor cache.
+            return descriptor_pb2.EnumDescriptorProto(
+                name=name,
+                # Note: proto3 requires that the first variant value be zero.
+                value=sorted(
+                    (
+                        descriptor_pb2.EnumValueDescriptorProto(
+                            name=variant, number=number
+                        )
+                        for variant, number in variants
+                    ),
+                    key=lambda v: v.number,
                 ),
-                key=lambda v: v.number,
-            ),
-            options=opts,
-        )
+                options=opts,
+            )
 
+        # Top-level descriptors are added to the file when it is generated;
+        # nested ones wait in a "holding area" for their parent, keyed by
+        # the parent's path.
         file_info = _file_info._FileInfo.maybe_add_descriptor(filename, package)
-        if len(local_path) == 1:
-            file_info.descriptor.enum_type.add().MergeFrom(enum_desc)
-        else:
-            file_info.nested_enum[local_path] = enum_desc
+        if len(local_path) > 1:
+            file_info.nested_enum.setdefault(local_path[:-1], []).append(
+                build_descriptor
+            )
 
         # Run the superclass constructor.
         cls = super().__new__(mcls, name, bases, attrs)
@@ -97,9 +115,14 @@ class ProtoEnumMeta(enum.EnumMeta):
         # We can't just add a "_meta" element to attrs because the Enum
         # machinery doesn't know what to do with a non-int value.
         # The pb is set later, in generate_file_pb
-        cls._meta = _EnumInfo(full_name=full_name, pb=None)
+        cls._meta = _EnumInfo(
+            full_name=full_name,
+            pb=None,
+            file_info=file_info,
+            build_descriptor=build_descriptor,
+        )
 
-        file_info.enums[full_name] = cls
+        file_info.add_enum(full_name, cls)
 
         # Register the enum with the marshal.
         marshal.register(cls, EnumRule(cls))
@@ -160,6 +183,20 @@ class Enum(enum.IntEnum, metaclass=ProtoEnumMeta):
 
 
 class _EnumInfo:
-    def __init__(self, *, full_name: str, pb):
+    def __init__(self, *, full_name: str, pb, file_info=None, build_descriptor=None):
         self.full_name = full_name
-        self.pb = pb
+        self.file_info = file_info
+        self.build_descriptor = build_descriptor
+        self._pb = pb
+
+    @property
+    def pb(self):
+        # If the file containing this enum is waiting to be built (see
+        # ``_FileInfo.lazy``), build it first.
+        if self._pb is None and self.file_info is not None:
+            self.file_info.build_if_pending()
+        return self._pb
+
+    @pb.setter
+    def pb(self, value):
+        self._pb = value
@@ -23,6 +23,22 @@ from proto.primitives import ProtoType
 class Field:
     """A representation of a type of field in protocol buffers."""
 
+    __slots__ = (
+        "name",
+        "package",
+        "parent_name",
+        "index",
+        "parent",
+        "number",
+        "proto_type",
+        "message",
+        "enum",
+        "json_name",
+        "optional",
+        "oneof",
+        "_descriptor",
+    )
+
     # Fields are NOT repeated nor maps.
     # The RepeatedField overrides this values.
     repeated = False
@@ -40,7 +56,10 @@ class Field:
     ):
         # This class is not intended to stand entirely alone;
         # data is augmented by the metaclass for Message.
-        self.mcls_data = None
+        self.name = None
+        self.package = None
+        self.parent_name = None
+        self.index = None
         self.parent = None
 
         # If the proto type sent is an object or a string, it is really
@@ -74,33 +93,7 @@ class Field:
         """Return the descriptor for the field."""
         if not self._descriptor:
             # Resolve the message type, if any, to a string.
-            type_name = None
-            if isinstance(self.message, str):
-                if not self.message.startswith(self.package):
-                    self.message = "{package}.{name}".format(
-                        package=self.package,
-                        name=self.message,
-                    )
-                type_name = self.message
-            elif self.message:
-                type_name = (
-                    self.message.DESCRIPTOR.full_name
-                    if hasattr(self.message, "DESCRIPTOR")
-                    else self.message._meta.full_name
-                )
-            elif isinstance(self.enum, str):
-                if not self.enum.startswith(self.package):
-                    self.enum = "{package}.{name}".format(
-                        package=self.package,
-                        name=self.enum,
-                    )
-                type_name = self.enum
-            elif self.enum:
-                type_name = (
-                    self.enum.DESCRIPTOR.full_name
-                    if hasattr(self.enum, "DESCRIPTOR")
-                    else self.enum._meta.full_name
-                )
+            type_name = self._qualify_type_name()
 
             # Set the descriptor.
             self._descriptor = descriptor_pb2.FieldDescriptorProto(
@@ -116,15 +109,63 @@ class Field:
         # Return the descriptor.
         return self._descriptor
 
-    @property
-    def name(self) -> str:
-        """Return the name of the field."""
-        return self.mcls_data["name"]
+    def _qualify_type_name(self):
+        """Return the full name of the field's message or enum type, if any.
+
+        A message or enum referenced by a string relative to the package is
+        qualified with the package, in place.
+        """
+        if isinstance(self.message, str):
+            if not self.message.startswith(self.package):
+                self.message = "{package}.{name}".format(
+                    package=self.package,
+                    name=self.message,
+                )
+            return self.message
+        elif self.message:
+            return (
+                self.message.DESCRIPTOR.full_name
+                if hasattr(self.message, "DESCRIPTOR")
+                else self.message._meta.full_name
+            )
+        elif isinstance(self.enum, str):
+            if not self.enum.startswith(self.package):
+                self.enum = "{package}.{name}".format(
+                    package=self.package,
+                    name=self.enum,
+                )
+            return self.enum
+        elif self.enum:
+            return (
+                self.enum.DESCRIPTOR.full_name
+                if hasattr(self.enum, "DESCRIPTOR")
+                else self.enum._meta.full_name
+            )
+        return None
 
     @property
-    def package(self) -> str:
-        """Return the package of the field."""
-        return self.mcls_data["package"]
+    def mcls_data(self):
+        """Return the data the metaclass for Message augmented the field with.
+
+        The data is stored in the ``name``, ``package``, ``parent_name`` and
+        ``index`` attributes; this mapping is kept for compatibility.
+        """
+        if self.name is None:
+            return None
+        return {
+            "name": self.name,
+            "parent_name": self.parent_name,
+            "index": self.index,
+            "package": self.package,
+        }
+
+    @mcls_data.setter
+    def mcls_data(self, value):
+        value = value or {}
+        self.name = value.get("name")
+        self.parent_name = value.get("parent_name")
+        self.index = value.get("index")
+        self.package = value.get("package")
 
     @property
     def pb_type(self):
@@ -147,12 +188,16 @@ class Field:
 class RepeatedField(Field):
     """A representation of a repeated field in protocol buffers."""
 
+    __slots__ = ()
+
     repeated = True
 
 
 class MapField(Field):
     """A representation of a map field in protocol buffers."""
 
+    __slots__ = ("map_key_type",)
+
     def __init__(self, key_type, value_type, *, number: int, message=None, enum=None):
         super().__init__(value_type, number=number, message=message, enum=enum)
         self.map_key_type = key_type
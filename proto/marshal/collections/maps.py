@@ -13,11 +13,23 @@
 # limitations under the License.
 
 import collections
+import functools
 
+from proto.marshal import compat
 from proto.utils import cached_property
 from google.protobuf.message import Message
 
 
+@functools.lru_cache(maxsize=None)
+def entry_value_type(entry_class: type) -> type:
+    """Return the type of the values of a map, given its entry class.
+
+    This is the protobuf message class for maps of messages, and the Python
+    type of the values (such as :class:`int`) otherwise.
+    """
+    return type(entry_class().value)
+
+
 class MapComposite(collections.abc.MutableMapping):
     """A view around a mutable sequence in protocol buffers.
 
@@ -25,24 +37,39 @@ class MapComposite(collections.abc.MutableMapping):
     modify the underlying field container directly.
     """
 
+    __slots__ = ("_pb", "_marshal", "_cached_pb_type")
+
     @cached_property
     def _pb_type(self):
         """Return the protocol buffer type for this sequence."""
-        # Huzzah, another hack. Still less bad than RepeatedComposite.
-        return type(self.pb.GetEntryClass()().value)
+        return entry_value_type(self.pb.GetEntryClass())
 
-    def __init__(self, sequence, *, marshal):
+    def __init__(self, sequence, *, marshal, proto_type=None):
         """Initialize a wrapper around a protobuf map.
 
         Args:
             sequence: A protocol buffers map.
             marshal (~.MarshalRegistry): An instantiated marshal, used to
                 convert values going to and from this map.
+            proto_type (Optional[type]): The type of the values, as returned
+                by :func:`entry_value_type`; looked up when first needed if
+                not given.
         """
         self._pb = sequence
         self._marshal = marshal
+        if proto_type is not None:
+            self._cached_pb_type = proto_type
 
     def __contains__(self, key):
+        if compat.native_map_contains:
+            try:
+                return key in self.pb
+            except (TypeError, ValueError):
+                # The key is not of (or is out of range for) the key type,
+                # but may still equal one of the keys (as 1.0 equals 1), so
+                # search the keys below.
+                pass
+
         # Protocol buffers is so permissive that querying for the existence
         # of a key will in of itself create it.
         #
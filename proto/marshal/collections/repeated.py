@@ -16,6 +16,10 @@ import collections
 import copy
 from typing import Iterable
 
+from google.protobuf.message import Message
+
+from proto import _numpy
+from proto.marshal.rules.message import MessageRule
 from proto.utils import cached_property
 
 
@@ -26,6 +30,8 @@ class Repeated(collections.abc.MutableSequence):
     modify the underlying field container directly.
     """
 
+    __slots__ = ("_pb", "_marshal", "_proto_type")
+
     def __init__(self, sequence, *, marshal, proto_type=None):
         """Initialize a wrapper around a protobuf repeated field.
 
@@ -33,6 +39,8 @@ class Repeated(collections.abc.MutableSequence):
             sequence: A protocol buffers repeated field.
             marshal (~.MarshalRegistry): An instantiated marshal, used to
                 convert values going to and from this map.
+            proto_type (Optional[Union[type, ~.ProtoType]]): The declared
+                type of the elements.
         """
         self._pb = sequence
         self._marshal = marshal
@@ -40,7 +48,9 @@ class Repeated(collections.abc.MutableSequence):
 
     def __copy__(self):
         """Copy this object and return the copy."""
-        return type(self)(self.pb[:], marshal=self._marshal)
+        return type(self)(
+            self.pb[:], marshal=self._marshal, proto_type=self._proto_type
+        )
 
     def __delitem__(self, key):
         """Delete the given item."""
@@ -68,6 +78,17 @@ class Repeated(collections.abc.MutableSequence):
     def __setitem__(self, key, value):
         self.pb[key] = value
 
+    def clear(self):
+        """Remove all items from the sequence."""
+        del self.pb[:]
+
+    def extend(self, values):
+        """Append all of ``values`` to the sequence, at once."""
+        if isinstance(values, Repeated):
+            # Copy the values first, in case they are in this very sequence.
+            values = values.pb[:]
+        self.pb.extend(values)
+
     def insert(self, index: int, value):
         """Insert ``value`` in the sequence before ``index``."""
         self.pb.insert(index, value)
@@ -76,6 +97,65 @@ class Repeated(collections.abc.MutableSequence):
         """Stable sort *IN PLACE*."""
         self.pb.sort(key=key, reverse=reverse)
 
+    def to_numpy(self, dtype=None):
+        """Return a copy of the sequence as a NumPy array.
+
+        The values are copied out of the underlying container in bulk,
+        rather than read one by one. NumPy must be installed.
+
+        Args:
+            dtype (Optional[numpy.dtype]): The type of the array. Defaults
+                to the type matching the field: for instance ``float32``
+                for ``FLOAT`` fields, and ``int32`` for enums.
+
+        Returns:
+            numpy.ndarray: A one-dimensional array of the values.
+
+        Raises:
+            TypeError: If no ``dtype`` is given, and the field is not numeric,
+                boolean, or an enum.
+        """
+        numpy = _numpy.load()
+        if dtype is None:
+            dtype = _numpy.dtype_for(self._proto_type)
+            if dtype is None:
+                raise TypeError(
+                    "No NumPy dtype for the values of {}; pass `dtype`.".format(
+                        type(self).__name__
+                    )
+                )
+        return numpy.array(self.pb[:], dtype=dtype)
+
+    def assign_array(self, array):
+        """Replace the contents of the sequence with the values of an array.
+
+        The values are converted from the array and written to the
+        underlying container in bulk. NumPy must be installed.
+
+        Args:
+            array (numpy.ndarray): A one-dimensional array (or anything
+                :func:`numpy.asarray` accepts) of the new values.
+
+        Raises:
+            ValueError: If the array is not one-dimensional.
+        """
+        numpy = _numpy.load()
+        array = numpy.asarray(array)
+        if array.ndim != 1:
+            raise ValueError(
+                "Expected a one-dimensional array, got {} dimensions.".format(
+                    array.ndim
+                )
+            )
+        values = array.tolist()
+        previous = self.pb[:]
+        try:
+            self.pb[:] = values
+        except (TypeError, ValueError):
+            # The container may have been partly written; restore it.
+            self.pb[:] = previous
+            raise
+
     @property
     def pb(self):
         return self._pb
@@ -88,17 +168,20 @@ class RepeatedComposite(Repeated):
     modify the underlying field container directly.
     """
 
+    __slots__ = ("_cached_pb_type",)
+
     @cached_property
     def _pb_type(self):
         """Return the protocol buffer type for this sequence."""
-        # Provide the marshal-given proto_type, if any.
-        # Used for RepeatedComposite of Enum.
+        # Provide the marshal-given proto_type, if any. The marshal passes
+        # the type declared for the field, for sequences of messages as well
+        # as of enums.
         if self._proto_type is not None:
             return self._proto_type
 
-        # There is no public-interface mechanism to determine the type
-        # of what should go in the list (and the C implementation seems to
-        # have no exposed mechanism at all).
+        # Otherwise, there is no public-interface mechanism to determine the
+        # type of what should go in the list (and the C implementation seems
+        # to have no exposed mechanism at all).
         #
         # If the list has members, use the existing list members to
         # determine the type.
@@ -113,7 +196,8 @@ class RepeatedComposite(Repeated):
 
         # Fallback logic in case attributes are not available
         # In order to get the type, we create a throw-away copy and add a
-        # blank member to it.
+        # blank member to it. Adding to the list itself would make its
+        # parent message present, which reads must not do.
         canary = copy.deepcopy(self.pb).add()
         return type(canary)
 
@@ -149,19 +233,20 @@ class RepeatedComposite(Repeated):
                 raise TypeError("can only assign an iterable")
 
             if step == 1:  # Is not an extended slice.
-                # Assign all the new values to the sliced part, replacing the
-                # old values, if any, and unconditionally inserting those
-                # values whose indices already exceed the slice length.
-                for index, item in enumerate(value):
-                    if start + index < stop:
-                        self.pop(start + index)
-                    self.insert(start + index, item)
-
-                # If there are less values than the length of the slice, remove
-                # the remaining elements so that the slice adapts to the
-                # newly provided values.
-                for _ in range(stop - start - len(value)):
-                    self.pop(start + len(value))
+                # Replace the sliced part with the new values: delete it in
+                # one go, and then add the new values in its place. All
+                # values are converted first, so that nothing is written if
+                # any of them is invalid.
+                pb_values = self._to_proto_all(value)
+                del self.pb[start:stop]
+                if start >= len(self.pb):
+                    self.pb.extend(pb_values)
+                else:
+                    # Inserting each value moves the items after it within
+                    # the container, which is much cheaper than taking them
+                    # out and adding them back (which copies each of them).
+                    for index, pb_value in enumerate(pb_values, start):
+                        self.pb.insert(index, pb_value)
 
             else:  # Is an extended slice.
                 indices = range(start, stop, step)
@@ -183,7 +268,37 @@ class RepeatedComposite(Repeated):
                 f"list indices must be integers or slices, not {type(key).__name__}"
             )
 
+    def extend(self, values):
+        """Append all of ``values`` to the sequence, at once."""
+        self.pb.extend(self._to_proto_all(values))
+
     def insert(self, index: int, value):
         """Insert ``value`` in the sequence before ``index``."""
         pb_value = self._marshal.to_proto(self._pb_type, value)
         self.pb.insert(index, pb_value)
+
+    def _to_proto_all(self, values):
+        """Convert values to protobuf, to be written together.
+
+        Messages are checked to be of the right type as they are converted,
+        so that an invalid value is reported before any are written.
+        """
+        pb_type = self._pb_type
+        to_proto = self._marshal.to_proto
+        if not (isinstance(pb_type, type) and issubclass(pb_type, Message)):
+            return [to_proto(pb_type, value) for value in values]
+
+        # Protobuf messages of the right type, and the proto-plus messages
+        # wrapping them, are by far the most common values, and are
+        # converted without going through the marshal.
+        rule = self._marshal.get_rule(proto_type=pb_type)
+        wrapper = rule._wrapper if isinstance(rule, MessageRule) else None
+        pb_values = []
+        for value in values:
+            value_type = type(value)
+            if value_type is wrapper:
+                value = value._pb
+            elif value_type is not pb_type:
+                value = to_proto(pb_type, value, strict=True)
+            pb_values.append(value)
+        return pb_values
@@ -18,6 +18,7 @@
 # If the C extensions were not installed, then their container types will
 # not be included.
 
+from google.protobuf.internal import api_implementation
 from google.protobuf.internal import containers
 
 # Import all message types to ensure that pyext types are recognized
@@ -56,9 +57,22 @@ for message in [_message_upb, _message_pyext]:
             # The `MessageMapContainer` attribute is not available in Protobuf 5.x+
             pass
 
+# Whether `key in map` looks the key up without adding it to the map, by
+# protobuf implementation. Maps are always keyed by scalars, which the
+# upb and pure Python implementations look up directly; other
+# implementations are assumed not to, and their keys are searched instead.
+_MAP_CONTAINS_BY_IMPLEMENTATION = {
+    "upb": True,
+    "python": True,
+}
+native_map_contains = _MAP_CONTAINS_BY_IMPLEMENTATION.get(
+    api_implementation.Type(), False
+)
+
 __all__ = (
     "repeated_composite_types",
     "repeated_scalar_types",
     "map_composite_types",
     "map_composite_type_names",
+    "native_map_contains",
 )
@@ -14,6 +14,8 @@
 
 import abc
 import enum
+import functools
+import operator
 
 from google.protobuf import message
 from google.protobuf import duration_pb2
@@ -26,6 +28,7 @@ from proto.marshal import compat
 from proto.marshal.collections import MapComposite
 from proto.marshal.collections import Repeated
 from proto.marshal.collections import RepeatedComposite
+from proto.marshal.collections import maps
 
 from proto.marshal.rules import bytes as pb_bytes
 from proto.marshal.rules import stringy_numbers
@@ -33,6 +36,8 @@ from proto.marshal.rules import dates
 from proto.marshal.rules import struct
 from proto.marshal.rules import wrappers
 from proto.marshal.rules import field_mask
+from proto.marshal.rules.enums import EnumRule
+from proto.marshal.rules.message import MessageRule
 from proto.primitives import ProtoType
 
 
@@ -65,9 +70,17 @@ class BaseMarshal:
     usually be used instead of this class directly.
     """
 
+    # A counter shared by every marshal, incremented whenever any rule is
+    # registered or the rules are reset. Anything derived from the resolved
+    # rules (such as the getters from :meth:`compile_getter`) is stale once
+    # this changes.
+    _generation = 0
+
     def __init__(self):
         self._rules = {}
         self._noop = NoopRule()
+        self._resolved_rules = {}
+        self._resolved_generation = None
         self.reset()
 
     def register(self, proto_type: type, rule: Rule = None):
@@ -102,6 +115,7 @@ class BaseMarshal:
 
             # Register the rule.
             self._rules[proto_type] = rule
+            BaseMarshal._generation += 1
             return
 
         # Create an inner function that will register an instance of the
@@ -116,6 +130,7 @@ class BaseMarshal:
 
             # Register the rule class.
             self._rules[proto_type] = rule_class()
+            BaseMarshal._generation += 1
             return rule_class
 
         return register_rule_class
@@ -123,6 +138,7 @@ class BaseMarshal:
     def reset(self):
         """Reset the registry to its initial state."""
         self._rules.clear()
+        BaseMarshal._generation += 1
 
         # Register date and time wrappers.
         self.register(timestamp_pb2.Timestamp, dates.TimestampRule())
@@ -160,6 +176,19 @@ class BaseMarshal:
             self.register(rule_class._proto_type, rule_class())
 
     def get_rule(self, proto_type):
+        # Resolving a rule can mean scanning every marshal (see below), so
+        # remember what each proto type resolved to, including types
+        # with no rule at all. Registering a rule anywhere, or resetting
+        # any marshal, invalidates everything that was remembered.
+        if self._resolved_generation != BaseMarshal._generation:
+            self._resolved_rules.clear()
+            self._resolved_generation = BaseMarshal._generation
+        rule = self._resolved_rules.get(proto_type)
+        if rule is None:
+            rule = self._resolved_rules[proto_type] = self._resolve_rule(proto_type)
+        return rule
+
+    def _resolve_rule(self, proto_type):
         # Rules are needed to convert values between proto-plus and pb.
         # Retrieve the rule for the specified proto type.
         # The NoopRule will be used when a rule is not found.
@@ -180,12 +209,18 @@ class BaseMarshal:
         # Return a view around it that implements MutableSequence.
         value_type = type(value)  # Minor performance boost over isinstance
         if value_type in compat.repeated_composite_types:
-            return RepeatedComposite(value, marshal=self)
+            # Pass the declared type of the elements, so that the view need
+            # not work it out from the container.
+            return RepeatedComposite(
+                value,
+                marshal=self,
+                proto_type=proto_type if isinstance(proto_type, type) else None,
+            )
         if value_type in compat.repeated_scalar_types:
             if isinstance(proto_type, type):
                 return RepeatedComposite(value, marshal=self, proto_type=proto_type)
             else:
-                return Repeated(value, marshal=self)
+                return Repeated(value, marshal=self, proto_type=proto_type)
 
         # Same thing for maps of messages.
         # See https://github.com/protocolbuffers/protobuf/issues/16596
@@ -199,6 +234,205 @@ class BaseMarshal:
             return MapComposite(value, marshal=self)
         return self.get_rule(proto_type=proto_type).to_python(value, absent=absent)
 
+    def compile_getter(self, proto_type, *, name: str, container: type):
+        """Return a function reading one field and converting it to Python.
+
+        This makes the same decisions as :meth:`to_python`, but makes them
+        once, against an empty instance of the containing message, rather
+        than on every read.
+
+        Args:
+            proto_type: The composite or primitive type of the field, as
+                given to :meth:`to_python`.
+            name (str): The name of the field.
+            container (type): The protobuf message class declaring the field.
+
+        Returns:
+            Callable[[~.message.Message], Any]: A function that accepts an
+                instance of ``container`` and returns the Python value of
+                the field.
+        """
+        sample = container()
+        value_type = type(getattr(sample, name))
+        read = operator.attrgetter(name)
+
+        # Repeated fields, maps and messages are wrapped in views.
+        wrap = self._view_wrapper(proto_type, value_type)
+        if wrap is not None:
+            return lambda pb: wrap(read(pb))
+
+        # Everything else goes through the rule for the type.
+        rule = self.get_rule(proto_type=proto_type)
+        if type(rule).to_python in _IDENTITY_TO_PYTHON:
+            return read
+        if isinstance(rule, EnumRule):
+            coerce = rule.to_python
+            return lambda pb: coerce(read(pb))
+
+        # The rule may care whether the field is absent, which is
+        # determined the same way as `Message.__contains__`.
+        to_python = rule.to_python
+        try:
+            sample.HasField(name)
+        except ValueError:
+            # The field does not track presence; it is absent when falsy.
+            def getter(pb):
+                value = read(pb)
+                return to_python(value, absent=not value)
+
+            return getter
+        return lambda pb: to_python(read(pb), absent=not pb.HasField(name))
+
+    def compile_view(self, proto_type, *, name: str, container: type):
+        """Return a function wrapping a field's protobuf value in a view.
+
+        Repeated fields and maps are read through views such as
+        :class:`~.RepeatedComposite`, and messages through their proto-plus
+        wrapper; either way, the view reads and writes the protobuf value
+        it wraps. Other fields are converted to a Python value instead,
+        which does not refer back to the message.
+
+        Args:
+            proto_type: The composite or primitive type of the field, as
+                given to :meth:`to_python`.
+            name (str): The name of the field.
+            container (type): The protobuf message class declaring the field.
+
+        Returns:
+            Optional[Callable[[Any], Any]]: A function that accepts the
+                protobuf value of the field and returns the view, or None
+                if the field is not read through a view.
+        """
+        return self._view_wrapper(proto_type, type(getattr(container(), name)))
+
+    def _view_wrapper(self, proto_type, value_type):
+        if value_type in compat.repeated_composite_types:
+            return functools.partial(
+                RepeatedComposite,
+                marshal=self,
+                proto_type=proto_type if isinstance(proto_type, type) else None,
+            )
+        if value_type in compat.repeated_scalar_types:
+            if isinstance(proto_type, type):
+                return functools.partial(
+                    RepeatedComposite, marshal=self, proto_type=proto_type
+                )
+            return functools.partial(Repeated, marshal=self, proto_type=proto_type)
+        if (
+            value_type in compat.map_composite_types
+            or value_type.__name__ in compat.map_composite_type_names
+        ):
+            # The declared type of a map field is its entry message.
+            return functools.partial(
+                MapComposite,
+                marshal=self,
+                proto_type=(
+                    maps.entry_value_type(proto_type)
+                    if isinstance(proto_type, type)
+                    else None
+                ),
+            )
+        rule = self.get_rule(proto_type=proto_type)
+        if isinstance(rule, MessageRule) and issubclass(value_type, proto_type):
+            return rule._wrapper.wrap
+        return None
+
+    def compile_setter(self, proto_type, *, name: str, container: type):
+        """Return a function converting a value to protobuf and writing it.
+
+        The value is written straight to the field of the protobuf
+        instance: scalars are assigned, singular messages are copied into
+        place, and repeated fields and maps are cleared and then filled
+        (and keep their old contents if the value cannot be written).
+        Writing ``None`` clears the field.
+
+        Args:
+            proto_type: The composite or primitive type of the field, as
+                given to :meth:`to_proto`.
+            name (str): The name of the field.
+            container (type): The protobuf message class declaring the field.
+
+        Returns:
+            Callable[[~.message.Message, Any], None]: A function that accepts
+                an instance of ``container`` and the value to write.
+        """
+        field_descriptor = container.DESCRIPTOR.fields_by_name[name]
+        message_type = field_descriptor.message_type
+        value_type = type(getattr(container(), name))
+        read = operator.attrgetter(name)
+
+        def refill(pb, fill, pb_value):
+            old = read(pb)
+            pb.ClearField(name)
+            if pb_value is None:
+                return
+            try:
+                fill(read(pb), pb_value)
+            except Exception:
+                # Clearing detached the old container with its contents, so
+                # they can be put back; the new value is only checked as it
+                # is written.
+                pb.ClearField(name)
+                fill(read(pb), old)
+                raise
+
+        # Repeated fields are cleared, and then extended with the new values.
+        # Clearing (rather than emptying) the field detaches the existing
+        # container, so values read from it may be written back.
+        if (
+            value_type in compat.repeated_composite_types
+            or value_type in compat.repeated_scalar_types
+        ):
+
+            def setter(pb, value):
+                # Augmented assignment (such as `+=`) updates the field in
+                # place, and then assigns the field's own view back to it.
+                if isinstance(value, Repeated) and value.pb is read(pb):
+                    return
+                refill(pb, _extend, self.to_proto(proto_type, value))
+
+            return setter
+
+        # Maps are written the same way. Maps of messages do not support
+        # item assignment, so each value is copied into place instead.
+        if message_type is not None and message_type.GetOptions().map_entry:
+            if message_type.fields_by_name["value"].message_type is None:
+
+                def setter(pb, value):
+                    refill(pb, _update, self.to_proto(proto_type, value))
+
+                return setter
+
+            def setter(pb, value):
+                refill(pb, _copy_entries, self.to_proto(proto_type, value))
+
+            return setter
+
+        # Singular messages are copied into the existing submessage.
+        if message_type is not None:
+
+            def setter(pb, value):
+                pb_value = self.to_proto(proto_type, value)
+                if pb_value is None:
+                    pb.ClearField(name)
+                else:
+                    read(pb).CopyFrom(pb_value)
+
+            return setter
+
+        # Scalars, enums and bytes are assigned directly, after going
+        # through the rule for their type.
+        coerce = self.get_rule(proto_type=proto_type).to_proto
+
+        def setter(pb, value):
+            pb_value = coerce(value)
+            if pb_value is None:
+                pb.ClearField(name)
+            else:
+                setattr(pb, name, pb_value)
+
+        return setter
+
     def to_proto(self, proto_type, value, *, strict: bool = False):
         # The protos in google/protobuf/struct.proto are exceptional cases,
         # because they can and should represent themselves as lists and dicts.
@@ -294,4 +528,28 @@ class NoopRule:
         return value
 
 
+# Rules whose `to_python` hands back the protobuf value unchanged.
+_IDENTITY_TO_PYTHON = (
+    NoopRule.to_python,
+    pb_bytes.BytesRule.to_python,
+    stringy_numbers.StringyNumberRule.to_python,
+)
+
+
+# How the setters compiled by `compile_setter` fill an empty repeated field
+# or map with values.
+def _extend(field, values):
+    field.extend(values)
+
+
+def _update(field, entries):
+    field.update(entries)
+
+
+def _copy_entries(field, entries):
+    # Maps of messages do not support item assignment.
+    for key, item in entries.items():
+        field[key].CopyFrom(item)
+
+
 __all__ = ("Marshal",)
@@ -95,7 +95,9 @@ class ListValueRule:
         return (
             None
             if absent
-            else repeated.RepeatedComposite(value.values, marshal=self._marshal)
+            else repeated.RepeatedComposite(
+                value.values, marshal=self._marshal, proto_type=struct_pb2.Value
+            )
         )
 
     def to_proto(self, value) -> struct_pb2.ListValue:
@@ -121,7 +123,11 @@ class StructRule:
     def to_python(self, value, *, absent: bool = None):
         """Coerce the given value to a Python mapping."""
         return (
-            None if absent else maps.MapComposite(value.fields, marshal=self._marshal)
+            None
+            if absent
+            else maps.MapComposite(
+                value.fields, marshal=self._marshal, proto_type=struct_pb2.Value
+            )
         )
 
     def to_proto(self, value) -> struct_pb2.Struct:
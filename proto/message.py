@@ -14,18 +14,39 @@
 
 import collections
 import collections.abc
+import concurrent.futures
 import copy
+import functools
+import io
+import operator
 import re
-from typing import Any, Dict, List, Optional, Type
+import threading
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+)
 import warnings
 
 import google.protobuf
 from google.protobuf import descriptor_pb2
 from google.protobuf import message
 from google.protobuf.json_format import MessageToDict, MessageToJson, Parse
+from google.protobuf.json_format import ParseError
 
+from proto import _delimited
+from proto import _dict_plan
 from proto import _file_info
+from proto import _json_decoder
+from proto import _json_encoder
 from proto import _package_info
+from proto import _profiler
 from proto.fields import Field
 from proto.fields import MapField
 from proto.fields import RepeatedField
@@ -38,10 +59,36 @@ PROTOBUF_VERSION = google.protobuf.__version__
 
 _upb = has_upb()  # Important to cache result here.
 
+_SNAKE_CASE_SEPARATOR = re.compile(r"_\w")
+
+# Guards setting the protobuf instance of lazily deserialized messages.
+_LAZY_PARSE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _map_entry_name(key: str) -> str:
+    """Return the name of the entry message for a map field.
+
+    Args:
+        key (str): The name of the map field, e.g. ``foo_bar``.
+
+    Returns:
+        str: The name of the entry message, e.g. ``FooBarEntry``.
+    """
+    return "{pascal_key}Entry".format(
+        pascal_key=_SNAKE_CASE_SEPARATOR.sub(
+            lambda m: m.group()[1:].upper(),
+            key,
+        ).replace(key[0], key[0].upper(), 1),
+    )
+
 
 class MessageMeta(type):
     """A metaclass for building and registering Message subclasses."""
 
+    @_profiler.profiled(
+        "class construction", lambda mcls, name, bases, attrs: attrs.get("__module__")
+    )
     def __new__(mcls, name, bases, attrs):
         # Do not do any special behavior for Message itself.
         if not bases:
@@ -73,13 +120,7 @@ class MessageMeta(type):
                 continue
 
             # Determine the name of the entry message.
-            msg_name = "{pascal_key}Entry".format(
-                pascal_key=re.sub(
-                    r"_\w",
-                    lambda m: m.group()[1:].upper(),
-                    key,
-                ).replace(key[0], key[0].upper(), 1),
-            )
+            msg_name = _map_entry_name(key)
 
             # Create the "entry" message (with the key and value fields).
             #
@@ -97,6 +138,9 @@ class MessageMeta(type):
                         name=msg_name,
                     ),
                     "_pb_options": {"map_entry": True},
+                    # Entry classes are only used internally, so their
+                    # instances need no `__dict__`.
+                    "__slots__": (),
                 }
             )
             entry_attrs["key"] = Field(field.map_key_type, number=1)
@@ -136,28 +180,44 @@ class MessageMeta(type):
             # Add data that the field requires that we do not take in the
             # constructor because we can derive it from the metaclass.
             # (The goal is to make the declaration syntax as nice as possible.)
-            field.mcls_data = {
-                "name": key,
-                "parent_name": full_name,
-                "index": index,
-                "package": package,
-            }
+            field.name = key
+            field.parent_name = full_name
+            field.index = index
+            field.package = package
+
+            # Qualify any message or enum referenced by a string, so that it
+            # can be matched with the messages and enums in the file.
+            field._qualify_type_name()
 
             # Add the field to the list of fields.
             fields.append(field)
+
+            # Give instances direct access to the field through a data
+            # descriptor, unless that would shadow an attribute every
+            # message has (e.g. a field named `pb`); those fields are
+            # still reachable through `__getattr__`.
+            if not hasattr(Message, key):
+                new_attrs[key] = _FieldProperty(field)
+
             # If this field is part of a "oneof", ensure the oneof itself
             # is represented.
             if field.oneof:
-                # Keep a running tally of the index of each oneof, and assign
-                # that index to the field's descriptor.
+                # Keep a running tally of the index of each oneof; the index
+                # is assigned to the field's descriptor when it is built.
                 oneofs.setdefault(field.oneof, len(oneofs))
-                field.descriptor.oneof_index = oneofs[field.oneof]
 
             # If this field references a message, it may be from another
             # proto file; ensure we know about the import (to faithfully
             # construct our file descriptor proto).
+            #
+            # If the other file has not been built yet (see
+            # ``_FileInfo.lazy``), record the import without building it.
             if field.message and not isinstance(field.message, str):
                 field_msg = field.message
+                pending_file = _file_info._FileInfo.pending_file_name(field_msg)
+                if pending_file:
+                    proto_imports.add(pending_file)
+                    field_msg = None
                 if hasattr(field_msg, "pb") and callable(field_msg.pb):
                     field_msg = field_msg.pb()
                 # Sanity check: The field's message may not yet be defined if
@@ -171,14 +231,18 @@ class MessageMeta(type):
 
             # Same thing, but for enums.
             elif field.enum and not isinstance(field.enum, str):
-                field_enum = (
-                    field.enum._meta.pb
-                    if hasattr(field.enum, "_meta")
-                    else field.enum.DESCRIPTOR
-                )
+                pending_file = _file_info._FileInfo.pending_file_name(field.enum)
+                if pending_file:
+                    proto_imports.add(pending_file)
+                else:
+                    field_enum = (
+                        field.enum._meta.pb
+                        if hasattr(field.enum, "_meta")
+                        else field.enum.DESCRIPTOR
+                    )
 
-                if field_enum:
-                    proto_imports.add(field_enum.file.name)
+                    if field_enum:
+                        proto_imports.add(field_enum.file.name)
 
             # Increment the field index counter.
             index += 1
@@ -189,7 +253,7 @@ class MessageMeta(type):
         for field in fields:
             if field.optional:
                 field.oneof = "_{}".format(field.name)
-                field.descriptor.oneof_index = oneofs[field.oneof] = len(oneofs)
+                oneofs[field.oneof] = len(oneofs)
                 opt_attrs[field.name] = field.name
 
         # Generating a metaclass dynamically provides class attributes that
@@ -224,33 +288,40 @@ class MessageMeta(type):
         # Retrieve any message options.
         opts = descriptor_pb2.MessageOptions(**new_attrs.pop("_pb_options", {}))
 
-        # Create the underlying proto descriptor.
-        desc = descriptor_pb2.DescriptorProto(
-            name=name,
-            field=[i.descriptor for i in fields],
-            oneof_decl=[
-                descriptor_pb2.OneofDescriptorProto(name=i) for i in oneofs.keys()
-            ],
-            options=opts,
-        )
+        # Determine whether instances keep the views they hand out.
+        cache_views = new_attrs.pop("_cache_views", False)
 
         # If any descriptors were nested under this one, they need to be
-        # attached as nested types here.
-        child_paths = [p for p in file_info.nested.keys() if local_path == p[:-1]]
-        for child_path in child_paths:
-            desc.nested_type.add().MergeFrom(file_info.nested.pop(child_path))
+        # attached as nested types when it is built.
+        nested_types = file_info.nested.pop(local_path, [])
 
         # Same thing, but for enums
-        child_paths = [p for p in file_info.nested_enum.keys() if local_path == p[:-1]]
-        for child_path in child_paths:
-            desc.enum_type.add().MergeFrom(file_info.nested_enum.pop(child_path))
-
-        # Add the descriptor to the file if it is a top-level descriptor,
-        # or to a "holding area" for nested messages otherwise.
-        if len(local_path) == 1:
-            file_info.descriptor.message_type.add().MergeFrom(desc)
-        else:
-            file_info.nested[local_path] = desc
+        nested_enums = file_info.nested_enum.pop(local_path, [])
+
+        def build_descriptor():
+            # Create the underlying proto descriptor.
+            #
+            # This is deferred until the file descriptor is generated, and
+            # skipped altogether if it is found in the descriptor cache.
+            for field in fields:
+                if field.oneof:
+                    field.descriptor.oneof_index = oneofs[field.oneof]
+            return descriptor_pb2.DescriptorProto(
+                name=name,
+                field=[i.descriptor for i in fields],
+                nested_type=[build() for build in nested_types],
+                enum_type=[build() for build in nested_enums],
+                oneof_decl=[
+                    descriptor_pb2.OneofDescriptorProto(name=i) for i in oneofs.keys()
+                ],
+                options=opts,
+            )
+
+        # Top-level descriptors are added to the file when it is generated;
+        # nested ones wait in a "holding area" for their parent, keyed by
+        # the parent's path.
+        if len(local_path) > 1:
+            file_info.nested.setdefault(local_path[:-1], []).append(build_descriptor)
 
         # Create the MessageInfo instance to be attached to this message.
         new_attrs["_meta"] = _MessageInfo(
@@ -259,6 +330,9 @@ class MessageMeta(type):
             marshal=marshal,
             options=opts,
             package=package,
+            file_info=file_info,
+            build_descriptor=build_descriptor,
+            cache_views=cache_views,
         )
 
         # Run the superclass constructor.
@@ -272,7 +346,7 @@ class MessageMeta(type):
         # Add this message to the _FileInfo instance; this allows us to
         # associate the descriptor with the message once the descriptor
         # is generated.
-        file_info.messages[full_name] = cls
+        file_info.add_message(full_name, cls)
 
         # Generate the descriptor for the file if it is ready.
         if file_info.ready(new_class=cls):
@@ -299,6 +373,10 @@ class MessageMeta(type):
                     "wrap",
                     "serialize",
                     "deserialize",
+                    "serialize_many",
+                    "deserialize_many",
+                    "iter_delimited",
+                    "write_delimited",
                     "to_json",
                     "from_json",
                     "to_dict",
@@ -359,20 +437,321 @@ class MessageMeta(type):
         Returns:
             bytes: The serialized representation of the protocol buffer.
         """
+        # A lazily deserialized message that was never parsed is unmodified,
+        # so its original payload is still its serialized form.
+        if isinstance(instance, cls):
+            payload = _unparsed_payload(instance)
+            if payload is not None:
+                return payload
         return cls.pb(instance, coerce=True).SerializeToString()
 
-    def deserialize(cls, payload: bytes) -> "Message":
+    def deserialize(cls, payload: bytes, *, lazy: bool = False) -> "Message":
         """Given a serialized proto, deserialize it into a Message instance.
 
         Args:
             payload (bytes): The serialized proto.
+            lazy (bool): If True, keep the payload and only parse it the
+                first time the message is used. Until then, serializing the
+                message returns the payload unchanged. Note that an invalid
+                payload is then reported on first use, rather than here.
+                Default is False.
 
         Returns:
             ~.Message: An instance of the message class against which this
             method was called.
         """
+        if lazy:
+            instance = cls.__new__(cls)
+            super(cls, instance).__setattr__("_payload", bytes(payload))
+            return instance
         return cls.wrap(cls.pb().FromString(payload))
 
+    def serialize_many(
+        cls,
+        instances: Iterable[Any],
+        *,
+        delimited: bool = False,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> List[bytes]:
+        """Return the serialized protos for several instances.
+
+        This is equivalent to calling :meth:`serialize` on each instance,
+        but with less overhead per instance.
+
+        Args:
+            instances (Iterable): Instances of this message type, or
+                things compatible with it (accepted by the type's
+                constructor).
+            delimited (bool): If True, precede each serialized proto with
+                its size as a varint, so that writing them out one after
+                the other produces a length-delimited stream.
+                Default is False.
+            executor (Optional(concurrent.futures.Executor)): If set,
+                serialize the instances using this executor. A process
+                pool executor requires this message type to be importable
+                by the worker processes.
+
+        Returns:
+            List[bytes]: The serialized representations of the protocol
+            buffers, in the same order as ``instances``.
+        """
+        if executor is not None:
+            payloads = executor.map(cls.serialize, instances)
+        else:
+            payloads = []
+            for instance in instances:
+                if not isinstance(instance, cls):
+                    instance = cls(instance)
+                payload = _unparsed_payload(instance)
+                if payload is None:
+                    payload = instance._pb.SerializeToString()
+                payloads.append(payload)
+
+        if delimited:
+            encode_varint = _delimited.encode_varint
+            return [encode_varint(len(p)) + p for p in payloads]
+        return list(payloads)
+
+    def deserialize_many(
+        cls,
+        payloads: Iterable[bytes],
+        *,
+        delimited: bool = False,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> List["Message"]:
+        """Deserialize several serialized protos into Message instances.
+
+        This is equivalent to calling :meth:`deserialize` on each payload,
+        but with less overhead per payload.
+
+        Args:
+            payloads (Iterable[bytes]): The serialized protos. If
+                ``delimited`` is set, this is instead a single bytes-like
+                object holding a length-delimited stream.
+            delimited (bool): If True, ``payloads`` is a length-delimited
+                stream, in which each serialized proto is preceded by its
+                size as a varint. Default is False.
+            executor (Optional(concurrent.futures.Executor)): If set,
+                deserialize the payloads using this executor. A process
+                pool executor requires this message type to be importable
+                by the worker processes.
+
+        Returns:
+            List[~.Message]: Instances of the message class against which
+            this method was called, in the same order as the payloads.
+        """
+        if delimited:
+            payloads = _delimited.split(payloads)
+        if executor is not None:
+            if delimited:
+                # Views into the stream cannot be sent to other processes.
+                payloads = (p.tobytes() for p in payloads)
+            return list(executor.map(cls.deserialize, payloads))
+
+        from_string = cls.pb().FromString
+        wrap = cls.wrap
+        return [wrap(from_string(p)) for p in payloads]
+
+    def iter_delimited(cls, source) -> Iterator["Message"]:
+        """Yield the messages in a length-delimited stream.
+
+        In a length-delimited stream, each serialized proto is preceded by
+        its size as a varint. Messages are parsed one at a time, as they
+        are consumed, so arbitrarily large streams can be read in constant
+        memory.
+
+        Args:
+            source: Either a bytes-like object holding the whole stream,
+                such as :class:`bytes`, :class:`memoryview` or
+                :class:`mmap.mmap`, or a binary file object to read the
+                stream from. Bytes-like objects are read in place, without
+                copying each serialized proto out of them first.
+
+        Yields:
+            ~.Message: Instances of the message class against which this
+            method was called.
+        """
+        from_string = cls.pb().FromString
+        wrap = cls.wrap
+        for payload in _delimited.iterate(source):
+            yield wrap(from_string(payload))
+
+    def write_delimited(cls, stream: BinaryIO, instances: Iterable[Any]) -> int:
+        """Write instances to a binary file as a length-delimited stream.
+
+        Each serialized proto is preceded by its size as a varint, which
+        is the format read by :meth:`iter_delimited`. Instances are
+        serialized and written one at a time.
+
+        Args:
+            stream (BinaryIO): The file object to write to.
+            instances (Iterable): Instances of this message type, or
+                things compatible with it (accepted by the type's
+                constructor).
+
+        Returns:
+            int: The number of messages written.
+        """
+        encode_varint = _delimited.encode_varint
+        count = 0
+        for instance in instances:
+            payload = cls.serialize(instance)
+            stream.write(encode_varint(len(payload)))
+            stream.write(payload)
+            count += 1
+        return count
+
+    def to_ndjson(
+        cls,
+        instances: Iterable[Any],
+        stream,
+        *,
+        use_integers_for_enums: bool = True,
+        preserving_proto_field_name: bool = False,
+        sort_keys: bool = False,
+        always_print_fields_with_no_presence: bool = True,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> int:
+        """Write instances to a file as newline-delimited JSON.
+
+        Each instance is written as its compact JSON representation (as
+        returned by :meth:`to_json` with ``indent=None``), followed by a
+        newline. The options are checked and the JSON writer set up once,
+        rather than for each instance.
+
+        Args:
+            instances (Iterable): Instances of this message type, or
+                things compatible with it (accepted by the type's
+                constructor).
+            stream: The text or binary file object to write to.
+            use_integers_for_enums (Optional(bool)): Whether enum values
+                are written as integers (True) or strings (False).
+                Default is True.
+            preserving_proto_field_name (Optional(bool)): Whether field
+                names are written in proto case (snake_case) or
+                lowerCamelCase. Default is False.
+            sort_keys (Optional(bool)): If True, sort the fields of each
+                object by name. Default is False.
+            always_print_fields_with_no_presence (Optional(bool)): If True,
+                fields without presence are always written. Default is True.
+            executor (Optional(concurrent.futures.Executor)): If set,
+                convert the instances to JSON using this executor; they
+                are still written in order. A process pool executor
+                requires this message type to be importable by the worker
+                processes.
+
+        Returns:
+            int: The number of messages written.
+        """
+        instances = (
+            instance if isinstance(instance, cls) else cls(instance)
+            for instance in instances
+        )
+        if executor is not None:
+            lines = executor.map(
+                functools.partial(
+                    cls.to_json,
+                    use_integers_for_enums=use_integers_for_enums,
+                    preserving_proto_field_name=preserving_proto_field_name,
+                    sort_keys=sort_keys,
+                    indent=None,
+                    always_print_fields_with_no_presence=always_print_fields_with_no_presence,
+                ),
+                instances,
+            )
+        else:
+            serialize = _json_serializer(
+                use_integers_for_enums,
+                preserving_proto_field_name,
+                sort_keys,
+                None,
+                None,
+                bool(always_print_fields_with_no_presence),
+            )
+            lines = (serialize(instance._pb) for instance in instances)
+
+        # The JSON is ASCII, as protobuf escapes all other characters.
+        binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase))
+        write = stream.write
+        count = 0
+        for line in lines:
+            line += "\n"
+            write(line.encode("ascii") if binary else line)
+            count += 1
+        return count
+
+    def iter_ndjson(
+        cls,
+        stream,
+        *,
+        ignore_unknown_fields: bool = False,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> Iterator["Message"]:
+        """Yield the messages in a file of newline-delimited JSON.
+
+        Each line holds the JSON representation of one message; blank lines
+        are skipped. Lines are parsed one at a time, as the messages are
+        consumed.
+
+        Args:
+            stream: The text or binary file object to read from. Binary
+                files are decoded as UTF-8.
+            ignore_unknown_fields (Optional(bool)): If True, do not raise
+                errors for unknown fields.
+            executor (Optional(concurrent.futures.Executor)): If set, parse
+                the lines using this executor; messages are still yielded
+                in order. All of the lines are read before the first
+                message is yielded. A process pool executor requires this
+                message type to be importable by the worker processes.
+
+        Yields:
+            ~.Message: Instances of the message class against which this
+            method was called.
+
+        Raises:
+            ~.json_format.ParseError: If a line is not the JSON
+                representation of a message of this type. The error names
+                the line.
+        """
+        lines = (
+            (number, line)
+            for number, line in enumerate(stream, 1)
+            if not line.isspace()
+        )
+        if executor is None:
+            new = cls.pb()
+            wrap = cls.wrap
+            for number, line in lines:
+                try:
+                    pb = Parse(line, new(), ignore_unknown_fields=ignore_unknown_fields)
+                except ParseError as e:
+                    raise ParseError(
+                        "Failed to parse line {0}: {1}".format(number, e)
+                    ) from e
+                yield wrap(pb)
+            return
+
+        numbers = []
+        payloads = []
+        for number, line in lines:
+            numbers.append(number)
+            payloads.append(line)
+        instances = executor.map(
+            functools.partial(
+                cls.from_json, ignore_unknown_fields=ignore_unknown_fields
+            ),
+            payloads,
+        )
+        index = 0
+        try:
+            for instance in instances:
+                yield instance
+                index += 1
+        except ParseError as e:
+            raise ParseError(
+                "Failed to parse line {0}: {1}".format(numbers[index], e)
+            ) from e
+
     def _warn_if_including_default_value_fields_is_used_protobuf_5(
         cls, including_default_value_fields: Optional[bool]
     ) -> None:
@@ -502,42 +881,33 @@ class MessageMeta(type):
             str: The json string representation of the protocol buffer.
         """
 
-        print_fields = cls._normalize_print_fields_without_presence(
-            always_print_fields_with_no_presence, including_default_value_fields
-        )
-
-        if PROTOBUF_VERSION[0] in ("3", "4"):
-            return MessageToJson(
-                cls.pb(instance),
-                use_integers_for_enums=use_integers_for_enums,
-                including_default_value_fields=print_fields,
-                preserving_proto_field_name=preserving_proto_field_name,
-                sort_keys=sort_keys,
-                indent=indent,
-                float_precision=float_precision,
-            )
+        if (
+            always_print_fields_with_no_presence is None
+            and including_default_value_fields is None
+        ):
+            print_fields = True
         else:
-            # The `including_default_value_fields` argument was removed from protobuf 5.x
-            # and replaced with `always_print_fields_with_no_presence` which very similar but has
-            # handles optional fields consistently by not affecting them.
-            # The old flag accidentally had inconsistent behavior between proto2
-            # optional and proto3 optional fields.
-            return MessageToJson(
-                cls.pb(instance),
-                use_integers_for_enums=use_integers_for_enums,
-                always_print_fields_with_no_presence=print_fields,
-                preserving_proto_field_name=preserving_proto_field_name,
-                sort_keys=sort_keys,
-                indent=indent,
-                float_precision=float_precision,
+            print_fields = cls._normalize_print_fields_without_presence(
+                always_print_fields_with_no_presence, including_default_value_fields
             )
+        serialize = _json_serializer(
+            use_integers_for_enums,
+            preserving_proto_field_name,
+            sort_keys,
+            indent,
+            float_precision,
+            bool(print_fields),
+        )
+        return serialize(cls.pb(instance))
 
     def from_json(cls, payload, *, ignore_unknown_fields=False) -> "Message":
         """Given a json string representing an instance,
         parse it into a message.
 
         Args:
-            payload: A json string representing a message.
+            payload: A json string representing a message, or a text or
+                binary file object to read it from. Files are parsed
+                incrementally, without reading all of the text first.
             ignore_unknown_fields (Optional(bool)): If True, do not raise errors
                 for unknown fields.
 
@@ -546,7 +916,12 @@ class MessageMeta(type):
             method was called.
         """
         instance = cls()
-        Parse(payload, instance._pb, ignore_unknown_fields=ignore_unknown_fields)
+        if hasattr(payload, "read"):
+            _json_decoder.merge(
+                payload, instance._pb, ignore_unknown_fields=ignore_unknown_fields
+            )
+        else:
+            Parse(payload, instance._pb, ignore_unknown_fields=ignore_unknown_fields)
         return instance
 
     def to_dict(
@@ -589,31 +964,87 @@ class MessageMeta(type):
                   repeated fields are represented as lists.
         """
 
-        print_fields = cls._normalize_print_fields_without_presence(
-            always_print_fields_with_no_presence, including_default_value_fields
-        )
-
-        if PROTOBUF_VERSION[0] in ("3", "4"):
-            return MessageToDict(
-                cls.pb(instance),
-                including_default_value_fields=print_fields,
-                preserving_proto_field_name=preserving_proto_field_name,
-                use_integers_for_enums=use_integers_for_enums,
-                float_precision=float_precision,
-            )
+        if (
+            always_print_fields_with_no_presence is None
+            and including_default_value_fields is None
+        ):
+            print_fields = True
         else:
-            # The `including_default_value_fields` argument was removed from protobuf 5.x
-            # and replaced with `always_print_fields_with_no_presence` which very similar but has
-            # handles optional fields consistently by not affecting them.
-            # The old flag accidentally had inconsistent behavior between proto2
-            # optional and proto3 optional fields.
-            return MessageToDict(
-                cls.pb(instance),
-                always_print_fields_with_no_presence=print_fields,
-                preserving_proto_field_name=preserving_proto_field_name,
-                use_integers_for_enums=use_integers_for_enums,
-                float_precision=float_precision,
+            print_fields = cls._normalize_print_fields_without_presence(
+                always_print_fields_with_no_presence, including_default_value_fields
             )
+        serialize = _dict_serializer(
+            use_integers_for_enums,
+            preserving_proto_field_name,
+            float_precision,
+            bool(print_fields),
+        )
+        return serialize(cls.pb(instance))
+
+    def to_native_dict(
+        cls,
+        instance,
+        *,
+        always_print_fields_with_no_presence=True,
+    ) -> Dict[str, Any]:
+        """Given a message instance, return its fields as Python values.
+
+        Unlike :meth:`to_dict`, which follows the protobuf JSON mapping,
+        this returns the same values as reading each field from the
+        message: 64-bit integers are integers, bytes are bytes, enums are
+        members of their enum class (or integers, for values the enum does
+        not know), timestamps are datetimes and durations are timedeltas.
+        Messages become dictionaries, repeated fields lists, and map fields
+        dictionaries; the wrapper types, ``google.protobuf.Struct``,
+        ``google.protobuf.ListValue`` and ``google.protobuf.Value`` become
+        the Python values they wrap. Keys are the names of the fields.
+
+        The conversion of each message type is compiled on first use, so
+        this is several times faster than :meth:`to_dict`.
+
+        Args:
+            instance: An instance of this message type.
+            always_print_fields_with_no_presence (Optional(bool)): If True,
+                fields without presence (implicit presence scalars, repeated
+                fields, and map fields) are always included; otherwise they
+                are only included when not empty. Fields with presence
+                (including singular message fields and oneof fields) are
+                only included when set. Default is True.
+
+        Returns:
+            dict: The fields of the message, which
+                :meth:`from_native_dict` accepts.
+        """
+        return _dict_plan.plan_for(cls).to_dict(
+            cls.pb(instance), print_fields=always_print_fields_with_no_presence
+        )
+
+    def from_native_dict(cls, mapping, *, ignore_unknown_fields=False) -> "Message":
+        """Given a dictionary of Python values, return a message.
+
+        This accepts what :meth:`to_native_dict` returns. Nested messages
+        may be given as dictionaries or as messages. Where the message's
+        constructor marshals each value through proto-plus, this builds the
+        whole underlying protobuf message in a single call.
+
+        Args:
+            mapping (Mapping[str, Any]): Python values keyed by field name.
+                Fields set to None are left unset.
+            ignore_unknown_fields (Optional(bool)): If True, do not raise
+                errors for unknown fields.
+
+        Returns:
+            ~.Message: An instance of the message class against which this
+            method was called.
+
+        Raises:
+            ValueError: If a key is not a field of the message, unless
+                ``ignore_unknown_fields`` is set.
+        """
+        kwargs = _dict_plan.plan_for(cls).to_kwargs(
+            mapping, ignore_unknown_fields=ignore_unknown_fields
+        )
+        return cls.wrap(cls.pb()(**kwargs))
 
     def copy_from(cls, instance, other):
         """Equivalent for protobuf.Message.CopyFrom
@@ -659,6 +1090,11 @@ class Message(metaclass=MessageMeta):
             message.
     """
 
+    # The underlying protobuf instance, or (for a message deserialized with
+    # `lazy=True` which has not been used yet) its serialized payload, and
+    # (for classes with `_cache_views` set) the views read from it so far.
+    __slots__ = ("_pb", "_payload", "_views", "__weakref__")
+
     def __init__(
         self,
         mapping=None,
@@ -671,14 +1107,19 @@ class Message(metaclass=MessageMeta):
         #   * An instance of the underlying protobuf descriptor class.
         #   * A dict
         #   * Nothing (keyword arguments only).
+        #
+        # Make sure the protobuf type exists before marshalling any values;
+        # this builds the file, if it was deferred (see ``_FileInfo.lazy``),
+        # which also resolves any fields referencing messages by name.
+        pb_class = self._meta.pb
         if mapping is None:
             if not kwargs:
                 # Special fast path for empty construction.
-                super().__setattr__("_pb", self._meta.pb())
+                super().__setattr__("_pb", pb_class())
                 return
 
             mapping = kwargs
-        elif isinstance(mapping, self._meta.pb):
+        elif isinstance(mapping, pb_class):
             # Make a copy of the mapping.
             # This is a constructor for a new object, so users will assume
             # that it will not have side effects on the arguments being
@@ -688,7 +1129,7 @@ class Message(metaclass=MessageMeta):
             # ownership of the passed in protobuf object.
             mapping = copy.deepcopy(mapping)
             if kwargs:
-                mapping.MergeFrom(self._meta.pb(**kwargs))
+                mapping.MergeFrom(pb_class(**kwargs))
 
             super().__setattr__("_pb", mapping)
             return
@@ -731,7 +1172,7 @@ class Message(metaclass=MessageMeta):
                 params[key] = pb_value
 
         # Create the internal protocol buffer.
-        super().__setattr__("_pb", self._meta.pb(**params))
+        super().__setattr__("_pb", pb_class(**params))
 
     def _get_pb_type_from_key(self, key):
         """Given a key, return the corresponding pb_type.
@@ -872,6 +1313,38 @@ class Message(metaclass=MessageMeta):
             their Python equivalents. See the ``marshal`` module for
             more details.
         """
+        meta = self._meta
+        getter = meta.getters.get(key)
+        if getter is not None:
+            if meta.cache_views and key in meta.view_getters:
+                return meta.view_getters[key](self)
+            return getter(self._pb)
+
+        # Lazily deserialized messages have no protobuf instance until
+        # they are first used; parse the payload now.
+        if key == "_pb":
+            payload = _unparsed_payload(self)
+            if payload is not None:
+                pb = self._meta.pb().FromString(payload)
+                with _LAZY_PARSE_LOCK:
+                    # Another thread may have parsed the payload meanwhile;
+                    # keep the instance it set, which may have been written.
+                    try:
+                        pb = object.__getattribute__(self, "_pb")
+                    except AttributeError:
+                        super().__setattr__("_pb", pb)
+                    try:
+                        object.__delattr__(self, "_payload")
+                    except AttributeError:
+                        pass
+                return pb
+            try:
+                # The payload was parsed by another thread since `_pb` was
+                # looked up.
+                return object.__getattribute__(self, "_pb")
+            except AttributeError:
+                pass
+
         (key, pb_type) = self._get_pb_type_from_key(key)
         if pb_type is None:
             raise AttributeError(
@@ -896,27 +1369,20 @@ class Message(metaclass=MessageMeta):
         """
         if key[0] == "_":
             return super().__setattr__(key, value)
-        marshal = self._meta.marshal
-        (key, pb_type) = self._get_pb_type_from_key(key)
-        if pb_type is None:
-            raise AttributeError(
-                "Unknown field for {}: {}".format(self.__class__.__name__, key)
-            )
-
-        pb_value = marshal.to_proto(pb_type, value)
-
-        # Clear the existing field.
-        # This is the only way to successfully write nested falsy values,
-        # because otherwise MergeFrom will no-op on them.
-        self._pb.ClearField(key)
-
-        # Merge in the value being set.
-        if pb_value is not None:
-            self._pb.MergeFrom(self._meta.pb(**{key: pb_value}))
+        setters = self._meta.setters
+        setter = setters.get(key)
+        if setter is None:
+            (key, pb_type) = self._get_pb_type_from_key(key)
+            if pb_type is None:
+                raise AttributeError(
+                    "Unknown field for {}: {}".format(self.__class__.__name__, key)
+                )
+            setter = setters[key]
+        setter(self._pb, value)
 
     def __getstate__(self):
         """Serialize for pickling."""
-        return self._pb.SerializeToString()
+        return type(self).serialize(self)
 
     def __setstate__(self, value):
         """Deserialization for pickling."""
@@ -924,6 +1390,211 @@ class Message(metaclass=MessageMeta):
         super().__setattr__("_pb", new_pb)
 
 
+# The functions converting messages to JSON and dictionaries are chosen
+# once, for the installed protobuf, and kept for each set of options. They
+# are called with positional arguments, which are quicker to look up.
+if PROTOBUF_VERSION[0] in ("3", "4"):
+
+    @functools.lru_cache(maxsize=64)
+    def _json_serializer(
+        use_integers_for_enums: bool,
+        preserving_proto_field_name: bool,
+        sort_keys: bool,
+        indent: Optional[int],
+        float_precision: Optional[int],
+        print_fields: bool,
+    ) -> Callable[[message.Message], str]:
+        """Return a function writing protobuf messages as JSON, with these options.
+
+        This is :meth:`Message.to_json`, with the options already checked.
+        """
+        return functools.partial(
+            MessageToJson,
+            use_integers_for_enums=use_integers_for_enums,
+            including_default_value_fields=print_fields,
+            preserving_proto_field_name=preserving_proto_field_name,
+            sort_keys=sort_keys,
+            indent=indent,
+            float_precision=float_precision,
+        )
+
+    @functools.lru_cache(maxsize=64)
+    def _dict_serializer(
+        use_integers_for_enums: bool,
+        preserving_proto_field_name: bool,
+        float_precision: Optional[int],
+        print_fields: bool,
+    ) -> Callable[[message.Message], Dict[str, Any]]:
+        """Return a function converting protobuf messages to dicts, with these options.
+
+        This is :meth:`Message.to_dict`, with the options already checked.
+        """
+        return functools.partial(
+            MessageToDict,
+            including_default_value_fields=print_fields,
+            preserving_proto_field_name=preserving_proto_field_name,
+            use_integers_for_enums=use_integers_for_enums,
+            float_precision=float_precision,
+        )
+
+else:
+    # The `including_default_value_fields` argument was removed from protobuf 5.x
+    # and replaced with `always_print_fields_with_no_presence` which very similar but has
+    # handles optional fields consistently by not affecting them.
+    # The old flag accidentally had inconsistent behavior between proto2
+    # optional and proto3 optional fields.
+
+    @functools.lru_cache(maxsize=64)
+    def _json_serializer(
+        use_integers_for_enums: bool,
+        preserving_proto_field_name: bool,
+        sort_keys: bool,
+        indent: Optional[int],
+        float_precision: Optional[int],
+        print_fields: bool,
+    ) -> Callable[[message.Message], str]:
+        """Return a function writing protobuf messages as JSON, with these options.
+
+        This is :meth:`Message.to_json`, with the options already checked.
+        """
+        if float_precision is not None:
+            # `float_precision` is deprecated by protobuf, which warns about
+            # it, so it is left to json_format.
+            return functools.partial(
+                MessageToJson,
+                use_integers_for_enums=use_integers_for_enums,
+                always_print_fields_with_no_presence=print_fields,
+                preserving_proto_field_name=preserving_proto_field_name,
+                sort_keys=sort_keys,
+                indent=indent,
+                float_precision=float_precision,
+            )
+        # Write the same JSON as json_format, without building the
+        # dictionary it dumps first.
+        return _json_encoder.encoder(
+            use_integers_for_enums=use_integers_for_enums,
+            preserving_proto_field_name=preserving_proto_field_name,
+            sort_keys=sort_keys,
+            indent=indent,
+            print_fields=print_fields,
+        ).encode
+
+    @functools.lru_cache(maxsize=64)
+    def _dict_serializer(
+        use_integers_for_enums: bool,
+        preserving_proto_field_name: bool,
+        float_precision: Optional[int],
+        print_fields: bool,
+    ) -> Callable[[message.Message], Dict[str, Any]]:
+        """Return a function converting protobuf messages to dicts, with these options.
+
+        This is :meth:`Message.to_dict`, with the options already checked.
+        """
+        return functools.partial(
+            MessageToDict,
+            always_print_fields_with_no_presence=print_fields,
+            preserving_proto_field_name=preserving_proto_field_name,
+            use_integers_for_enums=use_integers_for_enums,
+            float_precision=float_precision,
+        )
+
+
+def _unparsed_payload(instance: Message) -> Optional[bytes]:
+    """Return the payload of a lazily deserialized message, if not parsed yet.
+
+    Args:
+        instance (~.Message): The message.
+
+    Returns:
+        Optional[bytes]: The payload passed to :meth:`Message.deserialize`,
+            or None if the message was not deserialized lazily or has been
+            parsed since.
+    """
+    try:
+        # Bypass `Message.__getattr__`, which would treat this as a field.
+        return object.__getattribute__(instance, "_payload")
+    except AttributeError:
+        return None
+
+
+def _compile_view_getter(name: str, wrap: Callable[[Any], Any]):
+    """Return a getter keeping the view of a field on the message instance.
+
+    Args:
+        name (str): The name of the field.
+        wrap (Callable[[Any], Any]): Wraps the protobuf value of the field in
+            a view, as returned by :meth:`~.Marshal.compile_view`.
+
+    Returns:
+        Callable[[~.Message], Any]: The getter.
+    """
+    read = operator.attrgetter(name)
+
+    def getter(instance):
+        value = read(instance._pb)
+        try:
+            # Bypass `Message.__getattr__`, which would treat this as a field.
+            views = object.__getattribute__(instance, "_views")
+        except AttributeError:
+            views = {}
+            object.__setattr__(instance, "_views", views)
+        view = views.get(name)
+        # Clearing or replacing the field (or the whole message) may give
+        # it a new protobuf value; a view of the old one is stale.
+        if view is None or view._pb is not value:
+            view = views[name] = wrap(value)
+        return view
+
+    return getter
+
+
+class _FieldProperty:
+    """A data descriptor providing access to one field of a message.
+
+    Reading the field on an instance returns its value, marshalled using
+    the getter compiled for the field (see :attr:`_MessageInfo.getters`).
+    Reading an optional field on the class returns the field's name, so
+    that ``MyMessage.field in message`` checks for the field's presence;
+    other fields are not attributes of the class. Writes and deletes are
+    handled by the message itself.
+
+    Args:
+        field (~.fields.Field): The field.
+    """
+
+    __slots__ = ("_field", "_getter", "_view_getter", "_generation")
+
+    def __init__(self, field: Field) -> None:
+        self._field = field
+        self._getter = None
+        self._view_getter = None
+        self._generation = None
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            if self._field.optional:
+                return self._field.name
+            raise AttributeError(
+                "type object {!r} has no attribute {!r}".format(
+                    owner.__name__, self._field.name
+                )
+            )
+        if self._generation != Marshal._generation:
+            meta = self._field.parent._meta
+            self._getter = meta.getters[self._field.name]
+            self._view_getter = meta.view_getters.get(self._field.name)
+            self._generation = Marshal._generation
+        if self._view_getter is not None:
+            return self._view_getter(instance)
+        return self._getter(instance._pb)
+
+    def __set__(self, instance, value):
+        Message.__setattr__(instance, self._field.name, value)
+
+    def __delete__(self, instance):
+        Message.__delattr__(instance, self._field.name)
+
+
 class _MessageInfo:
     """Metadata about a message.
 
@@ -937,6 +1608,12 @@ class _MessageInfo:
             automatically registered.
         options (~.descriptor_pb2.MessageOptions): Any options that were
             set on the message.
+        build_descriptor (Callable[[], ~.descriptor_pb2.DescriptorProto]):
+            Builds the descriptor proto for the message, including any
+            messages and enums nested in it.
+        cache_views (bool): Whether instances keep the views read from
+            their repeated, map and message fields, and return them again
+            on later reads (see :attr:`view_getters`).
     """
 
     def __init__(
@@ -947,14 +1624,89 @@ class _MessageInfo:
         full_name: str,
         marshal: Marshal,
         options: descriptor_pb2.MessageOptions,
+        file_info: Optional["_file_info._FileInfo"] = None,
+        build_descriptor: Optional[Callable[[], descriptor_pb2.DescriptorProto]] = None,
+        cache_views: bool = False,
     ) -> None:
         self.package = package
         self.full_name = full_name
         self.options = options
+        self.file_info = file_info
+        self.build_descriptor = build_descriptor
+        self.cache_views = cache_views
         self.fields = collections.OrderedDict((i.name, i) for i in fields)
         self.fields_by_number = collections.OrderedDict((i.number, i) for i in fields)
         self.marshal = marshal
         self._pb = None
+        self._getters = {}
+        self._setters = {}
+        self._view_getters = {}
+        self._accessors_generation = None
+        # The conversions to and from dictionaries of Python values (see
+        # `MessageMeta.to_native_dict`), compiled on first use.
+        self.dict_plan = None
+
+    def _compile_accessors(self) -> None:
+        """Compile the getters and setters, if missing or out of date."""
+        if self._accessors_generation == Marshal._generation:
+            return
+        container = self.pb
+        if container is None:
+            return
+        getters, setters, view_getters = {}, {}, {}
+        for name, field in self.fields.items():
+            pb_type = field.pb_type
+            getters[name] = self.marshal.compile_getter(
+                pb_type, name=name, container=container
+            )
+            setters[name] = self.marshal.compile_setter(
+                pb_type, name=name, container=container
+            )
+            if self.cache_views:
+                wrap = self.marshal.compile_view(
+                    pb_type, name=name, container=container
+                )
+                if wrap is not None:
+                    view_getters[name] = _compile_view_getter(name, wrap)
+        self._getters, self._setters = getters, setters
+        self._view_getters = view_getters
+        self._accessors_generation = Marshal._generation
+
+    @property
+    def getters(self) -> Dict[str, Callable[[message.Message], Any]]:
+        """Return the getter for each field, keyed by field name.
+
+        Each getter accepts an instance of the underlying protobuf message
+        and returns the field's value, marshalled to Python. The table is
+        compiled on first use, and compiled again if any marshal rules have
+        been registered since.
+        """
+        self._compile_accessors()
+        return self._getters
+
+    @property
+    def setters(self) -> Dict[str, Callable[[message.Message, Any], None]]:
+        """Return the setter for each field, keyed by field name.
+
+        Each setter accepts an instance of the underlying protobuf message
+        and a value, and writes the value (marshalled to protobuf) to the
+        field. The table is compiled alongside :attr:`getters`.
+        """
+        self._compile_accessors()
+        return self._setters
+
+    @property
+    def view_getters(self) -> Dict[str, Callable[[message.Message], Any]]:
+        """Return the caching getter for each field read through a view.
+
+        This is empty unless ``cache_views`` is set. Each getter accepts an
+        instance of the proto-plus message (rather than of the underlying
+        protobuf message), and returns the view it returned last time for
+        the field, so long as that view still wraps the field's current
+        protobuf value; otherwise it makes a new view, and keeps that.
+        """
+        self._compile_accessors()
+        return self._view_getters
 
     @property
     def pb(self) -> Type[message.Message]:
@@ -962,7 +1714,12 @@ class _MessageInfo:
 
         If a field on the message references another message which has not
         loaded, then this method returns None.
+
+        If the file containing this message is waiting to be built (see
+        ``_FileInfo.lazy``), it is built first.
         """
+        if self._pb is None and self.file_info is not None:
+            self.file_info.build_if_pending()
         return self._pb
 
 
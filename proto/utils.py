@@ -31,26 +31,28 @@ def cached_property(fx):
     Similar to @property, but the function will only be called once per
     object.
 
+    The value is stored in the object's ``_cached_<name>`` attribute
+    (e.g. ``_cached_pb_type`` for a property named ``_pb_type``). Classes
+    that define ``__slots__`` must include that name in them.
+
     Args:
         fx (Callable[]): The property function.
 
     Returns:
         Callable[]: The wrapped function.
     """
+    attr = "_cached_{}".format(fx.__name__.lstrip("_"))
 
     @functools.wraps(fx)
     def inner(self):
-        # Sanity check: If there is no cache at all, create an empty cache.
-        if not hasattr(self, "_cached_values"):
-            object.__setattr__(self, "_cached_values", {})
-
         # If and only if the function's result is not in the cache,
         # run the function.
-        if fx.__name__ not in self._cached_values:
-            self._cached_values[fx.__name__] = fx(self)
-
-        # Return the value from cache.
-        return self._cached_values[fx.__name__]
+        try:
+            return object.__getattribute__(self, attr)
+        except AttributeError:
+            value = fx(self)
+            object.__setattr__(self, attr, value)
+            return value
 
     return property(inner)
 
@@ -0,0 +1,183 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+import sys
+
+import pytest
+
+from google.protobuf import duration_pb2
+from google.protobuf import timestamp_pb2
+from google.protobuf import wrappers_pb2
+
+import proto
+
+
+def row_type():
+    class Color(proto.Enum):
+        COLOR_UNSPECIFIED = 0
+        RED = 1
+        GREEN = 2
+
+    class Point(proto.Message):
+        x = proto.Field(proto.INT32, number=1)
+
+    class Row(proto.Message):
+        name = proto.Field(proto.STRING, number=1)
+        size = proto.Field(proto.INT64, number=2)
+        color = proto.Field(Color, number=3)
+        created = proto.Field(timestamp_pb2.Timestamp, number=4)
+        elapsed = proto.Field(duration_pb2.Duration, number=5)
+        point = proto.Field(Point, number=6)
+        tags = proto.RepeatedField(proto.STRING, number=7)
+        scores = proto.RepeatedField(proto.FLOAT, number=8)
+        labels = proto.MapField(proto.STRING, proto.INT32, number=9)
+
+    return Row
+
+
+def rows():
+    Row = row_type()
+    return [
+        Row(
+            name="a",
+            size=1,
+            color=2,
+            created=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            elapsed=timedelta(seconds=1, microseconds=5),
+            point={"x": 3},
+            tags=["t", "u"],
+            scores=[0.5, 0.25],
+            labels={"k": 1},
+        ),
+        Row(name="b"),
+    ]
+
+
+def test_to_columns_python():
+    messages = rows()
+    columns = proto.to_columns(messages, backend="python")
+    assert list(columns) == list(type(messages[0]).meta.fields)
+    assert columns["name"] == ["a", "b"]
+    assert columns["size"] == [1, 0]
+    assert columns["color"] == [2, 0]
+    assert columns["created"] == [1577836800 * 10**9, None]
+    assert columns["elapsed"] == [1000005000, None]
+    assert columns["point"] == [messages[0].point, None]
+    assert columns["point"][0].x == 3
+    assert columns["tags"] == [["t", "u"], []]
+    assert columns["scores"] == [[0.5, 0.25], []]
+    assert columns["labels"] == [{"k": 1}, {}]
+
+
+def test_to_columns_enum_names():
+    Row = row_type()
+    unknown = Row()
+    Row.pb(unknown).color = 7
+    columns = proto.to_columns(
+        [Row(color=1), unknown, Row()], backend="python", enums="category"
+    )
+    assert columns["color"] == ["RED", "7", "COLOR_UNSPECIFIED"]
+
+
+def test_to_columns_empty():
+    columns = proto.to_columns([], row_type(), backend="python")
+    assert columns["name"] == []
+    with pytest.raises(ValueError):
+        proto.to_columns([], backend="python")
+
+
+def test_to_columns_generator():
+    columns = proto.to_columns((row for row in rows()), backend="python")
+    assert columns["name"] == ["a", "b"]
+
+
+def test_to_columns_wrong_type():
+    Row = row_type()
+    with pytest.raises(TypeError):
+        proto.to_columns([Row(), Row.meta.fields["point"].message()], backend="python")
+
+
+def test_to_columns_invalid_options():
+    messages = rows()
+    with pytest.raises(ValueError):
+        proto.to_columns(messages, backend="pandas")
+    with pytest.raises(ValueError):
+        proto.to_columns(messages, backend="python", enums="names")
+
+
+def test_to_columns_missing_backend(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    messages = rows()
+    with pytest.raises(ImportError):
+        proto.to_columns(messages)
+    with pytest.raises(ImportError):
+        proto.to_columns(messages, backend="arrow")
+
+
+def test_to_columns_numpy():
+    numpy = pytest.importorskip("numpy")
+    columns = proto.to_columns(rows())
+    assert columns["size"].dtype == numpy.int64
+    assert columns["size"].tolist() == [1, 0]
+    assert columns["color"].dtype == numpy.int32
+    assert columns["created"].dtype == numpy.dtype("datetime64[ns]")
+    assert columns["created"][0] == numpy.datetime64("2020-01-01T00:00:00", "ns")
+    assert numpy.isnat(columns["created"][1])
+    assert columns["elapsed"].dtype == numpy.dtype("timedelta64[ns]")
+    assert columns["elapsed"].view(numpy.int64)[0] == 1000005000
+    assert columns["name"].dtype == object
+    assert columns["tags"].shape == (2,)
+    assert columns["tags"][0] == ["t", "u"]
+    assert columns["scores"][0].dtype == numpy.float32
+    assert columns["scores"][1].shape == (0,)
+    assert columns["labels"][0] == {"k": 1}
+
+
+def test_to_columns_arrow():
+    pyarrow = pytest.importorskip("pyarrow")
+    messages = rows()
+    columns = proto.to_columns(messages, backend="arrow", enums="category")
+    table = pyarrow.table(columns)
+    assert table.num_rows == 2
+    assert table.column("size").type == pyarrow.int64()
+    assert table.column("color").type == pyarrow.dictionary(
+        pyarrow.int32(), pyarrow.string()
+    )
+    assert table.column("created").type == pyarrow.timestamp("ns", tz="UTC")
+    assert table.column("created").null_count == 1
+    point = messages[0].point
+    assert table.column("point").to_pylist() == [type(point).serialize(point), None]
+    assert table.column("scores").to_pylist() == [[0.5, 0.25], []]
+    assert table.column("labels").to_pylist() == [[("k", 1)], []]
+
+
+def test_to_columns_wrappers():
+    class Reading(proto.Message):
+        count = proto.Field(wrappers_pb2.Int32Value, number=1)
+        label = proto.Field(wrappers_pb2.StringValue, number=2)
+
+    readings = [Reading(count=3, label="a"), Reading()]
+    columns = proto.to_columns(readings, backend="python")
+    assert columns == {"count": [3, None], "label": ["a", None]}
+
+    pyarrow = pytest.importorskip("pyarrow")
+    table = pyarrow.table(proto.to_columns(readings, backend="arrow"))
+    assert table.column("count").type == pyarrow.int32()
+    assert table.column("count").to_pylist() == [3, None]
+    assert table.column("label").type == pyarrow.string()
+    assert table.column("label").to_pylist() == ["a", None]
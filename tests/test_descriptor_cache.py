@@ -0,0 +1,158 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import sys
+import textwrap
+from unittest import mock
+
+import pytest
+
+from google.protobuf import descriptor_pool
+
+from proto import _descriptor_cache
+from proto._file_info import _FileInfo
+
+SOURCE = textwrap.dedent(
+    """\
+    import proto
+
+    __protobuf__ = proto.module(
+        package="test.descriptor.cache",
+        manifest={"Shell", "Squid"},
+    )
+
+
+    class Shell(proto.Message):
+        class Color(proto.Enum):
+            COLOR_UNSPECIFIED = 0
+            WHITE = 1
+
+        color = proto.Field(Color, number=1)
+
+
+    class Squid(proto.Message):
+        name = proto.Field(proto.STRING, number=1)
+        shells = proto.MapField(proto.STRING, "Shell", number=2)
+        mass_kg = proto.Field(proto.INT32, number=3, oneof="size")
+        length_cm = proto.Field(proto.INT32, number=4, oneof="size")
+    """
+)
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "cached_squid.py").write_text(SOURCE)
+    monkeypatch.syspath_prepend(str(source_dir))
+    monkeypatch.setattr(_descriptor_cache, "directory", str(tmp_path / "cache"))
+    monkeypatch.setattr(_descriptor_cache, "_source_digests", {})
+    monkeypatch.setattr(_FileInfo, "lazy", False)
+    yield "cached_squid"
+    sys.modules.pop("cached_squid", None)
+
+
+def reimport(name):
+    # Import the module again, as a new interpreter would; that includes
+    # starting with a descriptor pool which does not have its file yet.
+    sys.modules.pop(name, None)
+    pool = type(descriptor_pool.Default())()
+    with mock.patch.object(descriptor_pool, "Default", return_value=pool):
+        return importlib.import_module(name)
+
+
+def check(cached_squid):
+    squid = cached_squid.Squid(
+        name="Steve",
+        shells={"spare": cached_squid.Shell(color=cached_squid.Shell.Color.WHITE)},
+        mass_kg=20,
+    )
+    squid = cached_squid.Squid.deserialize(cached_squid.Squid.serialize(squid))
+    assert squid.shells["spare"].color == cached_squid.Shell.Color.WHITE
+    assert "mass_kg" in squid and "length_cm" not in squid
+
+
+def test_descriptor_cache_hit(module, tmp_path):
+    check(reimport(module))
+    assert len(list((tmp_path / "cache").glob("*.pb"))) == 1
+
+    with mock.patch.object(_FileInfo, "_build_descriptor") as build_descriptor:
+        cached_squid = reimport(module)
+    build_descriptor.assert_not_called()
+    check(cached_squid)
+
+
+def test_descriptor_cache_matches_built_descriptor(module, tmp_path):
+    cached_squid = reimport(module)
+    (entry,) = (tmp_path / "cache").glob("*.pb")
+    assert entry.read_bytes() == cached_squid.Squid.pb().DESCRIPTOR.file.serialized_pb
+
+
+def test_descriptor_cache_stale_entry(module, tmp_path):
+    reimport(module)
+    (entry,) = (tmp_path / "cache").glob("*.pb")
+    valid = entry.read_bytes()
+    entry.write_bytes(b"not a file descriptor")
+
+    check(reimport(module))
+    assert entry.read_bytes() == valid
+
+
+def test_descriptor_cache_source_changed(module, tmp_path):
+    reimport(module)
+    source = tmp_path / "src" / "cached_squid.py"
+    source.write_text(SOURCE.replace("WHITE = 1", "WHITE = 1\n        BLACK = 2"))
+    _descriptor_cache._source_digests.clear()
+
+    cached_squid = reimport(module)
+    assert cached_squid.Shell.Color.BLACK == 2
+    assert len(list((tmp_path / "cache").glob("*.pb"))) == 2
+
+
+def test_descriptor_cache_disabled(module, tmp_path, monkeypatch):
+    monkeypatch.setattr(_descriptor_cache, "directory", None)
+    check(reimport(module))
+    assert not (tmp_path / "cache").exists()
+
+
+def test_descriptor_cache_same_source_different_messages(module, tmp_path, monkeypatch):
+    # The same source declares a differently shaped message, under the
+    # same file name, depending on the environment.
+    (tmp_path / "src" / "cached_shapes.py").write_text(
+        textwrap.dedent(
+            """\
+            import os
+
+            import proto
+
+
+            class Squid(proto.Message):
+                if os.environ.get("SQUID_SHAPE") == "long":
+                    length_cm = proto.Field(proto.INT32, number=1)
+                else:
+                    mass_kg = proto.Field(proto.INT64, number=2)
+            """
+        )
+    )
+    try:
+        monkeypatch.setenv("SQUID_SHAPE", "heavy")
+        heavy = reimport("cached_shapes").Squid(mass_kg=20)
+        monkeypatch.setenv("SQUID_SHAPE", "long")
+        long = reimport("cached_shapes").Squid(length_cm=30)
+    finally:
+        sys.modules.pop("cached_shapes", None)
+    assert heavy.mass_kg == 20
+    assert long.length_cm == 30
+    assert len(list((tmp_path / "cache").glob("*.pb"))) == 2
@@ -104,3 +104,19 @@ def test_composite_self_ref():
     assert not spam.spam.spam
     assert spam.spam.spam.eggs is False
     assert not spam.spam.spam.spam.spam.spam.spam.spam
+
+
+def test_composite_forward_ref_tracked():
+    class Spam(proto.Message):
+        foo = proto.Field(proto.MESSAGE, number=1, message="Foo")
+        bar = proto.Field(proto.MESSAGE, number=2, message="Foo")
+
+    file_info = Spam._meta.file_info
+    assert file_info.unresolved == {"{}.Foo".format(Spam._meta.package)}
+    assert Spam._meta._pb is None
+
+    class Foo(proto.Message):
+        baz = proto.Field(proto.INT64, number=1)
+
+    assert not file_info.unresolved
+    assert Spam(foo=Foo(baz=42)).foo.baz == 42
@@ -136,3 +136,21 @@ def test_int64_dict_round_trip():
     c2 = Clam(c_dict)
 
     assert c == c2
+
+
+def test_field_metadata():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+        baz_qux = proto.MapField(proto.STRING, proto.INT32, number=2)
+
+    bar_field = Foo.meta.fields["bar"]
+    assert bar_field.name == "bar"
+    assert bar_field.package == Foo.meta.package
+    assert bar_field.parent is Foo
+    assert bar_field.index == 0
+    assert bar_field.mcls_data["parent_name"] == Foo.meta.full_name
+    assert not hasattr(bar_field, "__dict__")
+
+    entry = Foo.meta.fields["baz_qux"].message
+    assert entry.__name__ == "BazQuxEntry"
+    assert entry.meta.fields["value"].name == "value"
@@ -15,6 +15,7 @@
 import pytest
 
 import proto
+from proto.marshal import compat
 
 
 def test_composite_map():
@@ -115,3 +116,40 @@ def test_composite_map_del():
     del baz.foos["i"]
     assert len(baz.foos) == 0
     assert "i" not in baz.foos
+
+
+def test_composite_map_declared_type():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.MapField(proto.STRING, proto.MESSAGE, number=1, message=Foo)
+
+    baz = Baz()
+    assert baz.foos._pb_type is Foo.pb()
+    baz.foos["i"] = Foo(bar=42)
+    assert baz.foos["i"].bar == 42
+
+
+@pytest.mark.parametrize("native_map_contains", [True, False])
+def test_composite_map_contains(native_map_contains, monkeypatch):
+    monkeypatch.setattr(compat, "native_map_contains", native_map_contains)
+
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.MapField(proto.INT64, proto.MESSAGE, number=1, message=Foo)
+
+    baz = Baz(foos={1: Foo(bar=42)})
+    assert 1 in baz.foos
+    assert 2 not in baz.foos
+    assert "1" not in baz.foos
+    assert 2**70 not in baz.foos
+    # Keys of other types are compared by equality.
+    assert 1.0 in baz.foos
+    assert 1.5 not in baz.foos
+    with pytest.raises(KeyError):
+        baz.foos[2]
+    assert baz.foos[1].bar == 42
+    assert len(baz.foos) == 1
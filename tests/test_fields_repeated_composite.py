@@ -21,6 +21,7 @@ import pytest
 from google.protobuf import timestamp_pb2
 
 import proto
+from proto.marshal.collections import RepeatedComposite
 from proto.datetime_helpers import DatetimeWithNanoseconds
 
 
@@ -168,6 +169,37 @@ def test_repeated_composite_iadd():
     assert baz.foos[0].bar == 96
     assert baz.foos[1].bar == 48
 
+    # The field is extended in place.
+    foos = baz.foos
+    baz.foos += [{"bar": 24}]
+    assert len(foos) == 3
+    assert foos[2].bar == 24
+
+
+def test_repeated_composite_extend_self():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    baz = Baz(foos=[{"bar": 96}, {"bar": 48}])
+    baz.foos.extend(baz.foos)
+    baz.foos.extend(Foo(bar=i) for i in range(2))
+    assert [foo.bar for foo in baz.foos] == [96, 48, 96, 48, 0, 1]
+
+
+def test_repeated_composite_clear():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    baz = Baz(foos=[{"bar": 96}, {"bar": 48}])
+    baz.foos.clear()
+    assert len(baz.foos) == 0
+
 
 def test_repeated_composite_set_index():
     class Foo(proto.Message):
@@ -224,6 +256,54 @@ def test_repeated_composite_set_slice_more():
     assert len(baz.foos) == 3
 
 
+def test_repeated_composite_set_slice_middle():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    baz = Baz(foos=[{"bar": i} for i in range(5)])
+    baz.foos[1:3] = (Foo(bar=i) for i in (10, 11, 12))
+    assert [foo.bar for foo in baz.foos] == [0, 10, 11, 12, 3, 4]
+    baz.foos[4:2] = [{"bar": 20}]
+    assert [foo.bar for foo in baz.foos] == [0, 10, 11, 12, 20, 3, 4]
+    baz.foos[1:] = baz.foos[:2]
+    assert [foo.bar for foo in baz.foos] == [0, 0, 10]
+    baz.foos[0:1] = baz.foos[1:]
+    assert [foo.bar for foo in baz.foos] == [0, 10, 0, 10]
+
+
+def test_repeated_composite_set_slice_keeps_references():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    baz = Baz(foos=[{"bar": i} for i in range(6)])
+    foo = baz.foos[5]
+    baz.foos[0:1] = [Foo(bar=100)]
+    foo.bar = 99
+    assert [foo.bar for foo in baz.foos] == [100, 1, 2, 3, 4, 99]
+
+
+def test_repeated_composite_set_slice_wrong_value_type():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class NotFoo(proto.Message):
+        eggs = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    baz = Baz(foos=[{"bar": 96}, {"bar": 48}])
+    with pytest.raises(TypeError):
+        baz.foos[:1] = [Foo(bar=1), NotFoo(eggs=42)]
+    assert [foo.bar for foo in baz.foos] == [96, 48]
+
+
 def test_repeated_composite_set_slice_not_iterable():
     class Foo(proto.Message):
         bar = proto.Field(proto.INT32, number=1)
@@ -287,3 +367,53 @@ def test_repeated_composite_set_wrong_value_type():
     baz = Baz()
     with pytest.raises(TypeError):
         baz.foos.append(NotFoo(eggs=42))
+
+
+def test_repeated_composite_declared_type():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    # The element type comes from the field, even with no elements to
+    # inspect, and finding it leaves the field untouched.
+    baz = Baz()
+    assert baz.foos._pb_type is Foo.pb()
+    assert len(baz.foos) == 0
+    baz.foos.append(Foo(bar=42))
+    assert baz.foos[0].bar == 42
+
+
+def test_repeated_composite_undeclared_type():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    baz = Baz()
+    foos = RepeatedComposite(Baz.pb(baz).foos, marshal=Baz.meta.marshal)
+    assert foos._pb_type is Foo.pb()
+    assert len(foos) == 0
+
+
+def test_repeated_composite_undeclared_type_read_only():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foos = proto.RepeatedField(proto.MESSAGE, message=Foo, number=1)
+
+    class Qux(proto.Message):
+        baz = proto.Field(Baz, number=1)
+
+    qux = Qux()
+    pb = Qux.pb(qux)
+    foos = RepeatedComposite(pb.baz.foos, marshal=Baz.meta.marshal)
+    with pytest.raises(IndexError):
+        foos[0]
+    assert Foo(bar=1) not in foos
+    assert foos == []
+    assert not pb.HasField("baz")
+    assert Qux.serialize(qux) == b""
@@ -0,0 +1,106 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+import proto
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize(
+    "proto_type,dtype",
+    [
+        (proto.DOUBLE, "float64"),
+        (proto.FLOAT, "float32"),
+        (proto.INT64, "int64"),
+        (proto.SINT32, "int32"),
+        (proto.UINT64, "uint64"),
+        (proto.FIXED32, "uint32"),
+        (proto.BOOL, "bool"),
+    ],
+)
+def test_repeated_to_numpy(proto_type, dtype):
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto_type, number=1)
+
+    foo = Foo(bar=[1, 0, 1])
+    array = foo.bar.to_numpy()
+    assert array.dtype == numpy.dtype(dtype)
+    assert array.tolist() == [1, 0, 1]
+
+    # The array is a copy.
+    array[0] = 0
+    assert foo.bar[0] == 1
+
+
+def test_repeated_to_numpy_empty():
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto.FLOAT, number=1)
+
+    array = Foo().bar.to_numpy()
+    assert array.shape == (0,)
+    assert array.dtype == numpy.float32
+
+
+def test_repeated_to_numpy_enum():
+    class Color(proto.Enum):
+        COLOR_UNSPECIFIED = 0
+        RED = 1
+        GREEN = 2
+
+    class Foo(proto.Message):
+        colors = proto.RepeatedField(Color, number=1)
+
+    foo = Foo(colors=[Color.GREEN, Color.RED])
+    array = foo.colors.to_numpy()
+    assert array.dtype == numpy.int32
+    assert array.tolist() == [2, 1]
+
+
+def test_repeated_to_numpy_dtype():
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto.INT32, number=1)
+        names = proto.RepeatedField(proto.STRING, number=2)
+
+    foo = Foo(bar=[1, 2], names=["a", "b"])
+    assert foo.bar.to_numpy(dtype=numpy.float64).dtype == numpy.float64
+    with pytest.raises(TypeError):
+        foo.names.to_numpy()
+    assert foo.names.to_numpy(dtype=object).tolist() == ["a", "b"]
+
+
+def test_repeated_assign_array():
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto.DOUBLE, number=1)
+        ints = proto.RepeatedField(proto.INT64, number=2)
+
+    foo = Foo(bar=[1.0, 2.0, 3.0])
+    foo.bar.assign_array(numpy.linspace(0, 1, 5))
+    assert foo.bar == [0.0, 0.25, 0.5, 0.75, 1.0]
+    foo.ints.assign_array(numpy.arange(3, dtype=numpy.int64))
+    assert foo.ints == [0, 1, 2]
+    assert Foo.deserialize(Foo.serialize(foo)) == foo
+
+
+def test_repeated_assign_array_invalid():
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto.INT32, number=1)
+
+    foo = Foo(bar=[1, 2, 3])
+    with pytest.raises(ValueError):
+        foo.bar.assign_array(numpy.zeros((2, 2), dtype=numpy.int32))
+    with pytest.raises((TypeError, ValueError)):
+        foo.bar.assign_array(numpy.array([1, 2**40], dtype=numpy.int64))
+    assert foo.bar == [1, 2, 3]
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import copy
+import sys
 
 import pytest
 
@@ -46,6 +47,18 @@ def test_repeated_scalar_iadd():
     assert foo.bar == [1, 1, 2, 3, 5, 8, 13, 21, 34]
 
 
+def test_repeated_scalar_extend_clear():
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto.INT32, number=1)
+
+    foo = Foo(bar=[1, 2])
+    foo.bar.extend(foo.bar)
+    foo.bar.extend(i * 10 for i in range(2))
+    assert foo.bar == [1, 2, 1, 2, 0, 10]
+    foo.bar.clear()
+    assert foo.bar == []
+
+
 def test_repeated_scalar_setitem():
     class Foo(proto.Message):
         bar = proto.RepeatedField(proto.INT32, number=1)
@@ -113,3 +126,17 @@ def test_repeated_scalar_wrong_type():
         foo.bar.append(21.0)
     with pytest.raises(TypeError):
         foo.bar.append("21")
+
+
+def test_repeated_scalar_numpy_missing(monkeypatch):
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto.DOUBLE, number=1)
+
+    # Make `import numpy` fail, whether or not NumPy is installed.
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    foo = Foo(bar=[1.5])
+    with pytest.raises(ImportError):
+        foo.bar.to_numpy()
+    with pytest.raises(ImportError):
+        foo.bar.assign_array([2.5])
+    assert foo.bar == [1.5]
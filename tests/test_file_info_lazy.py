@@ -0,0 +1,81 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+from google.protobuf import descriptor_pool
+
+import proto
+from proto._file_info import _FileInfo
+
+
+@pytest.fixture(autouse=True)
+def lazy():
+    with mock.patch.object(_FileInfo, "lazy", True):
+        yield
+
+
+def test_file_built_on_first_use():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    assert Foo._meta._pb is None
+    assert Foo._meta.file_info.is_pending
+    with pytest.raises(KeyError):
+        descriptor_pool.Default().FindMessageTypeByName(Foo._meta.full_name)
+
+    assert Foo(bar=42).bar == 42
+    assert not Foo._meta.file_info.is_pending
+    assert descriptor_pool.Default().FindMessageTypeByName(Foo._meta.full_name)
+
+
+def test_file_built_by_pb():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    assert Foo.pb().DESCRIPTOR.full_name == Foo._meta.full_name
+    assert not Foo._meta.file_info.is_pending
+
+
+def test_dependency_built_first():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Baz(proto.Message):
+        foo = proto.Field(Foo, number=1)
+
+    # Declaring Baz does not build the file declaring Foo.
+    assert Foo._meta._pb is None
+    assert Baz._meta.file_info.descriptor.dependency == [
+        Foo._meta.file_info.descriptor.name
+    ]
+
+    baz = Baz(foo=Foo(bar=42))
+    assert baz.foo.bar == 42
+    assert not Foo._meta.file_info.is_pending
+
+
+def test_dependency_on_enum():
+    class Color(proto.Enum):
+        COLOR_UNSPECIFIED = 0
+        RED = 1
+
+    class Paint(proto.Message):
+        color = proto.Field(Color, number=1)
+
+    assert Color._meta._pb is None
+    assert Paint(color=Color.RED).color == Color.RED
+    assert Color._meta.pb.full_name == Color._meta.full_name
+    assert not Color._meta.file_info.is_pending
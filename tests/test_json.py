@@ -12,11 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import datetime
+import io
+import itertools
 import pytest
 import re
 
+import google.protobuf
 import proto
+from proto import _json_decoder
+from google.protobuf import any_pb2
+from google.protobuf import duration_pb2
+from google.protobuf import field_mask_pb2
+from google.protobuf import struct_pb2
+from google.protobuf import timestamp_pb2
+from google.protobuf import wrappers_pb2
 from google.protobuf.json_format import MessageToJson, Parse, ParseError
+from google.protobuf.json_format import SerializeToJsonError
 
 
 def test_message_to_json():
@@ -263,3 +276,235 @@ def test_json_float_precision():
     j = Squid.to_json(s, float_precision=3, indent=None)
 
     assert j == '{"name": "Steve", "massKg": 3.14}'
+
+
+def squid_messages():
+    class Color(proto.Enum):
+        COLOR_UNSPECIFIED = 0
+        RED = 1
+
+    class Arm(proto.Message):
+        length = proto.Field(proto.INT64, number=1)
+        name = proto.Field(proto.STRING, number=2)
+        grip = proto.Field(proto.FLOAT, number=3)
+
+    class Squid(proto.Message):
+        mass_kg = proto.Field(proto.INT64, number=1)
+        name = proto.Field(proto.STRING, number=2)
+        color = proto.Field(Color, number=3)
+        spawned = proto.Field(timestamp_pb2.Timestamp, number=4)
+        arm = proto.Field(Arm, number=5)
+        arms = proto.RepeatedField(Arm, number=6)
+        tags = proto.RepeatedField(proto.STRING, number=7)
+        labels = proto.MapField(proto.STRING, proto.STRING, number=8)
+        extra = proto.Field(struct_pb2.Struct, number=9)
+        count = proto.Field(wrappers_pb2.Int32Value, number=10)
+        depth = proto.Field(proto.INT32, number=11, optional=True)
+        speed = proto.Field(proto.DOUBLE, number=12)
+        data = proto.Field(proto.BYTES, number=13)
+        arms_by_id = proto.MapField(proto.INT32, Arm, number=14)
+        flags = proto.MapField(proto.BOOL, proto.UINT64, number=15)
+        details = proto.Field(any_pb2.Any, number=16)
+        mask = proto.Field(field_mask_pb2.FieldMask, number=17)
+        lifespan = proto.Field(duration_pb2.Duration, number=18)
+        colors = proto.RepeatedField(Color, number=19)
+        grips = proto.RepeatedField(proto.FLOAT, number=20)
+        value = proto.Field(struct_pb2.Value, number=21)
+        values = proto.Field(struct_pb2.ListValue, number=22)
+        ink = proto.Field(proto.INT32, number=23, oneof="weapon")
+        beak = proto.Field(Arm, number=24, oneof="weapon")
+        buoyancy = proto.Field(wrappers_pb2.FloatValue, number=25)
+
+    details = any_pb2.Any()
+    details.Pack(timestamp_pb2.Timestamp(seconds=5))
+    unknown_color = Squid(depth=0)
+    Squid.pb(unknown_color).color = 7
+    return Squid, [
+        Squid(),
+        Squid(
+            mass_kg=2**40,
+            name='St\u00e9ve "the squid"',
+            color=Color.RED,
+            spawned=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+            arm={"length": 1, "name": "left", "grip": 0.1},
+            arms=[{"length": 2}, {}],
+            tags=["a", "b"],
+            labels={"k": "v", "a": "b"},
+            extra={"x": [1, "y", None, {"z": True}], "e": {}, "l": []},
+            count=3,
+            speed=float("inf"),
+            data=b"\x00\xff",
+            arms_by_id={3: {"length": 1}, 1: {}},
+            flags={True: 2**64 - 1, False: 0},
+            details=details,
+            mask=field_mask_pb2.FieldMask(paths=["a_b", "c"]),
+            lifespan=datetime.timedelta(seconds=3, microseconds=5),
+            colors=[0, 1],
+            grips=[0.1, float("nan"), -0.0],
+            value=[1, {"a": None}],
+            values=[],
+            beak={},
+            buoyancy=1.1,
+        ),
+        Squid(ink=0, speed=-0.0),
+        unknown_color,
+    ]
+
+
+@pytest.mark.skipif(
+    google.protobuf.__version__[0] in ("3", "4"),
+    reason="JSON is only written without json_format under protobuf 5 and later",
+)
+@pytest.mark.parametrize(
+    "use_integers_for_enums,preserving_proto_field_name,sort_keys",
+    list(itertools.product([True, False], repeat=3)),
+)
+def test_json_matches_json_format(
+    use_integers_for_enums, preserving_proto_field_name, sort_keys
+):
+    Squid, squids = squid_messages()
+    for squid, indent, print_fields in itertools.product(
+        squids, [None, 0, 2, 4], [True, False]
+    ):
+        expected = MessageToJson(
+            Squid.pb(squid),
+            use_integers_for_enums=use_integers_for_enums,
+            preserving_proto_field_name=preserving_proto_field_name,
+            sort_keys=sort_keys,
+            indent=indent,
+            always_print_fields_with_no_presence=print_fields,
+        )
+        assert expected == Squid.to_json(
+            squid,
+            use_integers_for_enums=use_integers_for_enums,
+            preserving_proto_field_name=preserving_proto_field_name,
+            sort_keys=sort_keys,
+            indent=indent,
+            always_print_fields_with_no_presence=print_fields,
+        )
+
+
+def test_json_serialize_error():
+    class Squid(proto.Message):
+        value = proto.Field(struct_pb2.Value, number=1)
+
+    s = Squid(value=float("nan"))
+    with pytest.raises(SerializeToJsonError, match="Failed to serialize value field"):
+        Squid.to_json(s)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_json_from_file(chunk_size, monkeypatch):
+    monkeypatch.setattr(_json_decoder, "CHUNK_SIZE", chunk_size)
+    Squid, squids = squid_messages()
+    for squid in squids:
+        # Compare JSON rather than messages, which are unequal if they hold
+        # NaN. Keys are sorted, as the order of map entries is not stable.
+        json = Squid.to_json(squid, sort_keys=True)
+        for stream in (io.StringIO(json), io.BytesIO(json.encode())):
+            assert Squid.to_json(Squid.from_json(stream), sort_keys=True) == json
+
+    json = '{"arms": [{"length": "12"}, {}], "armsById": {"2": {"name": "\u00e9"}}}'
+    squid = Squid.from_json(io.BytesIO(json.encode()))
+    assert [arm.length for arm in squid.arms] == [12, 0]
+    assert squid.arms_by_id[2].name == "\u00e9"
+
+
+@pytest.mark.parametrize(
+    "json",
+    [
+        "",
+        '{"name": "x"',
+        '{"name": "x"} {}',
+        '{"name": "x", "name": "y"}',
+        '{"arm": {"length": 1.5}}',
+        '{"arms": [{}, 1]}',
+        '{"arms": [{},]}',
+        '{"armsById": {"x": {}}}',
+        '{"ink": 1, "beak": {}}',
+        '{"beak": {}, "ink": 1}',
+        '{"arm": {"legs": 8}}',
+    ],
+)
+def test_json_from_file_invalid(json, monkeypatch):
+    monkeypatch.setattr(_json_decoder, "CHUNK_SIZE", 3)
+    Squid, _ = squid_messages()
+    with pytest.raises(ParseError):
+        Squid.from_json(json)
+    with pytest.raises(ParseError):
+        Squid.from_json(io.StringIO(json))
+
+
+def test_json_from_file_unknown_field():
+    Squid, _ = squid_messages()
+    json = '{"arm": {"legs": 8, "length": 2}, "legs": [{}]}'
+    squid = Squid.from_json(io.StringIO(json), ignore_unknown_fields=True)
+    assert squid.arm.length == 2
+
+
+def test_ndjson_round_trip():
+    Squid, squids = squid_messages()
+    text = io.StringIO()
+    assert Squid.to_ndjson(squids, text) == len(squids)
+    lines = text.getvalue().splitlines()
+    assert lines == [Squid.to_json(squid, indent=None) for squid in squids]
+
+    binary = io.BytesIO()
+    Squid.to_ndjson(squids, binary, use_integers_for_enums=False, sort_keys=True)
+    assert binary.getvalue().decode().splitlines() == [
+        Squid.to_json(squid, indent=None, use_integers_for_enums=False, sort_keys=True)
+        for squid in squids
+    ]
+
+    for stream in (io.StringIO(text.getvalue()), io.BytesIO(binary.getvalue())):
+        result = list(Squid.iter_ndjson(stream))
+        assert [Squid.to_json(squid, sort_keys=True) for squid in result] == [
+            Squid.to_json(squid, sort_keys=True) for squid in squids
+        ]
+
+
+def test_ndjson_options():
+    Squid, _ = squid_messages()
+    stream = io.StringIO()
+    Squid.to_ndjson(
+        [{"mass_kg": 1}, Squid(name="Steve")],
+        stream,
+        preserving_proto_field_name=True,
+        always_print_fields_with_no_presence=False,
+    )
+    assert stream.getvalue() == '{"mass_kg": "1"}\n{"name": "Steve"}\n'
+
+    stream = io.StringIO('{"massKg": 1, "legs": 8}\n\n  \n{"name": "Steve"}\n')
+    assert list(Squid.iter_ndjson(stream, ignore_unknown_fields=True)) == [
+        Squid(mass_kg=1),
+        Squid(name="Steve"),
+    ]
+
+
+def test_ndjson_invalid_line():
+    Squid, _ = squid_messages()
+    stream = io.StringIO('{"massKg": 1}\n\n{"legs": 8}\n')
+    squids = Squid.iter_ndjson(stream)
+    assert next(squids) == Squid(mass_kg=1)
+    with pytest.raises(ParseError, match="Failed to parse line 3"):
+        next(squids)
+
+
+def test_ndjson_executor():
+    Squid, squids = squid_messages()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        stream = io.StringIO()
+        assert Squid.to_ndjson(squids, stream, executor=executor) == len(squids)
+        assert stream.getvalue() == "".join(
+            Squid.to_json(squid, indent=None) + "\n" for squid in squids
+        )
+
+        stream.seek(0)
+        result = list(Squid.iter_ndjson(stream, executor=executor))
+        assert [Squid.to_json(squid, sort_keys=True) for squid in result] == [
+            Squid.to_json(squid, sort_keys=True) for squid in squids
+        ]
+
+        stream = io.StringIO('{}\n\n{"legs": 8}\n')
+        with pytest.raises(ParseError, match="Failed to parse line 3"):
+            list(Squid.iter_ndjson(stream, executor=executor))
@@ -17,6 +17,8 @@ import pytest
 from google.protobuf import empty_pb2
 
 from proto.marshal.marshal import BaseMarshal
+from proto.marshal.marshal import Marshal
+from proto.marshal.marshal import NoopRule
 
 
 def test_registration():
@@ -46,3 +48,30 @@ def test_invalid_marshal_rule():
     marshal = BaseMarshal()
     with pytest.raises(TypeError):
         marshal.register(empty_pb2.Empty, rule=object())
+
+
+def test_get_rule_remembers_missing_rules():
+    marshal = Marshal(name="get_rule_cache")
+    rule = marshal.get_rule(proto_type=empty_pb2.Empty)
+    assert isinstance(rule, NoopRule)
+    assert marshal._resolved_rules[empty_pb2.Empty] is rule
+    assert marshal.get_rule(proto_type=empty_pb2.Empty) is rule
+
+
+def test_get_rule_invalidated_by_other_marshal():
+    marshal = Marshal(name="get_rule_cache")
+    other = Marshal(name="get_rule_cache_other")
+    assert isinstance(marshal.get_rule(proto_type=empty_pb2.Empty), NoopRule)
+
+    @other.register(empty_pb2.Empty)
+    class Rule:
+        def to_proto(self, value):
+            return value
+
+        def to_python(self, value, *, absent=None):
+            return value
+
+    assert isinstance(marshal.get_rule(proto_type=empty_pb2.Empty), Rule)
+
+    other.reset()
+    assert isinstance(marshal.get_rule(proto_type=empty_pb2.Empty), NoopRule)
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import io
 import itertools
+import mmap
 import pytest
 
+from google.protobuf import message
+
 import proto
 
 
@@ -201,6 +206,208 @@ def test_message_deserialize():
     assert new_foo.bar == 42
 
 
+def test_message_deserialize_lazy():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    serialized = Foo.serialize(Foo(bar=42))
+    foo = Foo.deserialize(serialized, lazy=True)
+    assert isinstance(foo, Foo)
+    assert Foo.serialize(foo) is serialized
+    assert foo.bar == 42
+    assert foo == Foo(bar=42)
+
+    foo.bar = 43
+    assert Foo.serialize(foo) == Foo.serialize(Foo(bar=43))
+
+
+def test_message_deserialize_lazy_concurrent():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    serialized = Foo.serialize(Foo(bar=42))
+
+    # Another thread set the protobuf instance after this one read the
+    # payload, but before it removed it.
+    foo = Foo.deserialize(serialized, lazy=True)
+    pb = Foo.pb()(bar=43)
+    object.__setattr__(foo, "_pb", pb)
+    assert foo.__getattr__("_pb") is pb
+    assert foo.bar == 43
+
+    # Another thread parsed the payload after this one looked up `_pb`.
+    foo = Foo.deserialize(serialized, lazy=True)
+    pb = foo._pb
+    assert foo.__getattr__("_pb") is pb
+
+    foos = [Foo.deserialize(serialized, lazy=True) for _ in range(100)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        for foo in foos:
+            assert list(executor.map(lambda f: f.bar, [foo] * 8)) == [42] * 8
+
+
+def test_message_deserialize_lazy_invalid():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    foo = Foo.deserialize(b"garbage", lazy=True)
+    with pytest.raises(message.DecodeError):
+        foo.bar
+    with pytest.raises(message.DecodeError):
+        foo.bar
+
+
+def test_message_slots():
+    class Foo(proto.Message):
+        __slots__ = ()
+
+        bar = proto.Field(proto.INT32, number=1)
+        baz = proto.RepeatedField(proto.INT32, number=2)
+        labels = proto.MapField(proto.STRING, proto.INT32, number=3)
+
+    foo = Foo(bar=42, baz=[1, 2])
+    assert not hasattr(foo, "__dict__")
+    assert not hasattr(foo.baz, "__dict__")
+    assert not hasattr(Foo.LabelsEntry(key="a", value=1), "__dict__")
+    with pytest.raises(AttributeError):
+        foo._not_a_slot = 1
+    assert Foo.deserialize(Foo.serialize(foo)).bar == 42
+
+
+def test_message_instance_dict():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    foo = Foo(bar=42)
+    foo._note = "a note"
+    assert foo._note == "a note"
+    assert vars(foo) == {"_note": "a note"}
+    assert Foo.deserialize(Foo.serialize(foo)).bar == 42
+
+
+def test_message_cache_views():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    class Spam(proto.Message):
+        _cache_views = True
+
+        foos = proto.RepeatedField(Foo, number=1)
+        ints = proto.RepeatedField(proto.INT32, number=2)
+        labels = proto.MapField(proto.STRING, Foo, number=3)
+        foo = proto.Field(Foo, number=4)
+        name = proto.Field(proto.STRING, number=5)
+
+    spam = Spam(foos=[{"bar": 1}], ints=[1], labels={"a": {"bar": 2}})
+    assert spam.foos is spam.foos
+    assert spam.ints is spam.ints
+    assert spam.labels is spam.labels
+    assert spam.foo is spam.foo
+    assert spam.name == ""
+    assert "_cache_views" not in Spam.__dict__
+
+    # Views are made again once the field has a new protobuf value.
+    foos = spam.foos
+    spam.foos = [{"bar": 3}, {"bar": 4}]
+    assert spam.foos is not foos
+    assert [foo.bar for foo in spam.foos] == [3, 4]
+    foo = spam.foo
+    foo.bar = 5
+    del spam.foo
+    assert spam.foo is not foo
+    assert spam.foo.bar == 0
+    assert list(spam.ints) == [1]
+    Spam.copy_from(spam, Spam(ints=[7, 8]))
+    assert list(spam.ints) == [7, 8]
+    assert spam.ints is spam.ints
+
+
+def test_message_views_not_cached_by_default():
+    class Foo(proto.Message):
+        bar = proto.RepeatedField(proto.INT32, number=1)
+
+    foo = Foo(bar=[1])
+    assert foo.bar is not foo.bar
+    assert Foo.meta.view_getters == {}
+
+
+def test_message_serialize_many():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    foos = [
+        Foo(bar=1),
+        {"bar": 2},
+        Foo.deserialize(Foo.serialize(Foo(bar=3)), lazy=True),
+    ]
+    assert Foo.serialize_many(foos) == [Foo.serialize(f) for f in foos]
+    assert Foo.deserialize_many(Foo.serialize_many(foos)) == [
+        Foo(bar=1),
+        Foo(bar=2),
+        Foo(bar=3),
+    ]
+
+
+def test_message_serialize_many_delimited():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+        baz = proto.Field(proto.STRING, number=2)
+
+    foos = [Foo(bar=1), Foo(), Foo(baz="x" * 300)]
+    stream = b"".join(Foo.serialize_many(foos, delimited=True))
+    assert Foo.deserialize_many(stream, delimited=True) == foos
+
+    with pytest.raises(message.DecodeError):
+        Foo.deserialize_many(stream[:-1], delimited=True)
+
+
+def test_message_serialize_many_executor():
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+
+    foos = [Foo(bar=i) for i in range(10)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        payloads = Foo.serialize_many(foos, executor=executor)
+        stream = b"".join(Foo.serialize_many(foos, delimited=True, executor=executor))
+        assert payloads == Foo.serialize_many(foos)
+        assert Foo.deserialize_many(payloads, executor=executor) == foos
+        assert Foo.deserialize_many(stream, delimited=True, executor=executor) == foos
+
+
+def test_message_delimited_file(tmp_path):
+    class Foo(proto.Message):
+        bar = proto.Field(proto.INT32, number=1)
+        baz = proto.Field(proto.STRING, number=2)
+
+    foos = [Foo(bar=1), Foo(), Foo(baz="x" * 300)]
+    path = tmp_path / "foos.bin"
+    with open(path, "wb") as stream:
+        assert Foo.write_delimited(stream, foos) == 3
+    assert path.read_bytes() == b"".join(Foo.serialize_many(foos, delimited=True))
+
+    with open(path, "rb") as stream:
+        assert list(Foo.iter_delimited(stream)) == foos
+
+    with open(path, "rb") as stream:
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            assert list(Foo.iter_delimited(buffer)) == foos
+
+    assert list(Foo.iter_delimited(memoryview(path.read_bytes()))) == foos
+    assert list(Foo.iter_delimited(io.BytesIO())) == []
+
+
+def test_message_delimited_file_truncated():
+    class Foo(proto.Message):
+        baz = proto.Field(proto.STRING, number=1)
+
+    payload = b"".join(Foo.serialize_many([Foo(baz="x" * 300)], delimited=True))
+    for truncated in (payload[:1], payload[:-1]):
+        with pytest.raises(message.DecodeError):
+            list(Foo.iter_delimited(io.BytesIO(truncated)))
+        with pytest.raises(message.DecodeError):
+            list(Foo.iter_delimited(truncated))
+
+
 def test_message_pb():
     class Foo(proto.Message):
         bar = proto.Field(proto.INT32, number=1)
@@ -390,6 +597,128 @@ def test_unknown_field_from_dict():
     assert not hasattr(s, "length_cm")
 
 
+def test_getters_compiled_once():
+    class Squid(proto.Message):
+        mass_kg = proto.Field(proto.INT32, number=1)
+        name = proto.Field(proto.STRING, number=2)
+
+    s = Squid(mass_kg=20, name="Steve")
+    assert s.mass_kg == 20
+    assert s.name == "Steve"
+
+    getters = Squid.meta.getters
+    assert set(getters) == {"mass_kg", "name"}
+    assert getters["mass_kg"](Squid.pb(s)) == 20
+    assert Squid.meta.getters is getters
+
+
+def test_getters_recompiled_on_register():
+    class Squid(proto.Message):
+        mass_kg = proto.Field(proto.INT32, number=1)
+
+    s = Squid(mass_kg=20)
+    assert s.mass_kg == 20
+
+    class DoublingRule:
+        def to_python(self, value, *, absent=None):
+            return value * 2
+
+        def to_proto(self, value):
+            return value
+
+    Squid.meta.marshal.register(proto.INT32, DoublingRule())
+    assert s.mass_kg == 40
+
+
+def test_field_descriptors():
+    class Squid(proto.Message):
+        mass_kg = proto.Field(proto.INT32, number=1)
+        pb = proto.Field(proto.STRING, number=2)
+        depth = proto.Field(proto.INT32, number=3, optional=True)
+
+    s = Squid(mass_kg=20, pb="not the method")
+    assert "mass_kg" in vars(Squid)
+    assert s.mass_kg == 20
+
+    # Only optional fields are attributes of the class.
+    assert not hasattr(Squid, "mass_kg")
+    with pytest.raises(AttributeError):
+        Squid.mass_kg
+    assert Squid.depth == "depth"
+    assert Squid.depth not in s
+
+    # Fields shadowing message attributes do not get a descriptor,
+    # but are still accessible on instances.
+    assert "pb" not in vars(Squid)
+    assert callable(Squid.pb)
+    assert s.pb == "not the method"
+
+
+def test_setattr_writes_in_place():
+    class Arm(proto.Message):
+        length_cm = proto.Field(proto.INT32, number=1)
+
+    class Squid(proto.Message):
+        mass_kg = proto.Field(proto.INT32, number=1)
+        arm = proto.Field(Arm, number=2)
+        arms = proto.RepeatedField(Arm, number=3)
+        tags = proto.MapField(proto.STRING, proto.STRING, number=4)
+        limbs = proto.MapField(proto.STRING, Arm, number=5)
+
+    s = Squid()
+    s.mass_kg = 20
+    s.arm = Arm()
+    s.arms = [Arm(length_cm=1), {"length_cm": 2}]
+    s.tags = {"size": "big"}
+    s.limbs = {"left": Arm(length_cm=3)}
+    assert s.mass_kg == 20
+    assert "arm" in s
+    assert [a.length_cm for a in s.arms] == [1, 2]
+    assert s.tags == {"size": "big"}
+    assert s.limbs["left"].length_cm == 3
+
+    # Values read from a field may be written back to it.
+    s.arms = s.arms[1:]
+    assert [a.length_cm for a in s.arms] == [2]
+
+    s.arm = None
+    s.tags = None
+    assert "arm" not in s
+    assert not s.tags
+    assert set(Squid.meta.setters) == set(Squid.meta.fields)
+
+
+def test_setattr_invalid_value_keeps_field():
+    class Arm(proto.Message):
+        length_cm = proto.Field(proto.INT32, number=1)
+
+    class Squid(proto.Message):
+        arms = proto.RepeatedField(Arm, number=1)
+        sizes = proto.RepeatedField(proto.INT32, number=2)
+        tags = proto.MapField(proto.STRING, proto.INT32, number=3)
+        limbs = proto.MapField(proto.STRING, Arm, number=4)
+
+    s = Squid(
+        arms=[Arm(length_cm=1)],
+        sizes=[1, 2],
+        tags={"size": 1},
+        limbs={"left": Arm(length_cm=3)},
+    )
+    with pytest.raises(TypeError):
+        s.arms = [Arm(), 5]
+    with pytest.raises(TypeError):
+        s.sizes = [3, "big"]
+    with pytest.raises(TypeError):
+        s.tags = {"mass": 2, "size": "big"}
+    with pytest.raises(TypeError):
+        s.limbs = {"right": Arm(), "left": 5}
+    assert [a.length_cm for a in s.arms] == [1]
+    assert s.sizes == [1, 2]
+    assert s.tags == {"size": 1}
+    assert list(s.limbs) == ["left"]
+    assert s.limbs["left"].length_cm == 3
+
+
 def test_copy_from():
     class Mollusc(proto.Message):
         class Squid(proto.Message):
@@ -464,13 +793,17 @@ def test_dir():
             # Class methods from the MessageMeta metaclass
             "copy_from",
             "deserialize",
+            "deserialize_many",
             "from_json",
+            "iter_delimited",
             "meta",
             "pb",
             "serialize",
+            "serialize_many",
             "to_dict",
             "to_json",
             "wrap",
+            "write_delimited",
         }
         | {
             # Nested message and enum types
@@ -0,0 +1,192 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import pytest
+
+from google.protobuf import duration_pb2
+from google.protobuf import field_mask_pb2
+from google.protobuf import struct_pb2
+from google.protobuf import timestamp_pb2
+
+import proto
+
+
+def squid_type():
+    class Color(proto.Enum):
+        COLOR_UNSPECIFIED = 0
+        RED = 1
+
+    class Chromatophore(proto.Message):
+        color = proto.Field(Color, number=1)
+        size = proto.Field(proto.INT64, number=2)
+
+    class Squid(proto.Message):
+        name = proto.Field(proto.STRING, number=1)
+        mass = proto.Field(proto.INT64, number=2)
+        color = proto.Field(Color, number=3)
+        data = proto.Field(proto.BYTES, number=4)
+        spawned = proto.Field(timestamp_pb2.Timestamp, number=5)
+        lifespan = proto.Field(duration_pb2.Duration, number=6)
+        chromatophore = proto.Field(Chromatophore, number=7)
+        chromatophores = proto.RepeatedField(Chromatophore, number=8)
+        tags = proto.RepeatedField(proto.STRING, number=9)
+        sizes = proto.MapField(proto.STRING, proto.INT32, number=10)
+        by_name = proto.MapField(proto.STRING, Chromatophore, number=11)
+        extra = proto.Field(struct_pb2.Struct, number=12)
+        mask = proto.Field(field_mask_pb2.FieldMask, number=13)
+        depth = proto.Field(proto.INT32, number=14, optional=True)
+        type_ = proto.Field(proto.STRING, number=15)
+        parent = proto.Field("Squid", number=16)
+
+    return Squid
+
+
+def test_to_native_dict():
+    Squid = squid_type()
+    squid = Squid(
+        name="Steve",
+        mass=2**40,
+        color=1,
+        data=b"\x00",
+        spawned=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        lifespan=timedelta(days=1),
+        chromatophore={"color": 1, "size": 3},
+        chromatophores=[{"size": 1}],
+        tags=["a"],
+        sizes={"a": 1},
+        by_name={"x": {"size": 2}},
+        extra={"a": [1, "b", None, {"c": True}]},
+        mask=field_mask_pb2.FieldMask(paths=["name"]),
+        depth=0,
+        type_="giant",
+        parent={"name": "Stan"},
+    )
+    Color = type(squid.color)
+    result = Squid.to_native_dict(squid)
+    assert result == {
+        "name": "Steve",
+        "mass": 2**40,
+        "color": Color.RED,
+        "data": b"\x00",
+        "spawned": datetime(2020, 1, 1, tzinfo=timezone.utc),
+        "lifespan": timedelta(days=1),
+        "chromatophore": {"color": Color.RED, "size": 3},
+        "chromatophores": [{"color": Color.COLOR_UNSPECIFIED, "size": 1}],
+        "tags": ["a"],
+        "sizes": {"a": 1},
+        "by_name": {"x": {"color": Color.COLOR_UNSPECIFIED, "size": 2}},
+        "extra": {"a": [1.0, "b", None, {"c": True}]},
+        "mask": {"paths": ["name"]},
+        "depth": 0,
+        "type_": "giant",
+        "parent": Squid.to_native_dict(Squid(name="Stan")),
+    }
+    assert type(result["color"]) is Color
+    assert Squid.from_native_dict(result) == squid
+
+
+def test_to_native_dict_presence():
+    Squid = squid_type()
+    result = Squid.to_native_dict(Squid())
+    assert result["name"] == ""
+    assert result["tags"] == []
+    assert result["sizes"] == {}
+    assert "spawned" not in result
+    assert "chromatophore" not in result
+    assert "depth" not in result
+
+    assert (
+        Squid.to_native_dict(Squid(), always_print_fields_with_no_presence=False) == {}
+    )
+    assert Squid.to_native_dict(
+        Squid(name="Steve", depth=0, chromatophore={}),
+        always_print_fields_with_no_presence=False,
+    ) == {"name": "Steve", "depth": 0, "chromatophore": {}}
+
+
+def test_to_native_dict_unknown_enum_value():
+    Squid = squid_type()
+    squid = Squid()
+    Squid.pb(squid).color = 7
+    color = Squid.to_native_dict(squid)["color"]
+    assert color == 7
+    assert type(color) is int
+
+
+def test_to_native_dict_wrong_type():
+    Squid = squid_type()
+    with pytest.raises(TypeError):
+        Squid.to_native_dict({"name": "Steve"})
+
+
+def test_from_native_dict():
+    Squid = squid_type()
+    Chromatophore = Squid.meta.fields["chromatophore"].message
+    squid = Squid.from_native_dict(
+        {
+            "name": "Steve",
+            "color": "RED",
+            "spawned": datetime(2020, 1, 1, tzinfo=timezone.utc),
+            "chromatophore": Chromatophore(size=1),
+            "chromatophores": [{"size": 2}, Chromatophore(size=3)],
+            "by_name": {"x": Chromatophore(size=4)},
+            "extra": {"a": {"b": [1]}},
+            "mask": {"paths": ["name"]},
+            "type": "giant",
+            "parent": {"chromatophore": {"size": 5}},
+            "depth": None,
+        }
+    )
+    assert isinstance(squid, Squid)
+    assert squid.color == 1
+    assert squid.spawned == datetime(2020, 1, 1, tzinfo=timezone.utc)
+    assert squid.chromatophore.size == 1
+    assert [c.size for c in squid.chromatophores] == [2, 3]
+    assert squid.by_name["x"].size == 4
+    assert squid.extra["a"]["b"][0] == 1
+    assert squid.mask.paths == ["name"]
+    assert squid.type_ == "giant"
+    assert squid.parent.chromatophore.size == 5
+    assert Squid.depth not in squid
+
+
+def test_from_native_dict_unknown_field():
+    Squid = squid_type()
+    with pytest.raises(ValueError):
+        Squid.from_native_dict({"name": "Steve", "ink": 1})
+    with pytest.raises(ValueError):
+        Squid.from_native_dict({"parent": {"ink": 1}})
+
+    squid = Squid.from_native_dict(
+        {"name": "Steve", "ink": 1, "parent": {"ink": 1}},
+        ignore_unknown_fields=True,
+    )
+    assert squid == Squid(name="Steve", parent={})
+
+
+def test_from_native_dict_wrapper_types():
+    class Squid(proto.Message):
+        mass = proto.Field(struct_pb2.Value, number=1)
+        values = proto.Field(struct_pb2.ListValue, number=2)
+
+    squid = Squid.from_native_dict({"mass": 1.5, "values": [None, "a"]})
+    assert squid.mass == 1.5
+    assert list(squid.values) == [None, "a"]
+    assert Squid.to_native_dict(squid) == {"mass": 1.5, "values": [None, "a"]}
+    with pytest.raises(ValueError):
+        Squid.from_native_dict({"mass": object()})
@@ -49,3 +49,13 @@ def test_pickling():
     unpickled = pickle.loads(pickled)
 
     assert unpickled == s
+
+
+def test_pickling_lazy():
+    serialized = Squid.serialize(Squid(mass_kg=20))
+    s = Squid.deserialize(serialized, lazy=True)
+
+    unpickled = pickle.loads(pickle.dumps(s))
+
+    assert unpickled == s
+    assert unpickled.mass_kg == 20
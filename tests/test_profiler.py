@@ -0,0 +1,65 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from proto import _profiler
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setattr(_profiler, "enabled", True)
+    _profiler.reset()
+    yield _profiler
+    _profiler.reset()
+
+
+def test_disabled_returns_function_unchanged(monkeypatch):
+    monkeypatch.setattr(_profiler, "enabled", False)
+
+    def fx():
+        pass
+
+    assert _profiler.profiled("category", lambda: "key")(fx) is fx
+    with _profiler.timer("category", "key"):
+        pass
+    assert not _profiler._records
+
+
+def test_profiled(profiler):
+    @profiler.profiled("squids", lambda name: name)
+    def build(name):
+        if name == "outer":
+            build("inner")
+        return name
+
+    assert build("outer") == "outer"
+    assert build("other") == "other"
+
+    # Nested calls of the same category count towards the outer call.
+    assert set(profiler._records["squids"]) == {"outer", "other"}
+    assert profiler._records["squids"]["outer"][0] == 1
+
+
+def test_timer_and_report(profiler):
+    with profiler.timer("descriptor_pool.Add", "squid.proto"):
+        pass
+    with profiler.timer("descriptor_pool.Add", "squid.proto"):
+        pass
+    profiler.record("generate_file_pb", "squid.proto", 0.5)
+
+    report = profiler.report()
+    assert "descriptor_pool.Add: 2 calls" in report
+    assert "generate_file_pb: 1 calls, 500.0 ms" in report
+    assert "squid.proto" in report